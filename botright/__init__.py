@@ -1,7 +1,30 @@
 from .botright import Botright
+from .modules.bandwidth import BandwidthMeter
+from .modules.disk_cache import DiskCache
 from .modules.faker import Faker
+from .modules.forwarding_proxy import ForwardingProxy
+from .modules.geoip import GeoIP
+from .modules.proxy_cache import ProxyCheckCache
 from .modules.proxy_manager import ProxyManager
+from .modules.proxy_pool import ProxyPool
+from .modules.proxy_validator import ProxyValidator
+from .modules.resource_blocker import ResourceBlocker
+from .modules.response_cache import ResponseCache
 
 VERSION = "0.5.1"
 
-__all__ = ["Botright", "Faker", "ProxyManager", "VERSION"]
+__all__ = [
+    "BandwidthMeter",
+    "Botright",
+    "DiskCache",
+    "Faker",
+    "ForwardingProxy",
+    "GeoIP",
+    "ProxyCheckCache",
+    "ProxyManager",
+    "ProxyPool",
+    "ProxyValidator",
+    "ResourceBlocker",
+    "ResponseCache",
+    "VERSION",
+]
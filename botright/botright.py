@@ -4,19 +4,19 @@ import logging
 import os
 import shutil
 from tempfile import TemporaryDirectory, gettempdir
-from typing import Any, Dict, List, Optional
+from typing import Any, List, Optional, Union
 
 import browsers
 import hcaptcha_challenger as solver
 import loguru
 from async_class import AsyncObject
 from chrome_fingerprints import AsyncFingerprintGenerator
-from playwright.async_api import APIResponse, Playwright, async_playwright
+from playwright.async_api import Playwright, async_playwright
 from undetected_playwright.async_api import async_playwright as undetected_async_playwright
 
 from botright.playwright_mock import browser
 
-from .modules import Faker, ProxyManager
+from .modules import DiskCache, Faker, GeoIP, ProxyCheckCache, ProxyManager, ProxyPool, ResourceBlocker, ResponseCache
 from .playwright_mock import BrowserContext
 
 logging.getLogger("websockets").setLevel(logging.WARNING)
@@ -35,6 +35,13 @@ class Botright(AsyncObject):
         spoof_canvas: Optional[bool] = True,
         mask_fingerprint: Optional[bool] = True,
         use_undetected_playwright: Optional[bool] = False,
+        sync_timing: Optional[bool] = False,
+        response_cache: Optional[Union[ResponseCache, DiskCache]] = None,
+        resource_blocker: Optional[ResourceBlocker] = None,
+        bandwidth_budget: Optional[int] = None,
+        proxy_cache: Optional[ProxyCheckCache] = None,
+        geoip: Optional[GeoIP] = None,
+        forwarding_proxy: Optional[bool] = False,
     ) -> None:
         """
         Initialize a Botright instance with specified configurations.
@@ -48,6 +55,13 @@ class Botright(AsyncObject):
             spoof_canvas (bool, optional): Whether to disable canvas fingerprinting protection. Defaults to True.
             mask_fingerprint (bool, optional): Whether to mask the browser fingerprint. Defaults to True.
             use_undetected_playwright (bool, optional): Whether to use undetected_playwright (TEMP). Defaults to False.
+            sync_timing (bool, optional): Whether to run humanization delays through the page instead of locally. Defaults to False.
+            response_cache (Union[ResponseCache, DiskCache], optional): The cache used by cache_responses, e.g. to set its limits or share it on disk. Defaults to a 64 MiB ResponseCache.
+            resource_blocker (ResourceBlocker, optional): Blocks requests by rule sets and filter lists, e.g. ResourceBlocker(["images", "trackers"]). Overrides block_images. Defaults to None.
+            bandwidth_budget (int, optional): Byte cap per browser. Once a browser exceeds it, its media and document loads get aborted. Defaults to None (unlimited).
+            proxy_cache (ProxyCheckCache, optional): Caches the exit IP and geolocation of checked proxies on disk, so new_browser skips checking them again. Defaults to None.
+            geoip (GeoIP, optional): Resolves the location of proxies from a local database, only falling back to the geo APIs for unknown addresses. Defaults to None.
+            forwarding_proxy (bool, optional): Whether browsers connect through a local forwarding proxy, so rotate_proxy swaps their proxy in milliseconds instead of a relaunch. Defaults to False.
         """
         # This Init Function is only for intellisense.
         super().__init__()
@@ -62,6 +76,13 @@ class Botright(AsyncObject):
         spoof_canvas: Optional[bool] = True,
         mask_fingerprint: Optional[bool] = True,
         use_undetected_playwright: Optional[bool] = False,
+        sync_timing: Optional[bool] = False,
+        response_cache: Optional[Union[ResponseCache, DiskCache]] = None,
+        resource_blocker: Optional[ResourceBlocker] = None,
+        bandwidth_budget: Optional[int] = None,
+        proxy_cache: Optional[ProxyCheckCache] = None,
+        geoip: Optional[GeoIP] = None,
+        forwarding_proxy: Optional[bool] = False,
     ) -> None:
         """
         Initialize a Botright instance with specified configurations.
@@ -75,6 +96,13 @@ class Botright(AsyncObject):
             spoof_canvas (bool, optional): Whether to disable canvas fingerprinting protection. Defaults to True.
             mask_fingerprint (bool, optional): Whether to mask the browser fingerprint. Defaults to True.
             use_undetected_playwright (bool, optional): Whether to use undetected_playwright . EXPERIMENTAL (TEMP). Defaults to False.
+            sync_timing (bool, optional): Whether to run humanization delays through the page instead of locally. Defaults to False.
+            response_cache (Union[ResponseCache, DiskCache], optional): The cache used by cache_responses, e.g. to set its limits or share it on disk. Defaults to a 64 MiB ResponseCache.
+            resource_blocker (ResourceBlocker, optional): Blocks requests by rule sets and filter lists, e.g. ResourceBlocker(["images", "trackers"]). Overrides block_images. Defaults to None.
+            bandwidth_budget (int, optional): Byte cap per browser. Once a browser exceeds it, its media and document loads get aborted. Defaults to None (unlimited).
+            proxy_cache (ProxyCheckCache, optional): Caches the exit IP and geolocation of checked proxies on disk, so new_browser skips checking them again. Defaults to None.
+            geoip (GeoIP, optional): Resolves the location of proxies from a local database, only falling back to the geo APIs for unknown addresses. Defaults to None.
+            forwarding_proxy (bool, optional): Whether browsers connect through a local forwarding proxy, so rotate_proxy swaps their proxy in milliseconds instead of a relaunch. Defaults to False.
         """
 
         # Init local-side of the ModelHub
@@ -98,7 +126,13 @@ class Botright(AsyncObject):
         self.user_action_layer = user_action_layer
         self.mask_fingerprint = mask_fingerprint
         self.use_undetected_playwright = use_undetected_playwright
-        self.cache: Dict[str, APIResponse] = {}
+        self.sync_timing = sync_timing
+        self.resource_blocker = resource_blocker
+        self.bandwidth_budget = bandwidth_budget
+        self.proxy_cache = proxy_cache
+        self.geoip = geoip
+        self.forwarding_proxy = forwarding_proxy
+        self.cache: Union[ResponseCache, DiskCache] = response_cache if response_cache is not None else ResponseCache()
 
         # '--disable-gpu', '--incognito', '--disable-blink-features=AutomationControlled'
         # fmt: off
@@ -131,12 +165,12 @@ class Botright(AsyncObject):
 
         self.fingerprint_generator = AsyncFingerprintGenerator()
 
-    async def new_browser(self, proxy: Optional[str] = None, **launch_arguments) -> BrowserContext:
+    async def new_browser(self, proxy: Optional[Union[str, ProxyPool]] = None, **launch_arguments) -> BrowserContext:
         """
         Create a new Botright browser instance with specified configurations.
 
         Args:
-            proxy (str, optional): Proxy server URL to use for the browser. Defaults to None.
+            proxy (Union[str, ProxyPool], optional): Proxy server URL to use for the browser, or a ProxyPool to take the healthiest available proxy from. Defaults to None.
             **launch_arguments: Additional launch arguments to the browser. See at `Playwright Docs <https://playwright.dev/python/docs/api/class-browsertype#browser-type-launch-persistent-context>`_.
 
         Returns:
@@ -144,27 +178,88 @@ class Botright(AsyncObject):
         """
 
         # Calling ProxyManager and Faker to get necessary information for Botright
-        _proxy: ProxyManager = await ProxyManager(self, proxy)
-        _faker: Faker = await Faker(self, _proxy)
-
-        # Launching Main Browser
-        if self.mask_fingerprint:
-            flags = self.flags + [f"--user-agent={_faker.fingerprint.navigator.user_agent}"]
+        if isinstance(proxy, ProxyPool):
+            if proxy not in self.stoppable:
+                self.stoppable.append(proxy)
+            await proxy.start(self)
+            _proxy: ProxyManager = await proxy.acquire()
         else:
-            flags = self.flags
+            _proxy = await ProxyManager(self, proxy)
+
+        try:
+            _faker: Faker = await Faker(self, _proxy)
+
+            # Launching Main Browser
+            if self.mask_fingerprint:
+                flags = self.flags + [f"--user-agent={_faker.fingerprint.navigator.user_agent}"]
+            else:
+                flags = self.flags
 
-        _browser = await browser.new_browser(self, _proxy, _faker, flags, **launch_arguments)
+            _browser = await browser.new_browser(self, _proxy, _faker, flags, **launch_arguments)
+        except BaseException:
+            # The pool's proxy would stay taken by a browser which never launched
+            if isinstance(proxy, ProxyPool):
+                proxy.release(_proxy)
+            raise
+
+        if isinstance(proxy, ProxyPool):
+            proxy.attach(_browser)
         _browser.proxy = _proxy
         _browser.faker = _faker
         _browser.user_action_layer = self.user_action_layer
         _browser.scroll_into_view = self.scroll_into_view
         _browser.mask_fingerprint = self.mask_fingerprint
+        _browser.sync_timing = self.sync_timing
 
         await _browser.grant_permissions(["notifications", "geolocation"])
         self.stoppable.append(_browser)
 
         return _browser
 
+    async def rotate_proxy(self, browser: BrowserContext, proxy: Optional[Union[str, ProxyPool]] = None, drop_connections: bool = True) -> ProxyManager:
+        """
+        Swap the proxy of a running browser, keeping its cache, cookies and pages. Needs Botright(forwarding_proxy=True).
+
+        Args:
+            browser (BrowserContext): The browser to rotate the proxy of.
+            proxy (Union[str, ProxyPool], optional): The new proxy, or a ProxyPool to take the healthiest available proxy from. Defaults to None (connecting directly).
+            drop_connections (bool, optional): Whether to close the connections still tunneling through the previous proxy. Defaults to True.
+
+        Returns:
+            ProxyManager: The new proxy.
+        """
+        if browser.forwarder is None:
+            raise RuntimeError("Swapping the proxy of a running browser needs Botright(forwarding_proxy=True)")
+
+        previous = browser.proxy
+        if isinstance(proxy, ProxyPool):
+            if proxy not in self.stoppable:
+                self.stoppable.append(proxy)
+            await proxy.start(self)
+            _proxy: ProxyManager = await proxy.acquire()
+        else:
+            _proxy = await ProxyManager(self, proxy)
+
+        try:
+            await browser.set_proxy(_proxy, drop_connections=drop_connections)
+        except BaseException:
+            # The new proxy would stay taken by, or open for, a browser which never switched to it
+            if isinstance(proxy, ProxyPool):
+                proxy.release(_proxy)
+            else:
+                await _proxy.close()
+            raise
+
+        if isinstance(proxy, ProxyPool):
+            proxy.attach(browser)
+        # Proxies of pools are shared and go back to their pool, all others belonged to this browser alone
+        pools = [pool for pool in self.stoppable if isinstance(pool, ProxyPool) and previous in pool]
+        for pool in pools:
+            pool.release(previous)
+        if not pools:
+            await previous.close()
+        return _proxy
+
     async def __adel__(self) -> None:
         """
         Cleanup method called when the Botright instance is closed.
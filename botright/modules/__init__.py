@@ -1,4 +1,13 @@
+from .bandwidth import BandwidthMeter
+from .disk_cache import DiskCache
 from .faker import Faker
+from .forwarding_proxy import ForwardingProxy
+from .geoip import GeoIP
+from .proxy_cache import ProxyCheckCache
 from .proxy_manager import ProxyManager
+from .proxy_pool import ProxyPool
+from .proxy_validator import ProxyValidator
+from .resource_blocker import ResourceBlocker
+from .response_cache import ResponseCache
 
-__all__ = ["Faker", "ProxyManager"]
+__all__ = ["BandwidthMeter", "DiskCache", "Faker", "ForwardingProxy", "GeoIP", "ProxyCheckCache", "ProxyManager", "ProxyPool", "ProxyValidator", "ResourceBlocker", "ResponseCache"]
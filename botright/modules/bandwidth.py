@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+from playwright.async_api import APIResponse as PlaywrightAPIResponse
+from playwright.async_api import Error as PlaywrightError
+
+if TYPE_CHECKING:
+    from ..playwright_mock import InterceptedRequest, Page
+
+
+class BandwidthMeter:
+    def __init__(self, budget: Optional[int] = None, parent: Optional[BandwidthMeter] = None, abort_types: Sequence[str] = ("media", "document")) -> None:
+        """
+        Counts the bytes transferred by a browser context or proxy, broken down by resource type and domain.
+
+        Browser traffic is taken from the encodedDataLength of CDP's Network.loadingFinished events, which includes headers and is measured before decompression,
+        like proxies bill it. Responses which never went through the proxy (from the browser's caches, a service worker or fulfilled by a route) aren't counted.
+        Botright's own httpx requests and the route.fetch() requests of cache_responses go through the proxy and are counted as well.
+
+        Args:
+            budget (int, optional): Byte cap of the meter. Once it's exceeded, requests of the abort_types get aborted by the attached pages. Defaults to None (unlimited).
+            parent (BandwidthMeter, optional): A meter which all bytes get counted towards as well, e.g. the one of the context's proxy. Defaults to None.
+            abort_types (Sequence[str], optional): The resource types aborted once the budget is exceeded. Defaults to media and documents, the largest loads.
+        """
+        self.budget = budget
+        self.parent = parent
+        self.abort_types = tuple(abort_types)
+
+        self.bytes = 0
+        self.requests = 0
+        self.aborted = 0
+        self.by_type: Counter[str] = Counter()
+        self.by_domain: Counter[str] = Counter()
+        self._pages: List[Page] = []
+        # Pages aren't hashable, so they are tracked by id
+        self._enforcing: Set[int] = set()
+        self._tasks: Set[asyncio.Future[None]] = set()
+
+    @property
+    def exceeded(self) -> bool:
+        return self.budget is not None and self.bytes > self.budget
+
+    def record(self, size: int, resource_type: str, domain: str) -> None:
+        """
+        Count transferred bytes towards the meter and its parents.
+
+        Args:
+            size (int): The amount of bytes, including headers.
+            resource_type (str): The Playwright resource type of the request, or "httpx" for Botright's own requests.
+            domain (str): The host of the request.
+        """
+        self.bytes += size
+        self.requests += 1
+        self.by_type[resource_type] += size
+        self.by_domain[domain] += size
+
+        if self.exceeded:
+            for page in self._pages:
+                if id(page) not in self._enforcing:
+                    task = asyncio.ensure_future(self._enforce_budget(page))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+
+        if self.parent:
+            self.parent.record(size, resource_type, domain)
+
+    async def attach(self, page: Page) -> None:
+        """
+        Meter the traffic of a page through its CDP session.
+
+        Args:
+            page (Page): The page to meter.
+        """
+        cdp = page.cdp
+        if cdp is None or page in self._pages:
+            return
+        self._pages.append(page)
+        page.on("close", lambda _: self._pages.remove(page))
+
+        # The type and domain of a request are only known from its start, so they are kept until it finished
+        in_flight: Dict[str, Tuple[str, str]] = {}
+        # Requests which never reached the proxy
+        served_locally: Set[str] = set()
+
+        def on_request_will_be_sent(params: Dict[str, Any]) -> None:
+            in_flight[params["requestId"]] = (params.get("type", "Other").lower(), urlsplit(params["request"]["url"]).hostname or "")
+
+        def on_response_received(params: Dict[str, Any]) -> None:
+            response = params["response"]
+            # Responses fulfilled by a route (e.g. from Botright's cache) have no remote address, as they never touched a socket
+            if response.get("fromDiskCache") or response.get("fromServiceWorker") or response.get("fromPrefetchCache") or not response.get("remoteIPAddress"):
+                served_locally.add(params["requestId"])
+
+        def on_request_served_from_cache(params: Dict[str, Any]) -> None:
+            served_locally.add(params["requestId"])
+
+        def on_loading_finished(params: Dict[str, Any]) -> None:
+            resource_type, domain = in_flight.pop(params["requestId"], ("other", ""))
+            if params["requestId"] in served_locally:
+                served_locally.discard(params["requestId"])
+                return
+            self.record(int(params.get("encodedDataLength", 0)), resource_type, domain)
+
+        def on_loading_failed(params: Dict[str, Any]) -> None:
+            in_flight.pop(params["requestId"], None)
+            served_locally.discard(params["requestId"])
+
+        cdp.on("Network.requestWillBeSent", on_request_will_be_sent)
+        cdp.on("Network.responseReceived", on_response_received)
+        cdp.on("Network.requestServedFromCache", on_request_served_from_cache)
+        cdp.on("Network.loadingFinished", on_loading_finished)
+        cdp.on("Network.loadingFailed", on_loading_failed)
+        await cdp.send("Network.enable")
+
+        if self.exceeded:
+            await self._enforce_budget(page)
+
+    async def _enforce_budget(self, page: Page) -> None:
+        if id(page) in self._enforcing:
+            return
+        self._enforcing.add(id(page))
+
+        async def abort(request: InterceptedRequest) -> None:
+            self.aborted += 1
+            await request.fail("BlockedByClient")
+
+        try:
+            for resource_type in self.abort_types:
+                # Only requests of the aborted types get paused by the browser
+                await page.intercept("*", abort, resource_type=resource_type)
+        except PlaywrightError:
+            # The page got closed in the meantime
+            pass
+
+    async def meter_httpx_response(self, response: httpx.Response) -> None:
+        """Count a request of Botright's own httpx clients, reading its response if it wasn't yet."""
+        await response.aread()
+        request = response.request
+        headers_size = sum(len(name) + len(value) + 4 for name, value in (*request.headers.raw, *response.headers.raw))
+        self.record(response.num_bytes_downloaded + len(request.content) + headers_size, "httpx", request.url.host)
+
+    def meter_api_response(self, response: PlaywrightAPIResponse, body: bytes, resource_type: str) -> None:
+        """Count a request fetched for the browser with route.fetch(), which goes through the proxy without showing up in the browser's CDP events."""
+        headers_size = sum(len(header["name"]) + len(header["value"]) + 4 for header in response.headers_array)
+        # Playwright decompresses the body, so the transferred size is taken from Content-Length where it's known
+        content_length = response.headers.get("content-length", "")
+        self.record(headers_size + (int(content_length) if content_length.isdigit() else len(body)), resource_type, urlsplit(response.url).hostname or "")
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "bytes": self.bytes,
+            "requests": self.requests,
+            "budget": self.budget,
+            "exceeded": self.exceeded,
+            "aborted": self.aborted,
+            "by_type": dict(self.by_type.most_common()),
+            "by_domain": dict(self.by_domain.most_common()),
+        }
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+
+from .response_cache import BaseCache, CachedResponse, freshness_lifetime, heuristic_lifetime, is_storable, shared_headers, vary_variant
+
+default_cache_dir = Path.home().joinpath(".cache", "botright", "http")
+
+T = TypeVar("T")
+
+
+class DiskCache(BaseCache):
+    def __init__(self, directory: Optional[Union[str, Path]] = None, max_bytes: int = 1024 * 1024 * 1024, heuristic_ttl: float = 3600.0) -> None:
+        """
+        Persistent HTTP cache shared by all Botright processes on a host, with the same interface as ResponseCache.
+
+        Bodies are stored content-addressed (by their sha256) in files, so identical responses of different URLs are only stored once.
+        The index lives in a SQLite database in WAL mode, keyed by URL and the request headers named in the response's Vary header.
+        Freshness follows Cache-Control and Expires. Stale entries are kept, as their ETag and Last-Modified validators allow revalidating them.
+        Concurrent fetches are only coalesced within a process, as other processes can't await them.
+        Its methods block on file I/O and on the database locks of other processes, so Botright runs them on a worker thread of the cache (see offload).
+
+        Args:
+            directory (Union[str, Path], optional): The cache directory. Defaults to ~/.cache/botright/http.
+            max_bytes (int, optional): Byte budget of all cached bodies. Least recently used entries get evicted to stay within it. Defaults to 1 GiB.
+            heuristic_ttl (float, optional): Seconds responses without explicit freshness information stay fresh at most. They get 10% of the time since their Last-Modified. Defaults to 3600.
+        """
+        super().__init__()
+        self.directory = Path(directory) if directory else default_cache_dir
+        self.bodies_dir = self.directory.joinpath("bodies")
+        self.bodies_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.heuristic_ttl = heuristic_ttl
+
+        # Autocommit mode, as transactions are opened explicitly. The timeout makes concurrent writers of other processes wait for each other
+        self._db = sqlite3.connect(self.directory.joinpath("index.sqlite3"), timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries (url TEXT NOT NULL, variant TEXT NOT NULL, vary TEXT NOT NULL, status INTEGER NOT NULL, headers TEXT NOT NULL, digest TEXT NOT NULL, "
+            "stored_at REAL NOT NULL, expires_at REAL, accessed_at REAL NOT NULL, PRIMARY KEY (url, variant))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS bodies (digest TEXT PRIMARY KEY, size INTEGER NOT NULL)")
+
+        self.stale = 0
+        # A single worker, as the transactions of the shared connection must not interleave
+        self._worker: Optional[threading.Thread] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="botright-disk-cache", initializer=self._set_worker)
+
+    def _set_worker(self) -> None:
+        self._worker = threading.current_thread()
+
+    def _on_worker(self, function: Callable[..., T], *args: Any) -> T:
+        # Queries of other threads (like the event loop's) wait for the worker's transaction to finish instead of interleaving with it on the shared connection
+        if threading.current_thread() is self._worker:
+            return function(*args)
+        return self._executor.submit(function, *args).result()
+
+    def _count(self) -> int:
+        count: int = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return count
+
+    def __len__(self) -> int:
+        return self._on_worker(self._count)
+
+    def _contains(self, key: str) -> bool:
+        return self._db.execute("SELECT 1 FROM entries WHERE url = ?", (key,)).fetchone() is not None
+
+    def __contains__(self, key: str) -> bool:
+        return self._on_worker(self._contains, key)
+
+    def _body_path(self, digest: str) -> Path:
+        return self.bodies_dir.joinpath(digest[:2], digest)
+
+    def _read_body(self, digest: str) -> Optional[bytes]:
+        try:
+            with open(self._body_path(digest), "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            # Another process evicted the body in the meantime
+            return None
+
+    def _write_body(self, digest: str, body: bytes) -> None:
+        path = self._body_path(digest)
+        if path.exists():
+            return
+        path.parent.mkdir(exist_ok=True)
+        # Writing to a temporary file first, so other processes never read partially written bodies
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as file:
+            file.write(body)
+        os.replace(file.name, path)
+
+    async def offload(self, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run one of the cache's methods on its worker thread, so the event loop keeps running while it waits for the disk or another process's lock.
+
+        Args:
+            function (Callable[..., T]): The method, e.g. cache.get.
+            *args, **kwargs: Its arguments.
+
+        Returns:
+            T: The result of the method.
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(function, *args, **kwargs))
+
+    def get(self, key: str, request_headers: Optional[Dict[str, str]] = None) -> Optional[CachedResponse]:
+        """
+        Get a fresh cached response matching the request headers and mark it as recently used.
+
+        Args:
+            key (str): The cache key, usually the request URL.
+            request_headers (Dict[str, str], optional): The request headers, to pick the variant of responses with a Vary header. Defaults to None.
+
+        Returns:
+            Optional[CachedResponse]: The cached response, or None if it isn't cached or stale.
+        """
+        entry = self.lookup(key, request_headers)
+        if entry is None or not entry.fresh:
+            self.misses += 1
+            self.stale += entry is not None
+            return None
+
+        self.hits += 1
+        self.bytes_saved += len(entry.body)
+        return entry
+
+    def lookup(self, key: str, request_headers: Optional[Dict[str, str]] = None) -> Optional[CachedResponse]:
+        """
+        Get a cached response matching the request headers, fresh or stale, without counting it as a hit or miss.
+
+        Args:
+            key (str): The cache key, usually the request URL.
+            request_headers (Dict[str, str], optional): The request headers, to pick the variant of responses with a Vary header. Defaults to None.
+
+        Returns:
+            Optional[CachedResponse]: The cached response, or None if it isn't cached.
+        """
+        rows: List[Tuple[str, str, int, str, str, float, Optional[float]]] = self._db.execute(
+            "SELECT variant, vary, status, headers, digest, stored_at, expires_at FROM entries WHERE url = ?", (key,)
+        ).fetchall()
+
+        for variant, vary, status, headers, digest, stored_at, expires_at in rows:
+            if variant != vary_variant(vary, request_headers):
+                continue
+
+            body = self._read_body(digest)
+            if body is None:
+                self._db.execute("DELETE FROM entries WHERE url = ? AND variant = ?", (key, variant))
+                return None
+
+            self._db.execute("UPDATE entries SET accessed_at = ? WHERE url = ? AND variant = ?", (time.time(), key, variant))
+            return CachedResponse(status, json.loads(headers), body, stored_at, expires_at)
+        return None
+
+    def put(self, key: str, status: int, headers: Dict[str, str], body: bytes, request_headers: Optional[Dict[str, str]] = None, max_age: Optional[float] = None) -> CachedResponse:
+        """
+        Cache a response on disk, evicting the least recently used entries to stay within the byte budget.
+
+        Args:
+            key (str): The cache key, usually the request URL.
+            status (int): The response status code.
+            headers (Dict[str, str]): The response headers with lowercase names.
+            body (bytes): The response body.
+            request_headers (Dict[str, str], optional): The request headers, to store the variant of responses with a Vary header. Defaults to None.
+            max_age (float, optional): Seconds the response stays fresh at most, on top of its Cache-Control and Expires headers. Defaults to None.
+
+        Returns:
+            CachedResponse: The response, even if it isn't storable or too large to be cached.
+        """
+        now = time.time()
+        headers = dict(headers)
+        lifetime = freshness_lifetime(headers, heuristic_lifetime(status, headers, self.heuristic_ttl))
+        entry = CachedResponse(status, headers, body, now, now + (min(lifetime, max_age) if max_age is not None else lifetime))
+        if not is_storable(headers) or len(body) > self.max_bytes:
+            return entry
+
+        digest = hashlib.sha256(body).hexdigest()
+        self._write_body(digest, body)
+
+        vary = ",".join(sorted(name.strip().lower() for name in headers.get("vary", "").split(",") if name.strip()))
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._db.execute("INSERT OR IGNORE INTO bodies (digest, size) VALUES (?, ?)", (digest, len(body)))
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (url, variant, vary, status, headers, digest, stored_at, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, vary_variant(vary, request_headers), vary, status, json.dumps(shared_headers(headers)), digest, now, entry.expires_at, now),
+            )
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+
+        self._evict()
+        return entry
+
+    def _evict(self) -> None:
+        bytes_stored = self._bytes_stored()
+        if bytes_stored <= self.max_bytes:
+            return
+
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            while bytes_stored > self.max_bytes:
+                # Dropping bodies no entry references anymore (e.g. after an entry got replaced) first
+                orphans = self._db.execute("SELECT digest, size FROM bodies WHERE digest NOT IN (SELECT digest FROM entries)").fetchall()
+                for digest, size in orphans:
+                    self._db.execute("DELETE FROM bodies WHERE digest = ?", (digest,))
+                    self._body_path(digest).unlink(missing_ok=True)
+                    bytes_stored -= size
+                if bytes_stored <= self.max_bytes:
+                    break
+
+                oldest = self._db.execute("SELECT url, variant FROM entries ORDER BY accessed_at LIMIT 1").fetchone()
+                if oldest is None:
+                    break
+                self._db.execute("DELETE FROM entries WHERE url = ? AND variant = ?", oldest)
+                self.evictions += 1
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+
+    def _bytes_stored(self) -> int:
+        bytes_stored: int = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM bodies").fetchone()[0]
+        return bytes_stored
+
+    @property
+    def bytes_stored(self) -> int:
+        return self._on_worker(self._bytes_stored)
+
+    def clear(self) -> None:
+        self._db.execute("BEGIN IMMEDIATE")
+        digests = [digest for (digest,) in self._db.execute("SELECT digest FROM bodies").fetchall()]
+        self._db.execute("DELETE FROM entries")
+        self._db.execute("DELETE FROM bodies")
+        self._db.execute("COMMIT")
+        for digest in digests:
+            self._body_path(digest).unlink(missing_ok=True)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self._db.close()
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        return {"entries": len(self), "bytes_stored": self.bytes_stored, "stale": self.stale, **super().stats}
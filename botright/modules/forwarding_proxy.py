@@ -0,0 +1,318 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import hmac
+import secrets
+import time
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import unquote, urlsplit
+
+# Longest request or response head accepted, like Chromium's limit
+max_head_size = 256 * 1024
+
+
+class Upstream(NamedTuple):
+    host: str
+    port: int
+    # The Proxy-Authorization header value, if the upstream needs credentials
+    authorization: Optional[str]
+
+    @classmethod
+    def parse(cls, proxy: str) -> Upstream:
+        parsed = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+        if parsed.scheme != "http":
+            raise ValueError(f"Only HTTP upstream proxies can be forwarded to, not {parsed.scheme}")
+        if not parsed.hostname or not parsed.port:
+            raise ValueError(f"Upstream proxy ({proxy}) needs a host and port")
+
+        authorization = None
+        if parsed.username:
+            credentials = f"{unquote(parsed.username)}:{unquote(parsed.password or '')}"
+            authorization = f"Basic {base64.b64encode(credentials.encode()).decode()}"
+        return cls(parsed.hostname, parsed.port, authorization)
+
+
+class IdleConnection(NamedTuple):
+    upstream: Upstream
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+    opened_at: float
+
+
+def split_head(head: bytes) -> Tuple[str, List[Tuple[str, str]]]:
+    first_line, *lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+    headers = []
+    for line in lines:
+        name, _, value = line.partition(":")
+        headers.append((name.strip(), value.strip()))
+    return first_line, headers
+
+
+def join_head(first_line: str, headers: List[Tuple[str, str]]) -> bytes:
+    return "".join([f"{first_line}\r\n", *(f"{name}: {value}\r\n" for name, value in headers), "\r\n"]).encode("latin-1")
+
+
+class ForwardingProxy:
+    def __init__(self, upstream: Optional[str] = None, host: str = "127.0.0.1", port: int = 0, idle_connections: int = 4, keepalive_expiry: float = 30.0, connect_timeout: float = 10.0) -> None:
+        """
+        In-process HTTP proxy on localhost, forwarding the browser's traffic to an upstream proxy which can be swapped while the browser keeps running.
+
+        Rotating the exit IP this way only takes a new upstream connection, instead of relaunching the browser and losing its cache, cookies and warm connections.
+        A few connections to the upstream are opened ahead of time, so new tunnels skip the TCP handshake with the upstream.
+        Clients have to authenticate with the proxy's own random credentials (see browser_proxy), so other local processes can't use the upstream's credentials.
+
+        Args:
+            upstream (str, optional): The upstream proxy, e.g. "http://username:password@ip:port". Defaults to None (connecting directly).
+            host (str, optional): The address to listen on. Defaults to "127.0.0.1".
+            port (int, optional): The port to listen on. Defaults to 0 (any free port).
+            idle_connections (int, optional): Upstream connections kept open ahead of time. Defaults to 4.
+            keepalive_expiry (float, optional): Seconds an idle upstream connection is used for, before the upstream might have closed it. Defaults to 30 seconds.
+            connect_timeout (float, optional): Seconds to wait for connections and the upstream's CONNECT response. Defaults to 10 seconds.
+        """
+        self.host = host
+        self.port = port
+        self.idle_connections = idle_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.connect_timeout = connect_timeout
+        self._upstream = Upstream.parse(upstream) if upstream else None
+        self.username = "botright"
+        self.password = secrets.token_urlsafe(24)
+        self._authorization = f"Basic {base64.b64encode(f'{self.username}:{self.password}'.encode()).decode()}"
+
+        self.connections = 0
+        self.rejected = 0
+        self.tunnels = 0
+        self.failures = 0
+        self.opened = 0
+        self.reused = 0
+        self.rotations = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._idle: List[IdleConnection] = []
+        self._filling: Optional[asyncio.Future[None]] = None
+        # Writers of the browser's connections, so rotations can close them
+        self._clients: Set[asyncio.StreamWriter] = set()
+        self._handlers: Set[asyncio.Future[None]] = set()
+
+    @property
+    def upstream(self) -> Optional[Upstream]:
+        return self._upstream
+
+    @property
+    def browser_proxy(self) -> Dict[str, str]:
+        # The browser authenticates with the local proxy's credentials, the upstream's get added to every forwarded request
+        return {"server": f"http://{self.host}:{self.port}", "username": self.username, "password": self.password}
+
+    @property
+    def url(self) -> str:
+        # The proxy URL with its credentials, for other clients like httpx
+        return f"http://{self.username}:{self.password}@{self.host}:{self.port}"
+
+    def _authorized(self, headers: List[Tuple[str, str]]) -> bool:
+        authorization = next((value for name, value in headers if name.lower() == "proxy-authorization"), "")
+        return hmac.compare_digest(authorization.encode("latin-1"), self._authorization.encode("latin-1"))
+
+    async def start(self) -> ForwardingProxy:
+        """Start listening, returning the proxy itself for chaining."""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port, limit=max_head_size)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._fill_idle()
+        return self
+
+    async def set_upstream(self, upstream: Optional[str], drop_connections: bool = True) -> None:
+        """
+        Forward all new connections to another upstream proxy.
+
+        Args:
+            upstream (str, optional): The new upstream proxy, e.g. "http://username:password@ip:port". None connects directly.
+            drop_connections (bool, optional): Whether to close the browser's open connections, which still tunnel through the previous upstream.
+                The browser reconnects transparently on its next requests. Defaults to True.
+        """
+        self._upstream = Upstream.parse(upstream) if upstream else None
+        self.rotations += 1
+
+        if self._filling:
+            self._filling.cancel()
+        for idle in self._idle:
+            idle.writer.close()
+        self._idle.clear()
+        if drop_connections:
+            for writer in list(self._clients):
+                writer.close()
+        self._fill_idle()
+
+    def _fill_idle(self) -> None:
+        if self._upstream and self.idle_connections and (self._filling is None or self._filling.done()):
+            self._filling = asyncio.ensure_future(self._open_idle(self._upstream))
+
+    async def _open_idle(self, upstream: Upstream) -> None:
+        while len(self._idle) < self.idle_connections and upstream == self._upstream:
+            try:
+                reader, writer = await self._open(upstream.host, upstream.port)
+            except (OSError, asyncio.TimeoutError):
+                # The upstream is unreachable, connections get opened on demand again
+                return
+            if upstream != self._upstream:
+                writer.close()
+                return
+            self._idle.append(IdleConnection(upstream, reader, writer, time.monotonic()))
+
+    async def _open(self, host: str, port: int) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port, limit=max_head_size), self.connect_timeout)
+        self.opened += 1
+        return reader, writer
+
+    async def _connect_upstream(self, upstream: Upstream) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter, bool]:
+        # Taking a connection opened ahead of time, unless the upstream might have closed it in the meantime
+        while self._idle:
+            idle = self._idle.pop()
+            if idle.upstream == upstream and time.monotonic() - idle.opened_at < self.keepalive_expiry and not idle.reader.at_eof():
+                self.reused += 1
+                self._fill_idle()
+                return idle.reader, idle.writer, True
+            idle.writer.close()
+
+        reader, writer = await self._open(upstream.host, upstream.port)
+        self._fill_idle()
+        return reader, writer, False
+
+    async def _open_tunnel(self, upstream: Upstream, target: str) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter, bytes]:
+        headers = [("Host", target)]
+        if upstream.authorization:
+            headers.append(("Proxy-Authorization", upstream.authorization))
+        request = join_head(f"CONNECT {target} HTTP/1.1", headers)
+
+        while True:
+            reader, writer, reused = await self._connect_upstream(upstream)
+            try:
+                writer.write(request)
+                await writer.drain()
+                response = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.connect_timeout)
+                return reader, writer, response
+            except (ConnectionError, asyncio.IncompleteReadError):
+                writer.close()
+                # Idle connections can be closed by the upstream without us noticing, a fresh one is tried instead
+                if not reused:
+                    raise
+
+    async def _handle_client(self, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._clients.add(client_writer)
+        # Every connection gets handled in a task of its own
+        handler = asyncio.current_task()
+        assert handler is not None
+        self._handlers.add(handler)
+        upstream_writer: Optional[asyncio.StreamWriter] = None
+        try:
+            head = await client_reader.readuntil(b"\r\n\r\n")
+            request_line, headers = split_head(head)
+            method, target, version = request_line.split(" ", 2)
+            if not self._authorized(headers):
+                # Challenging the client, which the browser answers with the credentials of browser_proxy
+                self.rejected += 1
+                client_writer.write(f'{version} 407 Proxy Authentication Required\r\nProxy-Authenticate: Basic realm="Botright"\r\nContent-Length: 0\r\nConnection: close\r\n\r\n'.encode("latin-1"))
+                await client_writer.drain()
+                return
+            # The upstream at the time of the request, rotations only apply to new connections
+            upstream = self._upstream
+
+            if method == "CONNECT":
+                if upstream:
+                    upstream_reader, upstream_writer, response = await self._open_tunnel(upstream, target)
+                    status = response.split(b" ", 2)[1]
+                    if status != b"200":
+                        # Passing the upstream's refusal on, so the browser reports the failed tunnel
+                        self.failures += 1
+                        client_writer.write(response)
+                        await client_writer.drain()
+                        return
+                else:
+                    host, _, port = target.rpartition(":")
+                    upstream_reader, upstream_writer = await self._open(host.strip("[]"), int(port))
+                self.tunnels += 1
+                client_writer.write(f"{version} 200 Connection established\r\n\r\n".encode("latin-1"))
+                await client_writer.drain()
+
+            else:
+                # Later requests on the browser's connection aren't parsed, so each plain HTTP request gets a connection of its own
+                headers = [(name, value) for name, value in headers if name.lower() not in ("proxy-authorization", "proxy-connection", "connection")]
+                headers.append(("Connection", "close"))
+                if upstream:
+                    # Plain HTTP requests keep their absolute URL, the upstream proxy resolves it
+                    if upstream.authorization:
+                        headers.append(("Proxy-Authorization", upstream.authorization))
+                    upstream_reader, upstream_writer, _ = await self._connect_upstream(upstream)
+                    upstream_writer.write(join_head(request_line, headers))
+                else:
+                    url = urlsplit(target)
+                    path = f"{url.path or '/'}?{url.query}" if url.query else url.path or "/"
+                    upstream_reader, upstream_writer = await self._open(url.hostname or "", url.port or 80)
+                    upstream_writer.write(join_head(f"{method} {path} {version}", headers))
+
+            await self._relay(client_reader, client_writer, upstream_reader, upstream_writer)
+
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError, IndexError):
+            # Unreachable targets or upstreams, and malformed requests
+            self.failures += 1
+            if not client_writer.is_closing():
+                client_writer.write(b"HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+        finally:
+            self._clients.discard(client_writer)
+            self._handlers.discard(handler)
+            client_writer.close()
+            if upstream_writer:
+                upstream_writer.close()
+
+    async def _relay(self, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter, upstream_reader: asyncio.StreamReader, upstream_writer: asyncio.StreamWriter) -> None:
+        async def pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, sent: bool) -> None:
+            while data := await reader.read(65536):
+                writer.write(data)
+                await writer.drain()
+                if sent:
+                    self.bytes_sent += len(data)
+                else:
+                    self.bytes_received += len(data)
+
+        pipes = [asyncio.ensure_future(pipe(client_reader, upstream_writer, True)), asyncio.ensure_future(pipe(upstream_reader, client_writer, False))]
+        try:
+            # Either side closing ends the connection, so rotations closing the browser's side also close the upstream's
+            await asyncio.wait(pipes, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pipes:
+                task.cancel()
+            await asyncio.gather(*pipes, return_exceptions=True)
+
+    async def close(self) -> None:
+        """Stop listening and close all connections."""
+        if self._filling:
+            self._filling.cancel()
+        if self._server:
+            self._server.close()
+        for idle in self._idle:
+            idle.writer.close()
+        self._idle.clear()
+        for writer in list(self._clients):
+            writer.close()
+        # The closed connections end their handlers, which close the upstream connections in turn
+        if self._handlers:
+            await asyncio.wait(self._handlers, timeout=self.connect_timeout)
+        if self._server:
+            await self._server.wait_closed()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "connections": self.connections,
+            "rejected": self.rejected,
+            "active": len(self._clients),
+            "tunnels": self.tunnels,
+            "failures": self.failures,
+            "opened": self.opened,
+            "reused": self.reused,
+            "rotations": self.rotations,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+        }
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import csv
+import ipaddress
+import json
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+# Range table layout: header, fixed size records sorted by their start address, then the JSON list of distinct locations the records point to
+table_magic = b"BRGEOIP1"
+header_struct = struct.Struct("<8sII")  # magic, record count, offset of the locations
+record_struct = struct.Struct(">16s16sI")  # first address, last address, location index
+
+
+class GeoLocation(NamedTuple):
+    country: str
+    country_code: str
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    timezone: Optional[str] = None
+
+
+def packed_address(ip: str) -> bytes:
+    # IPv4 addresses are mapped into IPv6 (::ffff:a.b.c.d), so both share one table and compare as 16 big-endian bytes
+    address = ipaddress.ip_address(ip)
+    if address.version == 4:
+        return ipaddress.IPv6Address(0xFFFF00000000 | int(address)).packed
+    return address.packed
+
+
+class GeoIP:
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        Offline GeoIP resolver, memory-mapping its database so every process on a host shares the same pages and each lookup takes microseconds.
+
+        Reads MaxMind DB files (.mmdb, like GeoLite2-City or DB-IP Lite, needs the maxminddb package) or Botright's compact range tables built with GeoIP.build.
+
+        Args:
+            path (Union[str, Path]): The database file.
+        """
+        self.path = Path(path)
+        self.hits = 0
+        self.misses = 0
+        self._reader: Any = None
+        self._table: Optional[mmap.mmap] = None
+
+        if self.path.suffix == ".mmdb":
+            try:
+                import maxminddb
+            except ImportError:
+                raise ImportError("Reading .mmdb databases needs maxminddb. Install it with: pip install botright[geoip]")
+            self._reader = maxminddb.open_database(str(self.path), maxminddb.MODE_MMAP)
+            return
+
+        with open(self.path, "rb") as file:
+            self._table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._records, locations_offset = header_struct.unpack_from(self._table, 0)
+        if magic != table_magic:
+            raise ValueError(f"{self.path} is neither a .mmdb database nor a GeoIP range table")
+        self._locations = [GeoLocation(*location) for location in json.loads(self._table[locations_offset:])]
+
+    def lookup(self, ip: str) -> Optional[GeoLocation]:
+        """
+        Resolve an IP address to its location.
+
+        Args:
+            ip (str): The IPv4 or IPv6 address.
+
+        Returns:
+            Optional[GeoLocation]: The location, or None if the database doesn't know the address.
+        """
+        try:
+            location = self._lookup_mmdb(ip) if self._reader else self._lookup_table(packed_address(ip))
+        except ValueError:
+            # Not an IP address
+            location = None
+
+        if location is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return location
+
+    def _lookup_table(self, address: bytes) -> Optional[GeoLocation]:
+        assert self._table is not None
+        # Binary search for the last range starting at or before the address, reading the records straight from the mapped file
+        low, high = 0, self._records
+        offset = header_struct.size
+        while low < high:
+            middle = (low + high) // 2
+            start = offset + middle * record_struct.size
+            if self._table[start : start + 16] <= address:
+                low = middle + 1
+            else:
+                high = middle
+        if not low:
+            return None
+
+        _, last, location = record_struct.unpack_from(self._table, offset + (low - 1) * record_struct.size)
+        return self._locations[location] if address <= last else None
+
+    def _lookup_mmdb(self, ip: str) -> Optional[GeoLocation]:
+        record = self._reader.get(ip)
+        if not record or "country" not in record:
+            return None
+        country = record["country"]
+        location = record.get("location", {})
+        return GeoLocation(country.get("names", {}).get("en", ""), country.get("iso_code", ""), location.get("latitude"), location.get("longitude"), location.get("time_zone"))
+
+    @staticmethod
+    def build(path: Union[str, Path], ranges: Iterable[Tuple[str, str, GeoLocation]]) -> None:
+        """
+        Build a range table from address ranges, e.g. converted from a free IP-to-location CSV.
+
+        Args:
+            path (Union[str, Path]): The file to write the table to. It gets replaced atomically, so running processes keep their mapping of the old table.
+            ranges (Iterable[Tuple[str, str, GeoLocation]]): The first and last address of each range, and its location. Ranges must not overlap.
+        """
+        location_indexes: Dict[GeoLocation, int] = {}
+        records: List[Tuple[bytes, bytes, int]] = []
+        for first, last, location in ranges:
+            index = location_indexes.setdefault(location, len(location_indexes))
+            records.append((packed_address(first), packed_address(last), index))
+        records.sort()
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as file:
+            file.write(header_struct.pack(table_magic, len(records), header_struct.size + len(records) * record_struct.size))
+            for record in records:
+                file.write(record_struct.pack(*record))
+            file.write(json.dumps(list(location_indexes)).encode())
+        os.replace(file.name, path)
+
+    @classmethod
+    def build_from_csv(cls, path: Union[str, Path], csv_path: Union[str, Path]) -> None:
+        """
+        Build a range table from a CSV with the columns first address, last address, country code, country, latitude, longitude and timezone.
+
+        Args:
+            path (Union[str, Path]): The file to write the table to.
+            csv_path (Union[str, Path]): The CSV file.
+        """
+
+        def ranges():
+            with open(csv_path, newline="", encoding="utf-8") as file:
+                for first, last, country_code, country, latitude, longitude, timezone, *_ in csv.reader(file):
+                    yield first, last, GeoLocation(country, country_code, float(latitude) if latitude else None, float(longitude) if longitude else None, timezone or None)
+
+        cls.build(path, ranges())
+
+    def close(self) -> None:
+        if self._reader:
+            self._reader.close()
+        if self._table:
+            self._table.close()
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0}
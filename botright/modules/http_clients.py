@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import weakref
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+# HTTP/2 needs the h2 package, which httpx only installs with its http2 extra
+http2_available = importlib.util.find_spec("h2") is not None
+
+
+class ClientRegistry:
+    def __init__(self, limits: Optional[httpx.Limits] = None, http2: Optional[bool] = None, timeout: Optional[httpx.Timeout] = None) -> None:
+        """
+        Process-wide registry of connection-pooled httpx clients, so all ProxyManagers share one direct client and one client per proxy URL.
+
+        Clients are reference counted and closed once their last user released them. They are bound to the event loop which created them, so each loop gets its own.
+
+        Args:
+            limits (httpx.Limits, optional): Pool limits of new clients. Defaults to 100 connections, of which 20 are kept alive for 30 seconds.
+            http2 (bool, optional): Whether new clients use HTTP/2. Defaults to True if the h2 package is installed.
+            timeout (httpx.Timeout, optional): Default timeout of new clients. Defaults to 20 seconds.
+        """
+        self.limits = limits or httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+        self.http2 = http2_available if http2 is None else http2
+        self.timeout = timeout or httpx.Timeout(20.0, read=None)
+
+        # Keyed by the loop itself instead of its id, which a new loop may get once the old one was garbage collected
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]] = weakref.WeakKeyDictionary()
+        self._references: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, int]] = weakref.WeakKeyDictionary()
+        self.created = 0
+        self.reused = 0
+
+    def __len__(self) -> int:
+        return sum(len(clients) for clients in self._clients.values())
+
+    def _loop_clients(self) -> Tuple[Dict[str, httpx.AsyncClient], Dict[str, int]]:
+        # The clients of the running event loop and their references
+        loop = asyncio.get_running_loop()
+        return self._clients.setdefault(loop, {}), self._references.setdefault(loop, {})
+
+    def acquire(self, proxy: Optional[str] = None) -> httpx.AsyncClient:
+        """
+        Get the shared client for a proxy, creating it on first use. Every acquire has to be paired with a release.
+
+        Args:
+            proxy (str, optional): The proxy URL, e.g. "http://username:password@ip:port". Defaults to None (a direct client).
+
+        Returns:
+            httpx.AsyncClient: The shared client.
+        """
+        clients, references = self._loop_clients()
+        key = proxy or ""
+        client = clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(proxies={"all://": proxy} if proxy else None, verify=False, http2=self.http2, limits=self.limits, timeout=self.timeout)
+            clients[key] = client
+            references[key] = 0
+            self.created += 1
+        else:
+            self.reused += 1
+
+        references[key] += 1
+        return client
+
+    async def release(self, proxy: Optional[str] = None) -> None:
+        """
+        Release a client acquired for a proxy, closing it and its connections once it isn't used anymore.
+
+        Args:
+            proxy (str, optional): The proxy URL the client was acquired for. Defaults to None (the direct client).
+        """
+        clients, references = self._loop_clients()
+        key = proxy or ""
+        if key not in references:
+            return
+
+        references[key] -= 1
+        if references[key] <= 0:
+            del references[key]
+            client = clients.pop(key)
+            await client.aclose()
+
+    async def close(self) -> None:
+        """Close all clients of the running event loop, regardless of their references."""
+        clients, references = self._loop_clients()
+        for key in list(clients):
+            del references[key]
+            await clients.pop(key).aclose()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "clients": len(self),
+            "references": sum(sum(references.values()) for references in self._references.values()),
+            "created": self.created,
+            "reused": self.reused,
+        }
+
+
+http_clients = ClientRegistry()
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Tuple, Union
+
+default_cache_path = Path.home().joinpath(".cache", "botright", "proxies.json")
+
+
+class ProxyCheckResult(NamedTuple):
+    exit_ip: str
+    country: str
+    country_code: str
+    latitude: Any
+    longitude: Any
+    timezone: str
+    checked_at: float
+
+
+class ProxyCheckCache:
+    def __init__(self, path: Optional[Union[str, Path]] = None, ttl: float = 6 * 3600.0, revalidate: bool = False) -> None:
+        """
+        Persistent cache of proxy check results, so browsers using a recently checked proxy launch without any IP and geolocation lookups.
+
+        Entries are keyed by a hash of the normalized proxy string, so credentials never get written to disk. The file is replaced atomically, so processes sharing it never read partial writes.
+
+        Args:
+            path (Union[str, Path], optional): The JSON file to store the results in. Defaults to ~/.cache/botright/proxies.json.
+            ttl (float, optional): Seconds a result is used for. Defaults to 6 hours.
+            revalidate (bool, optional): Whether to check proxies served from the cache again in the background, refreshing their entry for the next launch. Defaults to False.
+        """
+        self.path = Path(path) if path else default_cache_path
+        self.ttl = ttl
+        self.revalidate = revalidate
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        # Inode, mtime and size of the file the entries were loaded from. Writers replace the file, so any write changes it
+        self._version: Optional[Tuple[int, int, int]] = None
+        self._refresh()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(proxy: str) -> str:
+        # Direct connections are cached too, as their lookups cost the same
+        return hashlib.sha256((proxy or "direct").encode()).hexdigest()
+
+    def _file_version(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _refresh(self) -> None:
+        # Only parsing the file again if another process (or instance) wrote it since it was loaded
+        version = self._file_version()
+        if version == self._version:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                self._entries = json.load(file)
+        except (FileNotFoundError, ValueError):
+            self._entries = {}
+        self._version = version
+
+    def get(self, proxy: str) -> Optional[ProxyCheckResult]:
+        """
+        Get the check result of a proxy if it's younger than the ttl.
+
+        Args:
+            proxy (str): The normalized proxy string, e.g. "username:password@ip:port". An empty string for direct connections.
+
+        Returns:
+            Optional[ProxyCheckResult]: The cached result, or None if there isn't a fresh one.
+        """
+        entry = self._entries.get(self.key(proxy))
+        if entry is None or time.time() - entry["checked_at"] > self.ttl:
+            # Another process might have checked the proxy in the meantime
+            self._refresh()
+            entry = self._entries.get(self.key(proxy))
+
+        if entry is None or time.time() - entry["checked_at"] > self.ttl:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return ProxyCheckResult(**entry)
+
+    def put(self, proxy: str, result: ProxyCheckResult) -> None:
+        """
+        Store the check result of a proxy, merging with the entries other processes stored in the meantime.
+
+        Args:
+            proxy (str): The normalized proxy string. An empty string for direct connections.
+            result (ProxyCheckResult): The check result.
+        """
+        now = time.time()
+        self._refresh()
+        entries = {key: entry for key, entry in self._entries.items() if now - entry["checked_at"] <= self.ttl}
+        entries[self.key(proxy)] = result._asdict()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Writing to a temporary file first, so other processes never read partially written entries
+        with tempfile.NamedTemporaryFile("w", dir=self.path.parent, delete=False, encoding="utf-8") as file:
+            json.dump(entries, file)
+        # Renaming keeps the inode and mtime, so the version is taken before another process might replace the file again
+        stat = os.stat(file.name)
+        os.replace(file.name, self.path)
+        self._entries = entries
+        self._version = stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def clear(self) -> None:
+        self._entries = {}
+        self.path.unlink(missing_ok=True)
+        self._version = None
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0}
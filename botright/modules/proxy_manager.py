@@ -1,10 +1,18 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+import asyncio
+import time
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
 
 import httpx
 from async_class import AsyncObject, link
 
+from .bandwidth import BandwidthMeter
+from .geoip import GeoIP
+from .http_clients import http_clients
+from .proxy_cache import ProxyCheckCache, ProxyCheckResult
+
 
 class SplitError(Exception):
     pass
@@ -14,6 +22,116 @@ class ProxyCheckError(Exception):
     pass
 
 
+T = TypeVar("T")
+
+ip_apis = ["https://api.ipify.org/?format=json", "https://api.myip.com/", "https://get.geojs.io/v1/ip.json", "https://api.ip.sb/jsonip", "https://l2.io/ip.json"]
+# The names of country, country code, latitude, longitude and timezone in each geo API's response
+geo_apis = {
+    "http://ip-api.com/json/<IP>": ["country", "countryCode", "lat", "lon", "timezone"],
+    "https://ipapi.co/<IP>/json": ["country_name", "country", "latitude", "longitude", "timezone"],
+    "https://api.techniknews.net/ipgeo/<IP>": ["country", "countryCode", "lat", "lon", "timezone"],
+    "https://get.geojs.io/v1/ip/geo/<IP>.json": ["country", "country_code", "latitude", "longitude", "timezone"],
+}
+
+
+class EndpointStats:
+    def __init__(self, decay: float = 0.3) -> None:
+        """
+        Latency and success rate of the IP and geo APIs, so racing them starts with the ones which answered fastest and most reliably before.
+
+        Args:
+            decay (float, optional): Weight of the latest latency in the moving average. Defaults to 0.3.
+        """
+        self.decay = decay
+        self.attempts: Dict[str, int] = {}
+        self.successes: Dict[str, int] = {}
+        self.latencies: Dict[str, float] = {}
+
+    def record(self, endpoint: str, latency: float, success: bool) -> None:
+        self.attempts[endpoint] = self.attempts.get(endpoint, 0) + 1
+        self.successes[endpoint] = self.successes.get(endpoint, 0) + success
+        if success:
+            previous = self.latencies.get(endpoint, latency)
+            self.latencies[endpoint] = previous + self.decay * (latency - previous)
+
+    def success_rate(self, endpoint: str) -> float:
+        # Starting from an even prior, so a single failure doesn't rule an endpoint out
+        return (self.successes.get(endpoint, 0) + 1) / (self.attempts.get(endpoint, 0) + 2)
+
+    def expected_latency(self, endpoint: str) -> float:
+        # Untried endpoints are assumed to answer within a second
+        return self.latencies.get(endpoint, 1.0) / self.success_rate(endpoint)
+
+    def rank(self, endpoints: Sequence[str]) -> List[str]:
+        # Stable, so endpoints without stats keep their given order
+        return sorted(endpoints, key=self.expected_latency)
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {endpoint: {"attempts": attempts, "success_rate": self.success_rate(endpoint), "latency": self.latencies.get(endpoint, 0.0)} for endpoint, attempts in self.attempts.items()}
+
+    def reset(self) -> None:
+        self.attempts.clear()
+        self.successes.clear()
+        self.latencies.clear()
+
+
+endpoint_stats = EndpointStats()
+
+
+async def race(attempts: Sequence[Tuple[str, Callable[[], Awaitable[T]]]], deadline: float, stagger: float = 0.25) -> T:
+    """
+    Race endpoints for the first valid answer, cancelling the others once it arrived.
+
+    Endpoints are started in the given order, each one after the stagger delay or as soon as a running one failed. That way the best ranked endpoint usually answers
+    before any others got requested, while a slow or blackholed one only costs the stagger delay instead of its whole timeout.
+
+    Args:
+        attempts (Sequence[Tuple[str, Callable[[], Awaitable[T]]]]): The endpoints and the functions requesting them, raising on invalid answers.
+        deadline (float): The time.monotonic() time to give up at.
+        stagger (float, optional): Seconds to wait for the running endpoints before starting the next one. Defaults to 0.25.
+
+    Returns:
+        T: The first valid answer.
+
+    Raises:
+        TimeoutError: If no endpoint answered validly before the deadline.
+    """
+
+    async def attempt(endpoint: str, function: Callable[[], Awaitable[T]]) -> T:
+        start = time.monotonic()
+        try:
+            result = await function()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            endpoint_stats.record(endpoint, time.monotonic() - start, False)
+            raise
+        endpoint_stats.record(endpoint, time.monotonic() - start, True)
+        return result
+
+    waiting = list(attempts)
+    running: Dict[asyncio.Future[T], str] = {}
+    try:
+        while waiting or running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if waiting:
+                endpoint, function = waiting.pop(0)
+                running[asyncio.ensure_future(attempt(endpoint, function))] = endpoint
+
+            done, _ = await asyncio.wait(running, timeout=min(stagger, remaining) if waiting else remaining, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                del running[future]
+                if future.exception() is None:
+                    return future.result()
+        raise TimeoutError("No endpoint answered validly before the deadline")
+    finally:
+        for future in running:
+            future.cancel()
+
+
 class ProxyManager(AsyncObject):
     proxy: str = ""
     http_proxy: Dict[str, str] = {}
@@ -21,10 +139,16 @@ class ProxyManager(AsyncObject):
     plain_proxy: str = ""
     _httpx: httpx.AsyncClient
     _phttpx: httpx.AsyncClient
+    bandwidth: BandwidthMeter
+    check_cache: Optional[ProxyCheckCache] = None
+    geoip: Optional[GeoIP] = None
+    _revalidation: Optional[asyncio.Future[None]] = None
+    _clients_released: bool = False
     ip: str = ""
     port: str = ""
     username: str = ""
     password: str = ""
+    exit_ip: str = ""
     country: str = ""
     country_code: str = ""
     region: str = ""
@@ -34,42 +158,63 @@ class ProxyManager(AsyncObject):
     longitude: str = ""
     timezone: str = ""
 
-    async def __ainit__(self, botright, proxy: str) -> None:
+    async def __ainit__(self, botright, proxy: str, check_deadline: float = 15.0) -> None:
         """
         Initialize a ProxyManager instance with a proxy string and perform proxy checks.
 
         Args:
-            botright: An instance of Botright for linking purposes.
+            botright: An instance of Botright for linking purposes, or any other owner providing the proxy_cache and geoip options. Unlinked ProxyManagers have to be closed by their owner.
             proxy (str): The proxy string to be managed and checked.
+            check_deadline (float, optional): Seconds the IP and geo lookups may take together. Defaults to 15 seconds.
         """
-        link(self, botright)
+        if isinstance(botright, AsyncObject):
+            link(self, botright)
 
         self.proxy = proxy.strip() if proxy else ""
+        self.check_cache = getattr(botright, "proxy_cache", None)
+        self.geoip = getattr(botright, "geoip", None)
 
+        # Counting the traffic of all browsers using this proxy and of the proxy checks
+        self.bandwidth = BandwidthMeter()
         self.timeout = httpx.Timeout(20.0, read=None)
-        self._httpx = httpx.AsyncClient(verify=False)
+        self.check_deadline = check_deadline
+        # Pooled clients shared with all other ProxyManagers, so checks reuse warm connections
+        self._httpx = http_clients.acquire()
 
-        if self.proxy:
-            self.split_proxy()
-            self.proxy = f"{self.username}:{self.password}@{self.ip}:{self.port}" if self.username else f"{self.ip}:{self.port}"
-            self.plain_proxy = f"http://{self.proxy}"
-            self._phttpx = httpx.AsyncClient(proxies={"all://": self.plain_proxy}, verify=False)
-            self.http_proxy = {"http": self.plain_proxy, "https": self.plain_proxy}
+        try:
+            if self.proxy:
+                self.split_proxy()
+                self.proxy = f"{self.username}:{self.password}@{self.ip}:{self.port}" if self.username else f"{self.ip}:{self.port}"
+                self.plain_proxy = f"http://{self.proxy}"
+                self._phttpx = http_clients.acquire(self.plain_proxy)
+                self.http_proxy = {"http": self.plain_proxy, "https": self.plain_proxy}
 
-            if self.username:
-                self.browser_proxy = {"server": f"{self.ip}:{self.port}", "username": self.username, "password": self.password}
+                if self.username:
+                    self.browser_proxy = {"server": f"{self.ip}:{self.port}", "username": self.username, "password": self.password}
+                else:
+                    self.browser_proxy = {"server": self.plain_proxy}
             else:
-                self.browser_proxy = {"server": self.plain_proxy}
-
-            await self.check_proxy(self._phttpx)
+                self._phttpx = http_clients.acquire()
 
-        else:
-            self._phttpx = self._httpx
-            await self.check_proxy(self._phttpx)
+            await self.check_proxy_cached(self._phttpx)
+        except BaseException:
+            # A failed ProxyManager never reaches its owner, so its clients have to be released here
+            await self._release_clients()
+            raise
 
     async def __adel__(self) -> None:
-        await self._httpx.aclose()
-        await self._phttpx.aclose()
+        if self._revalidation:
+            self._revalidation.cancel()
+        await self._release_clients()
+
+    async def _release_clients(self) -> None:
+        # Failed ProxyManagers get closed again once they are garbage collected, so the shared clients must only be released once
+        if self._clients_released:
+            return
+        self._clients_released = True
+        await http_clients.release()
+        if hasattr(self, "_phttpx"):
+            await http_clients.release(self.plain_proxy or None)
 
     def split_helper(self, split_proxy: List[str]) -> None:
         """
@@ -103,6 +248,37 @@ class ProxyManager(AsyncObject):
         else:
             raise SplitError(f"Proxy Format ({self.proxy}) isnt supported")
 
+    @property
+    def check_result(self) -> ProxyCheckResult:
+        return ProxyCheckResult(self.exit_ip, self.country, self.country_code, self.latitude, self.longitude, self.timezone, time.time())
+
+    async def check_proxy_cached(self, httpx_client: httpx.AsyncClient) -> None:
+        """
+        Check the proxy unless the check cache has a fresh result for it, optionally revalidating that result in the background.
+
+        Args:
+            httpx_client (httpx.AsyncClient): The HTTPX client to use for proxy checks.
+        """
+        cached = self.check_cache.get(self.proxy) if self.check_cache is not None else None
+        if cached is None:
+            await self.check_proxy(httpx_client)
+            if self.check_cache is not None:
+                self.check_cache.put(self.proxy, self.check_result)
+            return
+
+        self.exit_ip, self.country, self.country_code, self.latitude, self.longitude, self.timezone, _ = cached
+        if self.check_cache is not None and self.check_cache.revalidate:
+            self._revalidation = asyncio.ensure_future(self._revalidate(httpx_client))
+
+    async def _revalidate(self, httpx_client: httpx.AsyncClient) -> None:
+        assert self.check_cache is not None
+        try:
+            await self.check_proxy(httpx_client)
+        except ProxyCheckError:
+            # Keeping the cached result, the proxy might only be temporarily unreachable
+            return
+        self.check_cache.put(self.proxy, self.check_result)
+
     async def check_proxy(self, httpx_client: httpx.AsyncClient) -> None:
         """
         Check the validity of the proxy by making HTTP requests to determine its properties.
@@ -110,41 +286,42 @@ class ProxyManager(AsyncObject):
         Args:
             httpx_client (httpx.AsyncClient): The HTTPX client to use for proxy checks.
         """
-        get_ip_apis = ["https://api.ipify.org/?format=json", "https://api.myip.com/", "https://get.geojs.io/v1/ip.json", "https://api.ip.sb/jsonip", "https://l2.io/ip.json"]
+        deadline = time.monotonic() + self.check_deadline
 
-        for get_ip_api in get_ip_apis:
-            try:
-                ip_request = await httpx_client.get(get_ip_api, timeout=self.timeout)
-                ip = ip_request.json().get("ip")
-                break
-            except Exception:
-                pass
-        else:
+        async def get_ip(api_url: str) -> str:
+            ip_request = await httpx_client.get(api_url, timeout=self.timeout)
+            # The shared client can't know which manager's meter to count towards
+            if self.proxy:
+                await self.bandwidth.meter_httpx_response(ip_request)
+            ip: str = ip_request.json().get("ip")
+            assert ip
+            return ip
+
+        async def get_geo(api_url: str, api_names: List[str]) -> List[Any]:
+            r = await self._httpx.get(api_url, timeout=self.timeout)
+            data = r.json()
+            geo = [data.get(name) for name in api_names]
+            # The country is needed for everything else
+            assert geo[0]
+            return geo
+
+        try:
+            self.exit_ip = await race([(api_url, partial(get_ip, api_url)) for api_url in endpoint_stats.rank(ip_apis)], deadline)
+        except TimeoutError:
             raise ProxyCheckError("Could not get IP-Address of Proxy (Proxy is Invalid/Timed Out)")
 
-        get_geo_apis = {
-            "http://ip-api.com/json/<IP>": ["country", "countryCode", "lat", "lon", "timezone"],
-            "https://ipapi.co/<IP>/json": ["country_name", "country", "latitude", "longitude", "timezone"],
-            "https://api.techniknews.net/ipgeo/<IP>": ["country", "countryCode", "lat", "lon", "timezone"],
-            "https://get.geojs.io/v1/ip/geo/<IP>.json": ["country", "country_code", "latitude", "longitude", "timezone"],
-        }
-
-        for get_geo_api, api_names in get_geo_apis.items():
-            try:
-                api_url = get_geo_api.replace("<IP>", ip)
-                country, country_code, latitude, longitude, timezone = api_names
-                r = await self._httpx.get(api_url, timeout=self.timeout)
-                data = r.json()
-
-                self.country = data.get(country)
-                self.country_code = data.get(country_code)
-                self.latitude = data.get(latitude)
-                self.longitude = data.get(longitude)
-                self.timezone = data.get(timezone)
-
-                assert self.country
-                break
-            except Exception:
-                pass
-        else:
+        location = self.geoip.lookup(self.exit_ip) if self.geoip else None
+        # The geo APIs are only asked if the local database doesn't know the address or lacks the timezone browsers need
+        if location and location.timezone:
+            self.country, self.country_code, self.timezone = location.country, location.country_code, location.timezone
+            # Coordinates are numbers, like the geo APIs return them
+            self.latitude, self.longitude = location.latitude, location.longitude  # type: ignore[assignment]
+            return
+
+        # Ranking the geo APIs by their URL templates, so their stats don't depend on the looked up IP
+        try:
+            self.country, self.country_code, self.latitude, self.longitude, self.timezone = await race(
+                [(api_url, partial(get_geo, api_url.replace("<IP>", self.exit_ip), geo_apis[api_url])) for api_url in endpoint_stats.rank(list(geo_apis))], deadline
+            )
+        except TimeoutError:
             raise ProxyCheckError("Could not get GeoInformation from proxy (Proxy is probably not Indexed)")
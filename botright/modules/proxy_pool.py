@@ -0,0 +1,366 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+from playwright.async_api import Request as PlaywrightRequest
+
+from .proxy_manager import ProxyManager
+
+if TYPE_CHECKING:
+    from botright import Botright
+
+    from ..playwright_mock import BrowserContext
+
+# Network errors of navigations which are caused by the proxy instead of the visited site
+proxy_errors = (
+    "net::ERR_PROXY_CONNECTION_FAILED",
+    "net::ERR_TUNNEL_CONNECTION_FAILED",
+    "net::ERR_PROXY_AUTH_UNSUPPORTED",
+    "net::ERR_PROXY_CERTIFICATE_INVALID",
+    "net::ERR_EMPTY_RESPONSE",
+    "net::ERR_CONNECTION_RESET",
+    "net::ERR_CONNECTION_CLOSED",
+    "net::ERR_TIMED_OUT",
+)
+
+
+class ProxyPoolExhausted(Exception):
+    pass
+
+
+class ProxyHealth:
+    __slots__ = ("proxy", "manager", "browsers", "failures", "quarantined_until", "checks", "error", "_successes", "_attempts", "_latency_sum", "_latency_weight", "updated")
+
+    def __init__(self, proxy: str) -> None:
+        """Health of a single proxy of a ProxyPool, with its successes and latencies weighted by their age."""
+        self.proxy = proxy
+        self.manager: Optional[ProxyManager] = None
+        self.browsers = 0
+        # Consecutive failures, reset by any success
+        self.failures = 0
+        self.quarantined_until = 0.0
+        self.checks = 0
+        # The error of the latest failed check, e.g. of a malformed proxy string
+        self.error: Optional[str] = None
+
+        self._successes = 0.0
+        self._attempts = 0.0
+        self._latency_sum = 0.0
+        self._latency_weight = 0.0
+        # monotonic() time of the latest observation
+        self.updated = 0.0
+
+    def record(self, latency: Optional[float], success: bool, half_life: float) -> None:
+        # Decaying the previous observations by their age, so a proxy's score follows its current health instead of its whole history
+        now = time.monotonic()
+        if self.updated:
+            decay = 0.5 ** ((now - self.updated) / half_life)
+            self._successes *= decay
+            self._attempts *= decay
+            self._latency_sum *= decay
+            self._latency_weight *= decay
+        self.updated = now
+
+        self._attempts += 1
+        if success:
+            self._successes += 1
+            self.failures = 0
+        else:
+            self.failures += 1
+        if latency is not None:
+            self._latency_sum += latency
+            self._latency_weight += 1
+
+    @property
+    def success_rate(self) -> float:
+        # Starting from an even prior, like the endpoint stats
+        return (self._successes + 1) / (self._attempts + 2)
+
+    @property
+    def latency(self) -> float:
+        # Unmeasured proxies are assumed to answer within a second
+        return self._latency_sum / self._latency_weight if self._latency_weight else 1.0
+
+    @property
+    def score(self) -> float:
+        # The expected latency of a successful request, lower is better
+        return self.latency / self.success_rate
+
+    @property
+    def bandwidth(self) -> int:
+        return self.manager.bandwidth.bytes if self.manager else 0
+
+    @property
+    def quarantined(self) -> bool:
+        # Quarantined proxies stay out of the pool until they passed a check after their quarantine time
+        return self.quarantined_until > 0.0
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "score": self.score,
+            "latency": self.latency,
+            "success_rate": self.success_rate,
+            "bandwidth": self.bandwidth,
+            "browsers": self.browsers,
+            "failures": self.failures,
+            "checks": self.checks,
+            "quarantined": self.quarantined,
+            "error": self.error,
+        }
+
+
+class ProxyPool:
+    def __init__(
+        self,
+        proxies: Iterable[str],
+        max_browsers: int = 1,
+        check_interval: float = 300.0,
+        quarantine_after: int = 3,
+        quarantine_time: float = 600.0,
+        half_life: float = 900.0,
+        concurrency: int = 20,
+    ) -> None:
+        """
+        Pool of proxies which new_browser picks the healthiest available one from, e.g. await botright_client.new_browser(proxy=ProxyPool(proxies)).
+
+        All proxies are checked concurrently in the background, scoring them by their latency and success rate, with older observations decaying by their age.
+        Proxies failing their checks or the navigations of their browsers repeatedly get quarantined, and are only handed out again after passing a check once their quarantine ended.
+
+        Args:
+            proxies (Iterable[str]): The proxy strings, in any format ProxyManager supports.
+            max_browsers (int, optional): Concurrent browsers per proxy. Defaults to 1.
+            check_interval (float, optional): Seconds between the background checks of a proxy. Defaults to 5 minutes.
+            quarantine_after (int, optional): Consecutive failures after which a proxy gets quarantined. Defaults to 3.
+            quarantine_time (float, optional): Seconds a proxy stays quarantined. Defaults to 10 minutes.
+            half_life (float, optional): Seconds after which an observation only counts half towards a proxy's score. Defaults to 15 minutes.
+            concurrency (int, optional): Proxies checked at the same time. Defaults to 20.
+        """
+        self.proxies: List[ProxyHealth] = [ProxyHealth(proxy.strip()) for proxy in dict.fromkeys(proxies) if proxy.strip()]
+        if not self.proxies:
+            raise ValueError("A ProxyPool needs at least one proxy")
+
+        self.max_browsers = max_browsers
+        self.check_interval = check_interval
+        self.quarantine_after = quarantine_after
+        self.quarantine_time = quarantine_time
+        self.half_life = half_life
+        self.concurrency = concurrency
+
+        self.acquired = 0
+        self.quarantines = 0
+        self._botright: Optional[Botright] = None
+        self._start: Optional[asyncio.Future[None]] = None
+        self._checks: Optional[asyncio.Future[None]] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # Set whenever a proxy might have become available
+        self._changed: Optional[asyncio.Event] = None
+
+    def __len__(self) -> int:
+        return len(self.proxies)
+
+    @property
+    def started(self) -> bool:
+        return self._start is not None
+
+    async def start(self, botright: Botright) -> None:
+        """
+        Check all proxies and start checking them in the background. Called by new_browser on first use.
+
+        Args:
+            botright (Botright): The Botright instance the ProxyManagers get linked to.
+        """
+        if self._start is None:
+            self._botright = botright
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._changed = asyncio.Event()
+            self._start = asyncio.ensure_future(self._check_all(self.proxies))
+        await asyncio.shield(self._start)
+
+        if self._checks is None:
+            self._checks = asyncio.ensure_future(self._check_periodically())
+
+    async def _check_all(self, proxies: List[ProxyHealth]) -> None:
+        # A single proxy's error must neither fail the pool's start nor stop the periodic checks
+        await asyncio.gather(*(self.check(health) for health in proxies), return_exceptions=True)
+
+    async def _check_periodically(self) -> None:
+        while True:
+            now = time.monotonic()
+            # Quarantined proxies get their next check once their quarantine ended, all others after the check interval
+            due = [health.quarantined_until if health.quarantined else health.updated + self.check_interval for health in self.proxies]
+            await asyncio.sleep(max(min(due) - now, 1.0))
+
+            now = time.monotonic()
+            await self._check_all([health for health, at in zip(self.proxies, due) if at <= now])
+
+    async def check(self, health: ProxyHealth) -> bool:
+        """
+        Check a proxy, creating its ProxyManager if it didn't pass a check yet, and update its score.
+
+        Args:
+            health (ProxyHealth): The proxy to check.
+
+        Returns:
+            bool: Whether the proxy passed the check.
+        """
+        assert self._semaphore is not None
+        async with self._semaphore:
+            start = time.monotonic()
+            try:
+                if health.manager is None:
+                    health.manager = await ProxyManager(self._botright, health.proxy)
+                else:
+                    await health.manager.check_proxy(health.manager._phttpx)
+            except Exception as e:
+                # Malformed proxy strings raise e.g. a SplitError instead of a ProxyCheckError, failing the check the same way
+                health.checks += 1
+                health.error = f"{type(e).__name__}: {e}"
+                self.record(health, None, False)
+                return False
+
+            health.checks += 1
+            health.error = None
+            self.record(health, time.monotonic() - start, True)
+            return True
+
+    def record(self, health: ProxyHealth, latency: Optional[float], success: bool) -> None:
+        """
+        Count a check or navigation towards a proxy's score, quarantining it after repeated failures.
+
+        Args:
+            health (ProxyHealth): The proxy.
+            latency (float, optional): Seconds until the proxy answered. None if it failed or wasn't measured.
+            success (bool): Whether the proxy worked.
+        """
+        health.record(latency, success, self.half_life)
+        if success:
+            health.quarantined_until = 0.0
+        elif health.failures >= self.quarantine_after and health.quarantined_until <= time.monotonic():
+            if not health.quarantined:
+                self.quarantines += 1
+            health.quarantined_until = time.monotonic() + self.quarantine_time
+
+        if self._changed:
+            self._changed.set()
+
+    @property
+    def exhausted(self) -> bool:
+        # Every proxy was checked, and either never passed a check or is quarantined
+        return all(health.checks and (health.manager is None or health.quarantined) for health in self.proxies)
+
+    def _best(self) -> Optional[ProxyHealth]:
+        available = [health for health in self.proxies if health.manager and not health.quarantined and health.browsers < self.max_browsers]
+        if not available:
+            return None
+        # Spreading browsers over equally scored proxies by their load and traffic
+        return min(available, key=lambda health: (health.score, health.browsers, health.bandwidth))
+
+    async def acquire(self, timeout: Optional[float] = None) -> ProxyManager:
+        """
+        Take the best scored proxy which isn't quarantined and below its browser cap, waiting for one to become available.
+
+        Args:
+            timeout (float, optional): Seconds to wait for an available proxy. Defaults to None (forever).
+
+        Returns:
+            ProxyManager: The checked proxy. It has to be released once its browser closed.
+
+        Raises:
+            ProxyPoolExhausted: If every proxy failed its checks, or no proxy became available within the timeout.
+        """
+        if self._changed is None:
+            raise RuntimeError("The ProxyPool has to be started first")
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while (health := self._best()) is None:
+            # Only released proxies can become available, as waiting for failed ones to recover would hang browsers without a timeout
+            if self.exhausted:
+                raise ProxyPoolExhausted(f"All of the {len(self.proxies)} proxies failed their checks")
+            self._changed.clear()
+            remaining = None if deadline is None else deadline - time.monotonic()
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                raise ProxyPoolExhausted(f"None of the {len(self.proxies)} proxies became available within {timeout} seconds")
+
+        assert health.manager is not None
+        health.browsers += 1
+        self.acquired += 1
+        return health.manager
+
+    def _health_of(self, manager: ProxyManager) -> Optional[ProxyHealth]:
+        for health in self.proxies:
+            if health.manager is manager:
+                return health
+        return None
+
+    def release(self, manager: ProxyManager) -> None:
+        """
+        Give back a proxy taken by acquire.
+
+        Args:
+            manager (ProxyManager): The proxy to release.
+        """
+        health = self._health_of(manager)
+        if health and health.browsers:
+            health.browsers -= 1
+            if self._changed:
+                self._changed.set()
+
+    def __contains__(self, manager: object) -> bool:
+        return any(health.manager is manager for health in self.proxies)
+
+    def attach(self, browser: BrowserContext) -> None:
+        """
+        Release the proxy of a browser once it closed, and score the proxy by the browser's navigations.
+
+        The browser's current proxy is looked up on every event, so browsers rotating between proxies stay attached once. Attaching a browser again does nothing.
+
+        Args:
+            browser (BrowserContext): A browser using a proxy of this pool.
+        """
+        # Further listeners would score every navigation again, and release the proxy of another browser on close
+        if self in browser.proxy_pools:
+            return
+        browser.proxy_pools.add(self)
+
+        def on_request_finished(request: PlaywrightRequest) -> None:
+            health = self._health_of(browser.proxy)
+            if health and request.is_navigation_request():
+                # Milliseconds from the start of the request until its response started
+                response_start = request.timing.get("responseStart", -1)
+                self.record(health, response_start / 1000 if response_start > 0 else None, True)
+
+        def on_request_failed(request: PlaywrightRequest) -> None:
+            health = self._health_of(browser.proxy)
+            if health and request.is_navigation_request() and (request.failure or "").startswith(proxy_errors):
+                self.record(health, None, False)
+
+        browser.on("requestfinished", on_request_finished)
+        browser.on("requestfailed", on_request_failed)
+        browser.on("close", lambda _: self.release(browser.proxy))
+
+    async def close(self) -> None:
+        """Stop the background checks and close the ProxyManagers of all proxies."""
+        for task in (self._start, self._checks):
+            if task:
+                task.cancel()
+        for health in self.proxies:
+            if health.manager:
+                await health.manager.close()
+                health.manager = None
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "proxies": len(self.proxies),
+            "available": sum(1 for health in self.proxies if health.manager and not health.quarantined),
+            "quarantined": sum(1 for health in self.proxies if health.quarantined),
+            "browsers": sum(health.browsers for health in self.proxies),
+            "acquired": self.acquired,
+            "quarantines": self.quarantines,
+            "by_proxy": {health.proxy: health.stats for health in self.proxies},
+        }
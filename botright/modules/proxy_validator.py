@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import IO, Any, AsyncIterator, Dict, Iterable, Iterator, NamedTuple, Optional, Union
+
+from .geoip import GeoIP
+from .http_clients import http_clients
+from .proxy_cache import ProxyCheckCache
+from .proxy_manager import ProxyManager
+
+
+class ProxyValidationResult(NamedTuple):
+    proxy: str
+    valid: bool
+    exit_ip: str
+    country: str
+    country_code: str
+    latitude: Any
+    longitude: Any
+    timezone: str
+    latency: float
+    # The class name of the exception the proxy failed with, e.g. "ProxyCheckError" or "SplitError"
+    error: Optional[str]
+    message: Optional[str]
+
+
+def proxy_lines(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Filter the lines of a proxy list, skipping empty lines and # comments.
+
+    Args:
+        lines (Iterable[str]): The lines, e.g. of a file or stdin.
+
+    Returns:
+        Iterator[str]: The stripped proxy strings.
+    """
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield line
+
+
+def read_proxies(path: Union[str, Path]) -> Iterator[str]:
+    """
+    Read a proxy list with one proxy per line, skipping empty lines and # comments.
+
+    Args:
+        path (Union[str, Path]): The proxy list.
+
+    Returns:
+        Iterator[str]: The proxy strings, read lazily so huge lists never get loaded at once.
+    """
+    with open(path, encoding="utf-8") as file:
+        yield from proxy_lines(file)
+
+
+class ProxyValidator:
+    def __init__(self, concurrency: int = 50, deadline: float = 15.0, geoip: Optional[GeoIP] = None, cache: Optional[ProxyCheckCache] = None) -> None:
+        """
+        Validates large proxy lists with the same parsing and checks as new_browser, without launching any browsers.
+
+        The direct client used for the geo lookups is kept open for the whole run, so they all reuse its connections.
+
+        Args:
+            concurrency (int, optional): Proxies checked at the same time. Defaults to 50.
+            deadline (float, optional): Seconds the IP and geo lookups of a proxy may take together. Defaults to 15 seconds.
+            geoip (GeoIP, optional): Resolves exit IPs locally, sparing the rate limited geo APIs. Defaults to None.
+            cache (ProxyCheckCache, optional): Stores the results of valid proxies, so browsers launched with them later skip their checks. Defaults to None.
+        """
+        self.concurrency = concurrency
+        self.deadline = deadline
+        self.geoip = geoip
+        self.cache = cache
+
+        self.valid = 0
+        self.invalid = 0
+        self.errors: Dict[str, int] = {}
+
+    async def validate(self, proxy: str) -> ProxyValidationResult:
+        """
+        Check a single proxy.
+
+        Args:
+            proxy (str): The proxy string, in any format ProxyManager supports.
+
+        Returns:
+            ProxyValidationResult: The exit IP and geolocation of the proxy, or the error it failed with.
+        """
+        start = time.monotonic()
+        try:
+            # Passing the validator as the owner, so the ProxyManager picks up its GeoIP database but always checks the proxy
+            manager: ProxyManager = await ProxyManager(self, proxy, check_deadline=self.deadline)
+        except Exception as e:
+            error = type(e).__name__
+            self.invalid += 1
+            self.errors[error] = self.errors.get(error, 0) + 1
+            return ProxyValidationResult(proxy, False, "", "", "", None, None, "", time.monotonic() - start, error, str(e))
+
+        latency = time.monotonic() - start
+        await manager.close()
+        if self.cache is not None:
+            self.cache.put(manager.proxy, manager.check_result)
+
+        self.valid += 1
+        return ProxyValidationResult(proxy, True, manager.exit_ip, manager.country, manager.country_code, manager.latitude, manager.longitude, manager.timezone, latency, None, None)
+
+    async def validate_all(self, proxies: Iterable[str]) -> AsyncIterator[ProxyValidationResult]:
+        """
+        Check proxies concurrently, yielding their results as they complete.
+
+        Args:
+            proxies (Iterable[str]): The proxy strings. They are consumed lazily, so only the running checks are held in memory.
+
+        Returns:
+            AsyncIterator[ProxyValidationResult]: The results, in the order they completed.
+        """
+        proxy_iterator = iter(proxies)
+        results: asyncio.Queue[Optional[ProxyValidationResult]] = asyncio.Queue()
+
+        async def worker() -> None:
+            try:
+                # The workers share the iterator, each one taking the next proxy once it finished its last
+                for proxy in proxy_iterator:
+                    await results.put(await self.validate(proxy))
+            finally:
+                await results.put(None)
+
+        # Keeping the direct client open between the checks, instead of closing it whenever no check happens to be running
+        http_clients.acquire()
+        workers = [asyncio.ensure_future(worker()) for _ in range(self.concurrency)]
+        running = len(workers)
+        try:
+            while running:
+                result = await results.get()
+                if result is None:
+                    running -= 1
+                else:
+                    yield result
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            await http_clients.release()
+
+    async def validate_to_jsonl(self, proxies: Iterable[str], output: IO[str], valid_only: bool = False) -> None:
+        """
+        Check proxies concurrently, writing each result as a JSON line once it completed.
+
+        Args:
+            proxies (Iterable[str]): The proxy strings.
+            output (IO[str]): The text stream to write to. It gets flushed after every line, so results can be followed while the validation runs.
+            valid_only (bool, optional): Whether to only write the results of valid proxies. Defaults to False.
+        """
+        async for result in self.validate_all(proxies):
+            if valid_only and not result.valid:
+                continue
+            output.write(json.dumps(result._asdict()) + "\n")
+            output.flush()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        checked = self.valid + self.invalid
+        return {"checked": checked, "valid": self.valid, "invalid": self.invalid, "valid_rate": self.valid / checked if checked else 0.0, "errors": dict(self.errors)}
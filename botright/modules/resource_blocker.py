@@ -0,0 +1,342 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Pattern, Sequence, Set, Tuple
+from urllib.parse import urlsplit
+
+if TYPE_CHECKING:
+    from playwright.async_api import Route as PlaywrightRoute
+
+    from ..playwright_mock import Page
+
+
+class RuleSet(NamedTuple):
+    # File extensions of the URL path, matched case-insensitively
+    extensions: Tuple[str, ...] = ()
+    # Playwright resource types, which can only be matched once a request reached Python
+    resource_types: Tuple[str, ...] = ()
+    # Hosts which get blocked including all their subdomains
+    hosts: Tuple[str, ...] = ()
+
+
+# fmt: off
+rule_sets: Dict[str, RuleSet] = {
+    "images": RuleSet(extensions=("apng", "avif", "gif", "jpg", "jpeg", "jfif", "pjpeg", "pjp", "png", "svg", "webp", "ico", "bmp"), resource_types=("image",)),
+    "media": RuleSet(extensions=("mp4", "webm", "ogg", "ogv", "oga", "mp3", "wav", "m4a", "m4v", "mov", "flac", "aac", "m3u8", "mpd"), resource_types=("media",)),
+    "fonts": RuleSet(extensions=("woff", "woff2", "ttf", "otf", "eot"), resource_types=("font",)),
+    # Only pure tracking and advertising hosts. Google's main domains are left alone, as reCaptcha is served from them
+    "trackers": RuleSet(hosts=("google-analytics.com", "googletagmanager.com", "googlesyndication.com", "googleadservices.com", "doubleclick.net", "adservice.google.com",
+                               "connect.facebook.net", "hotjar.com", "scorecardresearch.com", "quantserve.com", "adnxs.com", "criteo.com", "criteo.net", "taboola.com", "outbrain.com",
+                               "amazon-adsystem.com", "bat.bing.com", "clarity.ms", "segment.io", "mixpanel.com", "nr-data.net", "adsrvr.org", "rubiconproject.com", "pubmatic.com",
+                               "openx.net", "casalemedia.com", "moatads.com", "mc.yandex.ru", "chartbeat.com", "matomo.cloud", "fullstory.com")),
+}
+
+# Rough median transfer sizes per resource type, as blocked requests never reveal their actual size
+estimated_sizes: Dict[str, int] = {"image": 20_000, "media": 500_000, "font": 30_000, "script": 25_000, "stylesheet": 10_000, "document": 30_000, "xhr": 2_000, "fetch": 2_000}
+
+# Adblock filter options naming resource types, mapped to Playwright's resource types
+filter_resource_types: Dict[str, Tuple[str, ...]] = {
+    "image": ("image",), "media": ("media",), "font": ("font",), "script": ("script",), "stylesheet": ("stylesheet",), "xmlhttprequest": ("xhr", "fetch"),
+    "subdocument": ("document",), "websocket": ("websocket",), "ping": ("ping",), "other": ("other", "manifest", "texttrack", "eventsource"),
+}
+# fmt: on
+
+# Scheme and any subdomains in front of a host, as adblock's "||" anchor matches them
+host_anchor = r"^[a-z][a-z0-9+.-]*://(?:[^/?#@]*\.)?"
+# Adblock's "^" separator matches anything but a letter, digit or one of "_-.%", or the end of the URL
+separator = r"(?:[^\w.%-]|$)"
+host_rule = re.compile(r"^\|\|([a-z0-9.-]+)\^?$")
+
+
+class HostTrie:
+    def __init__(self, hosts: Iterable[str] = ()) -> None:
+        """Trie of host labels in reverse order, matching a host and all its subdomains in one walk over the host's labels."""
+        self._root: Dict[str, Any] = {}
+        self.size = 0
+        for host in hosts:
+            self.add(host)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[str]:
+        def walk(node: Dict[str, Any], labels: List[str]) -> Iterator[str]:
+            for label, child in node.items():
+                if label == "":
+                    yield ".".join(reversed(labels))
+                else:
+                    yield from walk(child, labels + [label])
+
+        return walk(self._root, [])
+
+    def add(self, host: str) -> None:
+        node = self._root
+        for label in reversed(host.lower().strip(".").split(".")):
+            node = node.setdefault(label, {})
+        if "" not in node:
+            node[""] = True
+            self.size += 1
+
+    def match(self, host: str) -> bool:
+        node: Optional[Dict[str, Any]] = self._root
+        for label in reversed(host.lower().split(".")):
+            node = node.get(label)  # type: ignore[union-attr]
+            if node is None:
+                return False
+            # A blocked parent domain blocks all of its subdomains
+            if "" in node:
+                return True
+        return False
+
+
+def filter_to_regex(pattern: str) -> str:
+    """
+    Translate the URL pattern of an adblock-style filter into a regex source, which both Python and the browser's JavaScript can compile.
+
+    Args:
+        pattern (str): The URL pattern, e.g. "||example.com/ads/*.js|", without the filter's "$" options.
+
+    Returns:
+        str: The regex source, to be matched case-insensitively.
+    """
+    if pattern.startswith("/") and pattern.endswith("/") and len(pattern) > 2:
+        # Already a regex filter
+        return pattern[1:-1]
+
+    prefix = suffix = ""
+    if pattern.startswith("||"):
+        prefix, pattern = host_anchor, pattern[2:]
+    elif pattern.startswith("|"):
+        prefix, pattern = "^", pattern[1:]
+    if pattern.endswith("|"):
+        suffix, pattern = "$", pattern[:-1]
+
+    source = re.escape(pattern).replace(r"\*", ".*").replace(r"\^", separator)
+    return prefix + source + suffix
+
+
+class CompiledRules:
+    def __init__(self) -> None:
+        """Hosts and URL regexes of one polarity of filters, either blocking or excepting requests."""
+        self.hosts = HostTrie()
+        self.patterns: List[str] = []
+        self.typed_patterns: Dict[str, List[str]] = {}
+        self.regex: Optional[Pattern[str]] = None
+        self.typed_regexes: Dict[str, Pattern[str]] = {}
+
+    def __bool__(self) -> bool:
+        return bool(len(self.hosts) or self.patterns or self.typed_patterns)
+
+    def add(self, pattern: str, resource_types: Optional[Sequence[str]] = None) -> None:
+        match = host_rule.match(pattern)
+        if match and not resource_types:
+            self.hosts.add(match.group(1))
+            return
+
+        source = filter_to_regex(pattern)
+        if not resource_types:
+            self.patterns.append(source)
+        for resource_type in resource_types or ():
+            self.typed_patterns.setdefault(resource_type, []).append(source)
+
+    def compile(self) -> None:
+        self.regex = re.compile("|".join(f"(?:{source})" for source in self.patterns), re.IGNORECASE) if self.patterns else None
+        self.typed_regexes = {resource_type: re.compile("|".join(f"(?:{source})" for source in sources), re.IGNORECASE) for resource_type, sources in self.typed_patterns.items()}
+
+    def match(self, url: str, host: str, resource_type: Optional[str]) -> bool:
+        if host and self.hosts.match(host):
+            return True
+        if self.regex and self.regex.search(url):
+            return True
+        typed_regex = self.typed_regexes.get(resource_type) if resource_type else None
+        return bool(typed_regex and typed_regex.search(url))
+
+
+class ResourceBlocker:
+    def __init__(
+        self,
+        rules: Sequence[str] = (),
+        filters: Optional[Iterable[str]] = None,
+        hosts: Optional[Iterable[str]] = None,
+        match_resource_types: bool = False,
+    ) -> None:
+        """
+        Blocks requests by compiling rule sets, adblock-style filter lists and host lists into a single matcher.
+
+        Blocked hosts are stored in a trie of their labels, URL filters get combined into one regex. The browser is told about these rules where possible:
+        Pages with a CDP session block them with Network.setBlockedURLs, and the context's route only intercepts URLs matching the combined regex.
+        Therefore allowed requests never reach Python, unless resource types get matched, which Playwright only reveals once a request got intercepted.
+
+        Args:
+            rules (Sequence[str], optional): Names of built-in rule sets to block, out of "images", "media", "fonts" and "trackers". Defaults to none.
+            filters (Iterable[str], optional): Lines of an adblock-style filter list, e.g. an open EasyList file. Cosmetic and unsupported filters are skipped. Defaults to None.
+            hosts (Iterable[str], optional): Hosts to block including their subdomains, also accepting lines of a hosts file. Defaults to None.
+            match_resource_types (bool, optional): Also block requests by the resource types of the rule sets, e.g. images without a file extension.
+                This intercepts every request of the context. Defaults to False.
+        """
+        unknown = set(rules) - set(rule_sets)
+        if unknown:
+            raise ValueError(f"Unknown rule sets: {', '.join(sorted(unknown))}. Choose from {', '.join(rule_sets)}")
+
+        self.rules = tuple(rules)
+        self.match_resource_types = match_resource_types
+        self.block = CompiledRules()
+        self.exceptions = CompiledRules()
+        self.extensions: Set[str] = set()
+        self.resource_types: Set[str] = set()
+        self.skipped_filters = 0
+
+        for name in self.rules:
+            rule_set = rule_sets[name]
+            self.extensions.update(rule_set.extensions)
+            self.resource_types.update(rule_set.resource_types)
+            for host in rule_set.hosts:
+                host, _, path = host.partition("/")
+                self.block.add(f"||{host}/{path}" if path else f"||{host}^")
+
+        if self.extensions:
+            self.block.patterns.append(rf"^[^?#]*\.(?:{'|'.join(sorted(self.extensions))})(?:[?#]|$)")
+
+        for line in hosts or ():
+            self.add_host(line)
+        for line in filters or ():
+            self.add_filter(line)
+
+        self.block.compile()
+        self.exceptions.compile()
+        self.url_pattern = self._url_pattern()
+
+        self.blocked = 0
+        self.blocked_in_browser = 0
+        self.blocked_types: Counter[str] = Counter()
+        self.estimated_bytes_saved = 0
+
+    def add_host(self, line: str) -> None:
+        # Accepting both plain hosts and hosts file entries like "0.0.0.0 example.com"
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            return
+        host = line.split()[-1]
+        if host not in ("localhost", "localhost.localdomain", "0.0.0.0", "broadcasthost"):
+            self.block.hosts.add(host)
+
+    def add_filter(self, line: str) -> None:
+        line = line.strip()
+        # Skipping comments, list headers and cosmetic (element hiding) filters
+        if not line or line.startswith(("!", "[")) or "##" in line or "#@#" in line or "#?#" in line:
+            return
+
+        rules = self.block
+        if line.startswith("@@"):
+            rules, line = self.exceptions, line[2:]
+
+        pattern, resource_types = line, []  # type: Tuple[str, List[str]]
+        if "$" in line and not (line.startswith("/") and line.endswith("/")):
+            pattern, _, options = line.rpartition("$")
+            for option in options.lower().split(","):
+                if option in filter_resource_types:
+                    resource_types.extend(filter_resource_types[option])
+                # Third-party filters get applied regardless of the requesting site, as the site isn't known in the browser
+                elif option not in ("third-party", "3p", "~third-party", "1p"):
+                    # Options like domain= or inverted types can't be honored, so skipping the filter is safer than overblocking
+                    self.skipped_filters += 1
+                    return
+
+        if not pattern or pattern in ("*", "|", "||"):
+            self.skipped_filters += 1
+            return
+        rules.add(pattern, resource_types)
+
+    def _url_pattern(self) -> Optional[Pattern[str]]:
+        # The pattern of the context's route. Playwright matches regex patterns in the driver, so only requests which might get blocked reach Python
+        if not self.block and not self.resource_types:
+            return None
+        if self.match_resource_types and self.resource_types:
+            return re.compile(".*")
+
+        sources = list(self.block.patterns) + [source for sources in self.block.typed_patterns.values() for source in sources]
+        if len(self.block.hosts):
+            hosts = "|".join(re.escape(host) for host in sorted(self.block.hosts, key=len, reverse=True))
+            sources.append(rf"{host_anchor}(?:{hosts})(?::\d+)?(?:[/?#]|$)")
+        return re.compile("|".join(f"(?:{source})" for source in sources), re.IGNORECASE) if sources else None
+
+    @property
+    def blocked_urls(self) -> List[str]:
+        """The wildcard patterns for CDP's Network.setBlockedURLs, covering the rules which don't need Python to be matched."""
+        # Blocked URLs can't be excepted in the browser, so exceptions have to be checked by the route
+        if self.exceptions:
+            return []
+
+        urls: List[str] = []
+        for host in self.block.hosts:
+            urls.extend((f"*://{host}/*", f"*://*.{host}/*"))
+        # Only extensions at the very end of the URL, as "?" is a wildcard for Chrome. URLs with a query string are left to the route
+        urls.extend(f"*.{extension}" for extension in sorted(self.extensions))
+        return urls
+
+    def matches(self, url: str, resource_type: Optional[str] = None) -> bool:
+        """
+        Check if a request gets blocked.
+
+        Args:
+            url (str): The URL of the request.
+            resource_type (str, optional): The Playwright resource type of the request. Defaults to None.
+
+        Returns:
+            bool: Whether the request gets blocked.
+        """
+        host = urlsplit(url).hostname or ""
+        if self.exceptions and self.exceptions.match(url, host, resource_type):
+            return False
+        if self.match_resource_types and resource_type in self.resource_types:
+            return True
+        return self.block.match(url, host, resource_type)
+
+    def record(self, resource_type: str, in_browser: bool = False) -> None:
+        self.blocked += 1
+        self.blocked_in_browser += in_browser
+        self.blocked_types[resource_type] += 1
+        self.estimated_bytes_saved += estimated_sizes.get(resource_type, 0)
+
+    async def handle_route(self, route: PlaywrightRoute) -> None:
+        """The raw route handler of the contexts the blocker is applied to."""
+        request = route.request
+        if self.matches(request.url, request.resource_type):
+            self.record(request.resource_type)
+            await route.abort(error_code="blockedbyclient")
+        else:
+            # Falling back to other routes, like the one caching responses
+            await route.fallback()
+
+    async def attach(self, page: Page) -> None:
+        """
+        Block the rules in the browser for a page with a CDP session, before its requests get to the context's route.
+
+        Args:
+            page (Page): The page to block the rules for.
+        """
+        cdp = getattr(page, "cdp", None)
+        blocked_urls = self.blocked_urls
+        if cdp is None or not blocked_urls:
+            return
+
+        def on_loading_failed(params: Dict[str, Any]) -> None:
+            if params.get("blockedReason") == "inspector":
+                self.record(params.get("type", "Other").lower(), in_browser=True)
+
+        cdp.on("Network.loadingFailed", on_loading_failed)
+        await cdp.send("Network.enable")
+        await cdp.send("Network.setBlockedURLs", {"urls": blocked_urls})
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "blocked": self.blocked,
+            "blocked_in_browser": self.blocked_in_browser,
+            "blocked_types": dict(self.blocked_types),
+            "estimated_bytes_saved": self.estimated_bytes_saved,
+            "hosts": len(self.block.hosts),
+            "patterns": len(self.block.patterns) + sum(len(sources) for sources in self.block.typed_patterns.values()),
+            "skipped_filters": self.skipped_filters,
+        }
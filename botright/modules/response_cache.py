@@ -0,0 +1,446 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def parse_cache_control(headers: Dict[str, str]) -> Dict[str, Optional[str]]:
+    """
+    Parse the Cache-Control directives of a header dict with lowercase names, as Playwright returns them.
+
+    Returns:
+        Dict[str, Optional[str]]: The lowercase directives and their (unquoted) arguments.
+    """
+    directives: Dict[str, Optional[str]] = {}
+    for directive in headers.get("cache-control", "").split(","):
+        name, _, argument = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = argument.strip('"') if argument else None
+    return directives
+
+
+def parse_http_date(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def freshness_lifetime(headers: Dict[str, str], default: float = 0.0) -> float:
+    """
+    Get for how many seconds a response is fresh, following Cache-Control max-age and Expires.
+
+    Args:
+        headers (Dict[str, str]): The response headers with lowercase names.
+        default (float, optional): The lifetime of responses without explicit freshness information. Defaults to 0.
+
+    Returns:
+        float: The freshness lifetime in seconds, 0 if the response must be revalidated before every use.
+    """
+    cache_control = parse_cache_control(headers)
+    if "no-cache" in cache_control or "no-store" in cache_control:
+        return 0.0
+    if cache_control.get("max-age") is not None:
+        try:
+            return max(float(cache_control["max-age"]), 0.0)  # type: ignore[arg-type]
+        except ValueError:
+            return 0.0
+    if "expires" in headers:
+        expires = parse_http_date(headers["expires"])
+        # Invalid Expires values (like "0") mean the response is already expired
+        if expires is None:
+            return 0.0
+        date = parse_http_date(headers.get("date")) or time.time()
+        return max(expires - date, 0.0)
+    return default
+
+
+# Status codes which responses without explicit freshness information may be cached heuristically for (RFC 9111, 4.2.2)
+heuristically_cacheable = (200, 203, 204, 206, 300, 301, 308, 404, 405, 410, 414, 501)
+
+
+def heuristic_lifetime(status: int, headers: Dict[str, str], limit: float) -> float:
+    """
+    Get for how many seconds a response without explicit freshness information may be fresh, following RFC 9111's heuristic of 10% of the time since its Last-Modified.
+
+    Args:
+        status (int): The response status code.
+        headers (Dict[str, str]): The response headers with lowercase names.
+        limit (float): The longest heuristic lifetime in seconds.
+
+    Returns:
+        float: The heuristic lifetime in seconds, 0 for responses without Last-Modified.
+    """
+    last_modified = parse_http_date(headers.get("last-modified"))
+    if status not in heuristically_cacheable or last_modified is None:
+        return 0.0
+    date = parse_http_date(headers.get("date")) or time.time()
+    return min(max(date - last_modified, 0.0) / 10, limit)
+
+
+# Headers of a 304 response which describe its (empty) body instead of the cached one
+body_headers = ("content-length", "content-encoding", "transfer-encoding", "content-range")
+
+
+def is_storable(headers: Dict[str, str]) -> bool:
+    # The caches are shared by contexts with their own cookies and proxies, so responses for a single user are never stored
+    cache_control = parse_cache_control(headers)
+    return "no-store" not in cache_control and "private" not in cache_control and headers.get("vary", "").strip() != "*"
+
+
+def shared_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    """The headers of a response which are stored in a shared cache, without the cookies it set for the context which fetched it."""
+    return {name: value for name, value in headers.items() if name.lower() != "set-cookie"}
+
+
+def vary_variant(vary: str, request_headers: Optional[Dict[str, str]]) -> str:
+    # The values of the request headers a response varies by, identifying which variant of the URL it is
+    request_headers = {name.lower(): value for name, value in (request_headers or {}).items()}
+    return json.dumps([request_headers.get(name.strip().lower()) for name in vary.split(",") if name.strip()])
+
+
+class CachedResponse(NamedTuple):
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    stored_at: float
+    # Absolute time the response goes stale at, None if it never does
+    expires_at: Optional[float] = None
+
+    @property
+    def size(self) -> int:
+        # Bytes an entry accounts for in the byte budget
+        return len(self.body) + sum(len(name) + len(value) for name, value in self.headers.items())
+
+    @property
+    def fresh(self) -> bool:
+        return self.expires_at is None or time.time() < self.expires_at
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """The conditional request headers revalidating this response with its ETag and Last-Modified validators."""
+        validators = {}
+        if "etag" in self.headers:
+            validators["if-none-match"] = self.headers["etag"]
+        if "last-modified" in self.headers:
+            validators["if-modified-since"] = self.headers["last-modified"]
+        return validators
+
+
+class Flight(NamedTuple):
+    # The response for the request which fetched it, with the cookies it set
+    response: CachedResponse
+    # The response for requests coalesced into the fetch, None if other contexts mustn't get it
+    shared: Optional[CachedResponse]
+    request_headers: Dict[str, str]
+
+    @classmethod
+    def of(cls, response: CachedResponse, request_headers: Dict[str, str]) -> Flight:
+        shared = response._replace(headers=shared_headers(response.headers)) if response.status < 400 and is_storable(response.headers) else None
+        return cls(response, shared, request_headers)
+
+    def shared_with(self, request_headers: Dict[str, str]) -> Optional[CachedResponse]:
+        """
+        Get the response for a request coalesced into this fetch.
+
+        Args:
+            request_headers (Dict[str, str]): The headers of the coalesced request.
+
+        Returns:
+            Optional[CachedResponse]: The shared response, or None if it isn't storable or the request's headers select another variant of it.
+        """
+        if self.shared is None:
+            return None
+        vary = self.shared.headers.get("vary", "")
+        if vary_variant(vary, request_headers) != vary_variant(vary, self.request_headers):
+            return None
+        return self.shared
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        """Coalesces concurrent calls for the same key into one, so concurrent cache misses share a single upstream fetch."""
+        self._in_flight: Dict[str, asyncio.Future[Any]] = {}
+        self.flights = 0
+        self.coalesced = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._in_flight
+
+    async def run(self, key: str, function: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run a function, unless a call for the same key is already in flight. Then its result is awaited instead.
+
+        Args:
+            key (str): The key identifying the call, usually the request URL.
+            function (Callable[[], Awaitable[T]]): The function to run.
+
+        Returns:
+            T: The result of the function, or of the call already in flight. Its exception is raised to every waiter.
+        """
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            try:
+                result: T = await asyncio.shield(future)
+                return result
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+            # The call in flight got cancelled, so this waiter runs the function itself
+            return await self.run(key, function)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        self.flights += 1
+        try:
+            result = await function()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Marking the exception as retrieved, as there might not be any waiters
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+
+
+class BaseCache(ABC):
+    def __init__(self) -> None:
+        """Counters, request coalescing and revalidation shared by ResponseCache and DiskCache."""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+        self.revalidations = 0
+        self.revalidation_hits = 0
+        self.in_flight = SingleFlight()
+        # The Vary headers of recently fetched URLs, so concurrent requests for different variants don't get coalesced
+        self.varies: OrderedDict[str, str] = OrderedDict()
+        self.max_varies = 4096
+
+    def flight_key(self, key: str, request_headers: Optional[Dict[str, str]] = None) -> str:
+        """
+        Get the key concurrent fetches of a request get coalesced by: its URL, plus the request headers its last response varied by.
+
+        Args:
+            key (str): The cache key, usually the request URL.
+            request_headers (Dict[str, str], optional): The request headers. Defaults to None.
+
+        Returns:
+            str: The key for the SingleFlight.
+        """
+        vary = self.varies.get(key)
+        return f"{key} {vary_variant(vary, request_headers)}" if vary else key
+
+    def remember_vary(self, key: str, headers: Dict[str, str]) -> None:
+        vary = headers.get("vary", "").strip()
+        self.varies.pop(key, None)
+        if vary:
+            self.varies[key] = vary
+            if len(self.varies) > self.max_varies:
+                self.varies.popitem(last=False)
+
+    async def offload(self, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run one of the cache's methods without blocking the event loop. In-memory caches run it right away.
+
+        Args:
+            function (Callable[..., T]): The method, e.g. cache.get.
+            *args, **kwargs: Its arguments.
+
+        Returns:
+            T: The result of the method.
+        """
+        return function(*args, **kwargs)
+
+    @abstractmethod
+    def lookup(self, key: str, request_headers: Optional[Dict[str, str]] = None) -> Optional[CachedResponse]:
+        """Get a cached response, fresh or stale, without counting it as a hit or miss."""
+
+    @abstractmethod
+    def put(self, key: str, status: int, headers: Dict[str, str], body: bytes, request_headers: Optional[Dict[str, str]] = None, max_age: Optional[float] = None) -> CachedResponse:
+        """Cache a response, returning it even if it wasn't stored."""
+
+    def store_revalidation(
+        self, key: str, stale: CachedResponse, status: int, headers: Dict[str, str], body: bytes, request_headers: Optional[Dict[str, str]] = None, max_age: Optional[float] = None
+    ) -> CachedResponse:
+        """
+        Store the response to a conditional request revalidating a stale entry.
+
+        A 304 refreshes the entry with the new headers and keeps its body, a successful response replaces it. Errors are passed through, keeping the stale entry.
+
+        Args:
+            key (str): The cache key, usually the request URL.
+            stale (CachedResponse): The stale entry which got revalidated.
+            status (int): The status of the conditional response.
+            headers (Dict[str, str]): The headers of the conditional response.
+            body (bytes): The body of the conditional response.
+            request_headers (Dict[str, str], optional): The request headers. Defaults to None.
+            max_age (float, optional): Seconds the stored response stays fresh at most. Defaults to None.
+
+        Returns:
+            CachedResponse: The response to serve.
+        """
+        self.revalidations += 1
+        if status == 304:
+            self.revalidation_hits += 1
+            self.bytes_saved += len(stale.body)
+            headers = {**stale.headers, **{name: value for name, value in headers.items() if name not in body_headers}}
+            return self.put(key, stale.status, headers, stale.body, request_headers, max_age=max_age)
+        if status >= 400:
+            return CachedResponse(status, headers, body, time.time())
+        return self.put(key, status, headers, body, request_headers, max_age=max_age)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def revalidation_hit_rate(self) -> float:
+        # Share of revalidations answered with a 304, which only cost the headers
+        return self.revalidation_hits / self.revalidations if self.revalidations else 0.0
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "evictions": self.evictions,
+            "bytes_saved": self.bytes_saved,
+            "coalesced": self.in_flight.coalesced,
+            "revalidations": self.revalidations,
+            "revalidation_hits": self.revalidation_hits,
+            "revalidation_hit_rate": self.revalidation_hit_rate,
+        }
+
+
+class ResponseCache(BaseCache):
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_entries: int = 4096, ttl: Optional[float] = None) -> None:
+        """
+        In-memory LRU cache of HTTP responses, storing status, headers and body bytes detached from the context that fetched them.
+
+        Args:
+            max_bytes (int, optional): Byte budget of all cached responses. Least recently used entries get evicted to stay within it. Defaults to 64 MiB.
+            max_entries (int, optional): Maximum amount of cached responses. Defaults to 4096.
+            ttl (float, optional): Seconds after which an entry goes stale. Defaults to None (never).
+        """
+        super().__init__()
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self.bytes_stored = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str, request_headers: Optional[Dict[str, str]] = None) -> Optional[CachedResponse]:
+        """
+        Get a fresh cached response and mark it as recently used.
+
+        Args:
+            key (str): The cache key, usually the request URL.
+            request_headers (Dict[str, str], optional): Unused, as the in-memory cache doesn't vary responses by request headers.
+
+        Returns:
+            Optional[CachedResponse]: The cached response, or None if it isn't cached or stale.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if not entry.fresh:
+            self.expirations += 1
+            self.misses += 1
+            # Stale entries are only kept if they can be revalidated
+            if not entry.validators:
+                self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self.bytes_saved += len(entry.body)
+        return entry
+
+    def lookup(self, key: str, request_headers: Optional[Dict[str, str]] = None) -> Optional[CachedResponse]:
+        """
+        Get a cached response, fresh or stale, without counting it as a hit or miss.
+
+        Args:
+            key (str): The cache key, usually the request URL.
+            request_headers (Dict[str, str], optional): Unused, as the in-memory cache doesn't vary responses by request headers.
+
+        Returns:
+            Optional[CachedResponse]: The cached response, or None if it isn't cached.
+        """
+        return self._entries.get(key)
+
+    def put(self, key: str, status: int, headers: Dict[str, str], body: bytes, request_headers: Optional[Dict[str, str]] = None, max_age: Optional[float] = None) -> CachedResponse:
+        """
+        Cache a response, evicting the least recently used entries to stay within the limits.
+
+        Args:
+            key (str): The cache key, usually the request URL.
+            status (int): The response status code.
+            headers (Dict[str, str]): The response headers.
+            body (bytes): The response body.
+            request_headers (Dict[str, str], optional): Unused, as the in-memory cache doesn't vary responses by request headers.
+            max_age (float, optional): Seconds the response stays fresh at most, on top of the cache's ttl. Defaults to None.
+
+        Returns:
+            CachedResponse: The response, even if it isn't storable or too large to be cached.
+        """
+        now = time.time()
+        lifetimes = [lifetime for lifetime in (self.ttl, max_age) if lifetime is not None]
+        entry = CachedResponse(status, dict(headers), body, now, now + min(lifetimes) if lifetimes else None)
+        if key in self._entries:
+            self._remove(key)
+
+        # Only the request which fetched the response gets its cookies
+        stored = entry._replace(headers=shared_headers(entry.headers))
+        # Responses exceeding the whole budget would only flush the cache
+        if not is_storable(headers) or stored.size > self.max_bytes:
+            return entry
+
+        self._entries[key] = stored
+        self.bytes_stored += stored.size
+        while self.bytes_stored > self.max_bytes or len(self._entries) > self.max_entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+        return entry
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self.bytes_stored -= entry.size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bytes_stored = 0
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        return {"entries": len(self._entries), "bytes_stored": self.bytes_stored, "expirations": self.expirations, **super().stats}
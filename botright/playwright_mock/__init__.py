@@ -1,6 +1,7 @@
 from .frame import Frame
 from .frame_locator import FrameLocator
 from .handles import ElementHandle, JSHandle
+from .interception import InterceptedRequest
 from .keyboard import Keyboard
 from .locator import Locator
 from .mouse import Mouse
@@ -9,4 +10,4 @@ from .routes import Request, Response, Route
 from .page import Page, new_page  # isort:skip
 from .browser import BrowserContext  # isort:skip
 
-__all__ = ["ElementHandle", "JSHandle", "Frame", "FrameLocator", "Route", "Response", "Request", "Locator", "Mouse", "Keyboard", "Page", "new_page", "BrowserContext"]
+__all__ = ["ElementHandle", "JSHandle", "Frame", "FrameLocator", "InterceptedRequest", "Route", "Response", "Request", "Locator", "Mouse", "Keyboard", "Page", "new_page", "BrowserContext"]
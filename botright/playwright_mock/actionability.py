@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, TypedDict, Union
+
+# from undetected_playwright.async_api import Position, Error as PlaywrightError
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import Position
+
+if TYPE_CHECKING:
+    from . import ElementHandle, Locator, Page
+
+
+class ActionBox(TypedDict):
+    x: float
+    y: float
+    width: float
+    height: float
+    click_x: float
+    click_y: float
+
+
+# Checks actionability, scrolls the element into view if needed and measures its box relative to the main frame's viewport, all inside the page.
+# Returns {"crossOrigin": true} if the element is inside a cross-origin frame, as the box can't be offset by its frame elements then.
+# fmt: off
+scroll_and_measure_script = """(element, { scroll, position }) => {
+    if (!element.isConnected) return { error: "Element is not attached to the DOM" };
+    const style = window.getComputedStyle(element);
+    let rect = element.getBoundingClientRect();
+    if (!rect.width || !rect.height || style.visibility === "hidden") return { error: "Element is not visible" };
+
+    const inViewport = r => r.top >= 0 && r.left >= 0 && r.bottom <= window.innerHeight && r.right <= window.innerWidth;
+    if (scroll && !inViewport(rect)) {
+        element.scrollIntoView({ block: "center", inline: "center", behavior: "instant" });
+        rect = element.getBoundingClientRect();
+    }
+
+    let x = rect.left, y = rect.top, win = window;
+    while (win !== window.top) {
+        const frameElement = win.frameElement;
+        if (!frameElement) return { crossOrigin: true };
+        const frameRect = frameElement.getBoundingClientRect();
+        const frameStyle = win.parent.getComputedStyle(frameElement);
+        x += frameRect.left + parseFloat(frameStyle.borderLeftWidth) + parseFloat(frameStyle.paddingLeft);
+        y += frameRect.top + parseFloat(frameStyle.borderTopWidth) + parseFloat(frameStyle.paddingTop);
+        win = win.parent;
+    }
+
+    const clickX = position ? x + position.x : x + Math.floor(rect.width / 2);
+    const clickY = position ? y + position.y : y + Math.floor(rect.height / 2);
+    return { x, y, width: rect.width, height: rect.height, click_x: clickX, click_y: clickY };
+}"""
+# fmt: on
+
+
+async def scroll_and_measure(element: Union[Locator, ElementHandle], page: Page, position: Optional[Position] = None, timeout: Optional[float] = None) -> ActionBox:
+    """
+    Check an element's actionability, scroll it into view if needed and measure its box plus a suggested click point in a single round trip.
+
+    Args:
+        element (Union[Locator, ElementHandle]): The element to act on.
+        page (Page): The page of the element.
+        position (Optional[Position]): A point relative to the top-left corner of the element to click at. Defaults to the center of the element.
+        timeout (Optional[float]): Maximum time (in ms) to wait for a Locator to resolve. Defaults to None.
+
+    Returns:
+        ActionBox: The box of the element and the suggested click point, relative to the main frame's viewport.
+
+    Raises:
+        PlaywrightError: If the element is detached or not visible.
+    """
+    position = position if position and any(position.values()) else None
+    arg = {"scroll": bool(page.scroll_into_view), "position": position}
+
+    from . import Locator
+
+    if isinstance(element, Locator):
+        result = await element.evaluate(scroll_and_measure_script, arg, timeout=timeout)
+    else:
+        result = await element.evaluate(scroll_and_measure_script, arg)
+
+    if result.get("error"):
+        raise PlaywrightError(result["error"])
+    if not result.get("crossOrigin"):
+        box: ActionBox = result
+        return box
+
+    # Falling back to Playwright measuring the box for elements inside cross-origin frames
+    bounding_box = await element.bounding_box()
+    if not bounding_box:
+        raise PlaywrightError("Element is not visible")
+
+    if page.scroll_into_view:
+        await element.scroll_into_view_if_needed(timeout=timeout)
+        bounding_box = await element.bounding_box() or bounding_box
+
+    x, y, width, height = bounding_box["x"], bounding_box["y"], bounding_box["width"], bounding_box["height"]
+    click_x, click_y = (x + position["x"], y + position["y"]) if position else (x + width // 2, y + height // 2)
+    return ActionBox(x=x, y=y, width=width, height=height, click_x=click_x, click_y=click_y)
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import inspect
 import sys
+import time
 from tempfile import TemporaryDirectory
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Pattern, TypedDict, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Pattern, Set, TypedDict, Union
 
 # from undetected_playwright._impl._async_base import AsyncEventContextManager
 # from undetected_playwright.async_api import BrowserContext as PlaywrightBrowserContext, \
@@ -12,17 +13,19 @@ from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Pattern,
 #     ConsoleMessage as PlaywrightConsoleMessage  # , \
 from playwright._impl._async_base import AsyncEventContextManager
 from playwright._impl._errors import TargetClosedError
-from playwright.async_api import APIResponse
 from playwright.async_api import BrowserContext as PlaywrightBrowserContext
 from playwright.async_api import ConsoleMessage as PlaywrightConsoleMessage
 from playwright.async_api import ElementHandle as PlaywrightElementHandle
+from playwright.async_api import Error as PlaywrightError
 from playwright.async_api import Frame as PlaywrightFrame
 from playwright.async_api import Page as PlaywrightPage
 from playwright.async_api import Request as PlaywrightRequest
 from playwright.async_api import Route as PlaywrightRoute
 
-from ..modules import Faker, ProxyManager
+from ..modules import BandwidthMeter, DiskCache, Faker, ForwardingProxy, ProxyManager, ProxyPool, ResourceBlocker, ResponseCache
+from ..modules.response_cache import CachedResponse, Flight, freshness_lifetime
 from . import ElementHandle, Frame, JSHandle, Page, Request, Route, new_page
+from .identity_map import IdentityMap
 
 if TYPE_CHECKING:
     from botright import Botright
@@ -47,6 +50,14 @@ async def new_browser(botright: Botright, proxy: ProxyManager, faker: Faker, fla
     Returns:
         BrowserContext: A new browser context with the specified configurations.
     """
+    browser_proxy = proxy.browser_proxy
+    http_credentials = {"username": proxy.username, "password": proxy.password} if proxy.username else None
+    forwarder = None
+    if botright.forwarding_proxy:
+        # The browser always connects to the local proxy, so its upstream can be swapped without a relaunch
+        forwarder = await ForwardingProxy(proxy.plain_proxy or None).start()
+        browser_proxy, http_credentials = forwarder.browser_proxy, None
+
     if botright.mask_fingerprint:
         fingerprint = faker.fingerprint
         parsed_launch_arguments = {
@@ -59,8 +70,8 @@ async def new_browser(botright: Botright, proxy: ProxyManager, faker: Faker, fla
             "screen": {"width": fingerprint.screen.width, "height": fingerprint.screen.height},
             "viewport": {"width": fingerprint.screen.avail_width, "height": fingerprint.screen.avail_height},
             "color_scheme": "dark",
-            "proxy": proxy.browser_proxy,
-            "http_credentials": {"username": proxy.username, "password": proxy.password} if proxy.username else None,
+            "proxy": browser_proxy,
+            "http_credentials": http_credentials,
             "ignore_default_args": ["--enable-automation"],
             **launch_arguments,
         }  # self.faker.locale
@@ -71,8 +82,8 @@ async def new_browser(botright: Botright, proxy: ProxyManager, faker: Faker, fla
             "geolocation": {"longitude": proxy.longitude, "latitude": proxy.latitude, "accuracy": 0.7},
             "ignore_https_errors": True,
             "color_scheme": "dark",
-            "proxy": proxy.browser_proxy,
-            "http_credentials": {"username": proxy.username, "password": proxy.password} if proxy.username else None,
+            "proxy": browser_proxy,
+            "http_credentials": http_credentials,
             "ignore_default_args": ["--enable-automation"],
             **launch_arguments,
         }  # self.faker.locale
@@ -85,7 +96,7 @@ async def new_browser(botright: Botright, proxy: ProxyManager, faker: Faker, fla
     botright.temp_dirs.append(temp_dir)
 
     # Spawning a new Context for more options
-    if proxy.browser_proxy:
+    if browser_proxy:
         _browser = await botright.playwright.chromium.launch_persistent_context(
             user_data_dir=temp_dir_path, headless=botright.headless, executable_path=botright.browser["path"], args=flags, chromium_sandbox=True, **parsed_launch_arguments
         )
@@ -103,29 +114,40 @@ async def new_browser(botright: Botright, proxy: ProxyManager, faker: Faker, fla
         user_action_layer=botright.user_action_layer,
         mask_fingerprint=botright.mask_fingerprint,
         scroll_into_view=botright.scroll_into_view,
+        sync_timing=botright.sync_timing,
+        bandwidth_budget=botright.bandwidth_budget,
+        forwarder=forwarder,
+        timezone_id=parsed_launch_arguments["timezone_id"],
     )
 
     # Preprocessing to save computing resources
-    if botright.block_images:
-        await browser.block_images()
-
     if botright.cache_responses:
         await browser.cache_responses()
 
+    # Blocking after caching, as the route registered last handles requests first
+    if botright.resource_blocker:
+        await browser.block_resources(botright.resource_blocker)
+    elif botright.block_images:
+        await browser.block_images()
+
     return browser
 
 
-class BrowserContext(PlaywrightBrowserContext):
+class BrowserContext(PlaywrightBrowserContext, metaclass=IdentityMap):
     def __init__(
         self,
         browser: PlaywrightBrowserContext,
         proxy: ProxyManager,
         faker: Faker,
         use_undetected_playwright: Optional[bool],
-        cache: Dict[str, APIResponse],
+        cache: Union[ResponseCache, DiskCache],
         user_action_layer: Optional[bool],
         scroll_into_view: Optional[bool],
         mask_fingerprint: Optional[bool],
+        sync_timing: Optional[bool] = False,
+        bandwidth_budget: Optional[int] = None,
+        forwarder: Optional[ForwardingProxy] = None,
+        timezone_id: Optional[str] = None,
     ):
         super().__init__(browser)
         self._impl_obj = browser._impl_obj
@@ -140,9 +162,18 @@ class BrowserContext(PlaywrightBrowserContext):
         self.use_undetected_playwright = use_undetected_playwright
 
         self.cache = cache
+        self.blocker: Optional[ResourceBlocker] = None
+        # The context's traffic also counts towards its proxy's meter
+        self.bandwidth = BandwidthMeter(budget=bandwidth_budget, parent=proxy.bandwidth)
+        self.forwarder = forwarder
+        # The pools which score this browser's navigations and release its proxy on close
+        self.proxy_pools: Set[ProxyPool] = set()
+        # The timezone of the launch, which Playwright can't change later on. Pages only emulate another one after a proxy rotation
+        self.timezone_id = timezone_id
         self.user_action_layer = user_action_layer
         self.scroll_into_view = scroll_into_view
         self.mask_fingerprint = mask_fingerprint
+        self.sync_timing = sync_timing
 
         self._origin_new_page = browser.new_page
         self._origin_close = browser.close
@@ -173,33 +204,96 @@ class BrowserContext(PlaywrightBrowserContext):
         return pages
 
     async def cache_responses(self):
+        async def fetch(route: PlaywrightRoute) -> CachedResponse:
+            request = route.request
+            # Documents follow their Cache-Control and Expires freshness, so HTML gets revalidated instead of being served forever
+            max_age = None
+            stale = await self.cache.offload(self.cache.lookup, request.url, request.headers)
+
+            if stale and stale.validators:
+                # Revalidating the stale entry with its ETag and Last-Modified, so an unchanged response only costs its headers
+                response = await route.fetch(headers={**request.headers, **stale.validators})
+                body = await response.body()
+                self.bandwidth.meter_api_response(response, body, request.resource_type)
+                if request.resource_type == "document":
+                    max_age = freshness_lifetime(response.headers)
+                return await self.cache.offload(self.cache.store_revalidation, request.url, stale, response.status, response.headers, body, request.headers, max_age=max_age)
+
+            response = await route.fetch()
+            body = await response.body()
+            self.bandwidth.meter_api_response(response, body, request.resource_type)
+            # Error responses are passed through without being cached
+            if response.status >= 400:
+                return CachedResponse(response.status, response.headers, body, time.time())
+            if request.resource_type == "document":
+                max_age = freshness_lifetime(response.headers)
+            return await self.cache.offload(self.cache.put, request.url, response.status, response.headers, body, request.headers, max_age=max_age)
+
+        async def continue_to_network(route: PlaywrightRoute):
+            try:
+                await route.continue_()
+            except PlaywrightError:
+                # This request's page got closed as well
+                pass
+
         async def route_interceptor(route: PlaywrightRoute):
             request = route.request
 
-            if request.resource_type in ("document", "stylesheet", "image", "media", "font", "manifest"):
-                if request.url not in self.cache:
-                    response = await route.fetch()
-                    self.cache[request.url] = response
-                else:
-                    response = self.cache[request.url]
-                await route.fulfill(response=response)
+            if request.method == "GET" and request.resource_type in ("document", "stylesheet", "image", "media", "font", "manifest"):
+                cached = await self.cache.offload(self.cache.get, request.url, request.headers)
+                if cached is None:
+                    fetched = False
+
+                    async def fetch_flight() -> Flight:
+                        nonlocal fetched
+                        fetched = True
+                        response = await fetch(route)
+                        self.cache.remember_vary(request.url, response.headers)
+                        return Flight.of(response, request.headers)
+
+                    try:
+                        # Concurrent misses of the same URL and variant (from any page or context sharing the cache) share one upstream fetch
+                        flight = await self.cache.in_flight.run(self.cache.flight_key(request.url, request.headers), fetch_flight)
+                    except PlaywrightError:
+                        # The shared fetch failed, e.g. as its page closed or the proxy errored, so every coalesced request goes to the network on its own
+                        await continue_to_network(route)
+                        return
+
+                    # Coalesced requests only get storable responses without the fetching context's cookies, and only of the variant they asked for
+                    cached = flight.response if fetched else flight.shared_with(request.headers)
+                    if cached is None:
+                        await continue_to_network(route)
+                        return
+                await route.fulfill(status=cached.status, headers=cached.headers, body=cached.body)
             else:
                 await route.continue_()
 
-        await self.route("**", route_interceptor)
+        await self.route("**", route_interceptor, raw=True)
 
-    async def block_images(self):
-        async def all_blocker(route: PlaywrightRoute):
-            await route.abort(error_code="aborted")
+    async def block_resources(self, blocker: ResourceBlocker) -> ResourceBlocker:
+        """
+        Block requests matching a ResourceBlocker's rules, replacing any blocker applied before.
 
-        async def image_blocker(route: PlaywrightRoute):
-            if route.request.resource_type == "image":
-                await route.abort(error_code="aborted")
-            else:
-                await route.continue_()
+        Args:
+            blocker (ResourceBlocker): The blocker to apply. It can be shared between contexts to sum up their stats.
+
+        Returns:
+            ResourceBlocker: The applied blocker.
+        """
+        if self.blocker and self.blocker.url_pattern:
+            await self._origin_unroute(url=self.blocker.url_pattern, handler=self.blocker.handle_route)
+
+        self.blocker = blocker
+        if blocker.url_pattern:
+            await self.route(blocker.url_pattern, blocker.handle_route, raw=True)
+        # Pages opened later attach the blocker when opening their CDP session
+        for page in self.pages:
+            await blocker.attach(page)
+        return blocker
 
-        await self.route("**/*.{apng,avif,gif,jpg,jpeg,jfif,pjpeg,pjp,png,svg,webp}", all_blocker)
-        await self.route("**", image_blocker)
+    async def block_images(self) -> ResourceBlocker:
+        # Matching the image resource type like before, so images without a file extension get blocked too
+        return await self.block_resources(ResourceBlocker(["images"], match_resource_types=True))
 
     async def new_page(self, **launch_arguments) -> Page:
         """
@@ -217,23 +311,63 @@ class BrowserContext(PlaywrightBrowserContext):
 
         return page
 
+    async def set_proxy(self, proxy: ProxyManager, drop_connections: bool = True) -> None:
+        """
+        Swap the browser's proxy while it keeps running, keeping its cache, cookies and pages. Needs Botright(forwarding_proxy=True).
+
+        The geolocation and timezone of the browser follow the new proxy. The fingerprint and locale stay the ones of the launch.
+
+        Args:
+            proxy (ProxyManager): The checked proxy to use from now on.
+            drop_connections (bool, optional): Whether to close the connections still tunneling through the previous proxy. Defaults to True.
+        """
+        if self.forwarder is None:
+            raise RuntimeError("Swapping the proxy of a running browser needs Botright(forwarding_proxy=True)")
+
+        await self.forwarder.set_upstream(proxy.plain_proxy or None, drop_connections=drop_connections)
+        self.proxy = proxy
+        # Traffic from now on counts towards the new proxy's meter
+        self.bandwidth.parent = proxy.bandwidth
+
+        await self.set_geolocation({"longitude": float(proxy.longitude), "latitude": float(proxy.latitude), "accuracy": 0.7})
+        for page in self.pages:
+            await page._emulate_proxy_timezone()
+
     async def close(self, reason: Optional[str] = None):
         self._closed = True
         try:
             return await self._origin_close(reason=reason)
         except TargetClosedError:
             return
+        finally:
+            if self.forwarder:
+                await self.forwarder.close()
 
     async def route(
-        self, url: Union[str, Pattern[str], Callable[[str], bool]], handler: Union[Callable[[PlaywrightRoute], Any], Callable[[PlaywrightRoute, PlaywrightRequest], Any]], times: Optional[int] = None
+        self,
+        url: Union[str, Pattern[str], Callable[[str], bool]],
+        handler: Union[Callable[[PlaywrightRoute], Any], Callable[[PlaywrightRoute, PlaywrightRequest], Any]],
+        times: Optional[int] = None,
+        raw: Optional[bool] = False,
     ):
+        """
+        Args:
+            url (Union[str, Pattern[str], Callable[[str], bool]]): A glob pattern, regex pattern or predicate receiving the URL to match while routing.
+            handler (Union[Callable[[Route], Any], Callable[[Route, Request], Any]]): Handler function to route the request.
+            times (Optional[int]): How often a route should be used. By default it will be used every time.
+            raw (Optional[bool]): Pass the raw Playwright Route and Request to the handler, skipping Botright's wrappers. Defaults to False.
+        """
+        if raw:
+            # Raw handlers are registered as they are, so intercepted requests don't create any wrappers at all
+            await self._origin_route(url=url, handler=handler, times=times)
+            return
+
+        # The page of the request only gets resolved once the handler accesses it, e.g. via route.request.frame.page
         if len(inspect.signature(handler).parameters) == 2:  # Checking how many parameters the callable expects
 
             def handler_proxy(route: PlaywrightRoute, request: PlaywrightRequest):
-                page = request.frame.page
-
-                route = Route(route, Page(page, self, self.faker))
-                request = Request(request, Page(page, self, self.faker))
+                route = Route(route, context=self)
+                request = Request(request, context=self)
                 return handler(route, request)  # type: ignore
 
             self._route_proxies[handler] = handler_proxy
@@ -241,9 +375,7 @@ class BrowserContext(PlaywrightBrowserContext):
         else:
 
             def handler_proxy_no_request(route: PlaywrightRoute):
-                page = route.request.frame.page
-
-                route = Route(route, Page(page, self, self.faker))
+                route = Route(route, context=self)
                 return handler(route)  # type: ignore
 
             self._route_proxies[handler] = handler_proxy_no_request
@@ -253,7 +385,8 @@ class BrowserContext(PlaywrightBrowserContext):
         self, url: Union[str, Pattern[str], Callable[[str], bool]], handler: Optional[Union[Callable[[PlaywrightRoute], Any], Callable[[PlaywrightRoute, PlaywrightRequest], Any]]] = None
     ):
         if handler:
-            handler_proxy = self._route_proxies[handler]
+            # Raw handlers were registered without a proxy
+            handler_proxy = self._route_proxies.get(handler, handler)
             await self._origin_unroute(url=url, handler=handler_proxy)
 
         await self._origin_unroute(url=url, handler=None)
@@ -301,6 +434,7 @@ class BrowserContext(PlaywrightBrowserContext):
                     user_action_layer=self.user_action_layer,
                     scroll_into_view=self.scroll_into_view,
                     mask_fingerprint=self.mask_fingerprint,
+                    sync_timing=self.sync_timing,
                 )
                 page = Page(_page, self, self.faker)
                 frame = Frame(_frame, page)
@@ -332,6 +466,7 @@ class BrowserContext(PlaywrightBrowserContext):
                     user_action_layer=self.user_action_layer,
                     scroll_into_view=self.scroll_into_view,
                     mask_fingerprint=self.mask_fingerprint,
+                    sync_timing=self.sync_timing,
                 )
                 page = Page(_page, self, self.faker)
                 frame = Frame(_frame, page)
@@ -11,17 +11,18 @@ from playwright.async_api import Frame as PlaywrightFrame
 from playwright.async_api import Locator as PlaywrightLocator
 from playwright.async_api import Position
 
+from .identity_map import IdentityMap
+
 if TYPE_CHECKING:
     from . import ElementHandle, FrameLocator, JSHandle, Locator, Page
 
 
-class Frame(PlaywrightFrame):
+class Frame(PlaywrightFrame, metaclass=IdentityMap):
     def __init__(self, frame: PlaywrightFrame, page: Page) -> None:
         super().__init__(frame)
         self._impl_obj = frame._impl_obj
         self._page = page
         self._frame = frame
-        self._parent_frame = frame.parent_frame
 
         self._origin_query_selector = frame.query_selector
         self._origin_query_selector_all = frame.query_selector_all
@@ -35,10 +36,6 @@ class Frame(PlaywrightFrame):
         self._origin_frame_locator = frame.frame_locator
         self._origin_locator = frame.locator
 
-        self._child_frames = []
-        for frame in frame.child_frames:
-            self._child_frames.append(Frame(frame, page))
-
     def __eq__(self, obj):
         if isinstance(obj, Frame):
             if obj._frame == self._frame:  # and (obj._page == self._page)
@@ -51,14 +48,15 @@ class Frame(PlaywrightFrame):
 
     @property
     def child_frames(self):
-        return self._child_frames
+        # Looked up on access, as frames get attached and detached during the frame's lifetime
+        return [Frame(frame, self._page) for frame in self._frame.child_frames]
 
     @property
     def parent_frame(self):
-        if not self._parent_frame:
+        if not self._frame.parent_frame:
             return None
 
-        return Frame(self._parent_frame, self._page)
+        return Frame(self._frame.parent_frame, self._page)
 
     # ElementHandle
     async def query_selector(self, selector: str, strict: Optional[bool] = False) -> Optional[ElementHandle]:
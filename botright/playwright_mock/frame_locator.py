@@ -6,11 +6,13 @@ from typing import TYPE_CHECKING, Any, Optional, Pattern, Union
 from playwright.async_api import FrameLocator as PlaywrightFrameLocator
 from playwright.async_api import Locator as PlaywrightLocator
 
+from .identity_map import IdentityMap
+
 if TYPE_CHECKING:
     from . import Locator, Page
 
 
-class FrameLocator(PlaywrightFrameLocator):
+class FrameLocator(PlaywrightFrameLocator, metaclass=IdentityMap):
     def __init__(self, frame_locator: PlaywrightFrameLocator, page: Page):
         super().__init__(frame_locator)
         self._impl_obj = frame_locator._impl_obj
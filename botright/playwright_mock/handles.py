@@ -8,11 +8,14 @@ from playwright.async_api import Error as PlaywrightError
 from playwright.async_api import JSHandle as PlaywrightJSHandle
 from playwright.async_api import Position
 
+from .actionability import scroll_and_measure
+from .identity_map import IdentityMap
+
 if TYPE_CHECKING:
     from . import Frame, Page
 
 
-class JSHandle(PlaywrightJSHandle):
+class JSHandle(PlaywrightJSHandle, metaclass=IdentityMap):
     def __init__(self, js_handle: PlaywrightJSHandle, page: Page):
         super().__init__(js_handle)
         self._impl_obj = js_handle._impl_obj
@@ -137,31 +140,13 @@ class ElementHandle(JSHandle, PlaywrightElementHandle):
             await self.wait_for_element_state("editable", timeout=timeout)
 
         if not trial:
-            bounding_box = await self.bounding_box()
-            if not bounding_box:
-                raise PlaywrightError("Element is not visible")
-
-            if self._page.scroll_into_view:
-                await self.scroll_into_view_if_needed(timeout=timeout)
-
-            try:
-                is_visible = await self.is_visible()
-            except PlaywrightError:
-                is_visible = True
-
-            if not is_visible:
-                raise PlaywrightError("Element is outside of the viewport")
-
-            x, y, width, height = bounding_box["x"], bounding_box["y"], bounding_box["width"], bounding_box["height"]
-            if not any(position.values()):
-                x, y = x + width // 2, y + height // 2
-            else:
-                x, y = x + position["x"], y + position["y"]
+            box = await scroll_and_measure(self, self._page, position, timeout)
+            x, y, target_size = box["click_x"], box["click_y"], min(box["width"], box["height"])
 
             for modifier in modifiers:
                 await self._page.keyboard.down(modifier)
 
-            await self._page.mouse.click(x, y, button=button, click_count=click_count, delay=delay)
+            await self._page.mouse.click(x, y, button=button, click_count=click_count, delay=delay, target_size=target_size)
 
             for modifier in modifiers:
                 await self._page.keyboard.up(modifier)
@@ -184,26 +169,13 @@ class ElementHandle(JSHandle, PlaywrightElementHandle):
             await self.wait_for_element_state("editable", timeout=timeout)
 
         if not trial:
-            bounding_box = await self.bounding_box()
-            if not bounding_box:
-                raise PlaywrightError("Element is not visible")
-
-            if self._page.scroll_into_view:
-                await self.scroll_into_view_if_needed(timeout=timeout)
-
-            if not await self.is_visible():
-                raise PlaywrightError("Element is outside of the viewport")
-
-            x, y, width, height = bounding_box["x"], bounding_box["y"], bounding_box["width"], bounding_box["height"]
-            if not any(position.values()):
-                x, y = x + width // 2, y + height // 2
-            else:
-                x, y = x + position["x"], y + position["y"]
+            box = await scroll_and_measure(self, self._page, position, timeout)
+            x, y, target_size = box["click_x"], box["click_y"], min(box["width"], box["height"])
 
             for modifier in modifiers:
                 await self._page.keyboard.down(modifier)
 
-            await self._page.mouse.dblclick(x, y, button=button, delay=delay)
+            await self._page.mouse.dblclick(x, y, button=button, delay=delay, target_size=target_size)
 
             for modifier in modifiers:
                 await self._page.keyboard.up(modifier)
@@ -220,23 +192,10 @@ class ElementHandle(JSHandle, PlaywrightElementHandle):
             return
 
         if not trial:
-            bounding_box = await self.bounding_box()
-            if not bounding_box:
-                raise PlaywrightError("Element is not visible")
-
-            if self._page.scroll_into_view:
-                await self.scroll_into_view_if_needed(timeout=timeout)
+            box = await scroll_and_measure(self, self._page, position, timeout)
+            x, y, target_size = box["click_x"], box["click_y"], min(box["width"], box["height"])
 
-            if not await self.is_visible():
-                raise PlaywrightError("Element is outside of the viewport")
-
-            x, y, width, height = bounding_box["x"], bounding_box["y"], bounding_box["width"], bounding_box["height"]
-            if not any(position.values()):
-                x, y = x + width // 2, y + height // 2
-            else:
-                x, y = x + position["x"], y + position["y"]
-
-            await self._page.mouse.click(x, y, button="left", click_count=1, delay=20)
+            await self._page.mouse.click(x, y, button="left", click_count=1, delay=20, target_size=target_size)
 
             assert await self.is_checked(), PlaywrightError
 
@@ -252,23 +211,10 @@ class ElementHandle(JSHandle, PlaywrightElementHandle):
             return
 
         if not trial:
-            bounding_box = await self.bounding_box()
-            if not bounding_box:
-                raise PlaywrightError("Element is not visible")
-
-            if self._page.scroll_into_view:
-                await self.scroll_into_view_if_needed(timeout=timeout)
+            box = await scroll_and_measure(self, self._page, position, timeout)
+            x, y, target_size = box["click_x"], box["click_y"], min(box["width"], box["height"])
 
-            if not await self.is_visible():
-                raise PlaywrightError("Element is outside of the viewport")
-
-            x, y, width, height = bounding_box["x"], bounding_box["y"], bounding_box["width"], bounding_box["height"]
-            if not any(position.values()):
-                x, y = x + width // 2, y + height // 2
-            else:
-                x, y = x + position["x"], y + position["y"]
-
-            await self._page.mouse.click(x, y, button="left", click_count=1, delay=20)
+            await self._page.mouse.click(x, y, button="left", click_count=1, delay=20, target_size=target_size)
 
             assert not await self.is_checked()
 
@@ -284,23 +230,10 @@ class ElementHandle(JSHandle, PlaywrightElementHandle):
             return
 
         if not trial:
-            bounding_box = await self.bounding_box()
-            if not bounding_box:
-                raise PlaywrightError("Element is not visible")
-
-            if self._page.scroll_into_view:
-                await self.scroll_into_view_if_needed(timeout=timeout)
+            box = await scroll_and_measure(self, self._page, position, timeout)
+            x, y, target_size = box["click_x"], box["click_y"], min(box["width"], box["height"])
 
-            if not await self.is_visible():
-                raise PlaywrightError("Element is outside of the viewport")
-
-            x, y, width, height = bounding_box["x"], bounding_box["y"], bounding_box["width"], bounding_box["height"]
-            if not any(position.values()):
-                x, y = x + width // 2, y + height // 2
-            else:
-                x, y = x + position["x"], y + position["y"]
-
-            await self._page.mouse.click(x, y, button="left", click_count=1, delay=20)
+            await self._page.mouse.click(x, y, button="left", click_count=1, delay=20, target_size=target_size)
 
             assert await self.is_checked() == checked
 
@@ -320,26 +253,13 @@ class ElementHandle(JSHandle, PlaywrightElementHandle):
             await self.wait_for_element_state("editable", timeout=timeout)
 
         if not trial:
-            bounding_box = await self.bounding_box()
-            if not bounding_box:
-                raise PlaywrightError("Element is not visible")
-
-            if self._page.scroll_into_view:
-                await self.scroll_into_view_if_needed(timeout=timeout)
-
-            if not await self.is_visible():
-                raise PlaywrightError("Element is outside of the viewport")
-
-            x, y, width, height = bounding_box["x"], bounding_box["y"], bounding_box["width"], bounding_box["height"]
-            if not any(position.values()):
-                x, y = x + width // 2, y + height // 2
-            else:
-                x, y = x + position["x"], y + position["y"]
+            box = await scroll_and_measure(self, self._page, position, timeout)
+            x, y, target_size = box["click_x"], box["click_y"], min(box["width"], box["height"])
 
             for modifier in modifiers:
                 await self._page.keyboard.down(modifier)
 
-            await self._page.mouse.move(x, y)
+            await self._page.mouse.move(x, y, target_size=target_size)
 
             for modifier in modifiers:
                 await self._page.keyboard.up(modifier)
@@ -347,17 +267,7 @@ class ElementHandle(JSHandle, PlaywrightElementHandle):
     async def type(self, text: str, delay: Optional[float] = None, timeout: Optional[float] = None, no_wait_after: Optional[bool] = None) -> None:
         await self.wait_for_element_state("editable", timeout=timeout)
 
-        bounding_box = await self.bounding_box()
-        if not bounding_box:
-            raise PlaywrightError("Element is not visible")
-
-        if self._page.scroll_into_view:
-            await self.scroll_into_view_if_needed(timeout=timeout)
-
-        x, y, width, height = bounding_box["x"], bounding_box["y"], bounding_box["width"], bounding_box["height"]
-
-        x, y = x + width // 2, y + height // 2
-
-        await self._page.mouse.click(x, y, delay=delay)
+        box = await scroll_and_measure(self, self._page, timeout=timeout)
+        await self._page.mouse.click(box["click_x"], box["click_y"], delay=delay, target_size=min(box["width"], box["height"]))
 
         await self._page.keyboard.type(text, delay=delay)
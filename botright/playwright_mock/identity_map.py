@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+
+class IdentityMap(type):
+    """
+    Metaclass making sure every underlying Playwright object gets exactly one wrapper per wrapper class.
+
+    Calling a wrapper class with a Playwright object (or another wrapper of it) returns the existing wrapper of its impl object, only constructing a new one on first use.
+    The wrappers are stored on the impl object itself instead of a global registry: they reference their impl object, so a WeakKeyDictionary entry would never expire.
+    This way they share the lifetime of the impl object and get collected together with it once Playwright disposes of it.
+    """
+
+    def __call__(cls, obj: Any, *args: Any, **kwargs: Any) -> Any:
+        impl = obj._impl_obj
+        wrappers: Optional[Dict[type, Any]] = getattr(impl, "_botright_wrappers", None)
+        if wrappers is None:
+            wrappers = {}
+            setattr(impl, "_botright_wrappers", wrappers)
+
+        wrapper = wrappers.get(cls)
+        if wrapper is None:
+            wrapper = super().__call__(obj, *args, **kwargs)
+            wrappers[cls] = wrapper
+        return wrapper
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import base64
+import inspect
+import re
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Pattern, Union
+
+from playwright.async_api import CDPSession as PlaywrightCDPSession
+from playwright.async_api import Error as PlaywrightError
+
+# fmt: off
+# CDP's resource types, looked up by Playwright's lowercase names of them
+cdp_resource_types = {name.lower(): name for name in ("Document", "Stylesheet", "Image", "Media", "Font", "Script", "TextTrack", "XHR", "Fetch", "Prefetch", "EventSource", "WebSocket",
+                                                      "Manifest", "SignedExchange", "Ping", "CSPViolationReport", "Preflight", "Other")}
+# fmt: on
+
+
+def cdp_pattern_to_regex(pattern: str) -> Pattern[str]:
+    # CDP's URL patterns know "*" for any amount of characters and "?" for a single one, "\" escapes them
+    source = ""
+    escaped = False
+    for char in pattern:
+        if escaped:
+            source += re.escape(char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == "*":
+            source += ".*"
+        elif char == "?":
+            source += "."
+        else:
+            source += re.escape(char)
+    return re.compile(f"^{source}$", re.DOTALL)
+
+
+class InterceptedRequest:
+    __slots__ = ("_cdp", "request_id", "url", "method", "headers", "post_data", "resource_type", "frame_id", "handled")
+
+    def __init__(self, cdp: PlaywrightCDPSession, params: Dict[str, Any]):
+        """A request paused by the Fetch domain, which gets fulfilled, continued or failed by a single CDP command."""
+        request = params["request"]
+        self._cdp = cdp
+        self.request_id: str = params["requestId"]
+        self.url: str = request["url"]
+        self.method: str = request["method"]
+        self.headers: Dict[str, str] = request["headers"]
+        self.post_data: Optional[str] = request.get("postData")
+        # Playwright's lowercase resource type names, e.g. "image" or "xhr"
+        self.resource_type: str = params["resourceType"].lower()
+        self.frame_id: str = params["frameId"]
+        self.handled = False
+
+    async def fulfill(self, status: int = 200, headers: Optional[Dict[str, str]] = None, body: Union[str, bytes] = b"", content_type: Optional[str] = None) -> None:
+        """
+        Fulfill the request without it reaching the network.
+
+        Args:
+            status (int, optional): The response status code. Defaults to 200.
+            headers (Dict[str, str], optional): The response headers. Defaults to None.
+            body (Union[str, bytes], optional): The response body. Defaults to an empty body.
+            content_type (str, optional): Sets the Content-Type header. Defaults to None.
+        """
+        headers = dict(headers or {})
+        if content_type:
+            headers["content-type"] = content_type
+        body = body.encode() if isinstance(body, str) else body
+
+        self.handled = True
+        await self._cdp.send(
+            "Fetch.fulfillRequest",
+            {
+                "requestId": self.request_id,
+                "responseCode": status,
+                "responseHeaders": [{"name": name, "value": value} for name, value in headers.items()],
+                "body": base64.b64encode(body).decode(),
+            },
+        )
+
+    async def continue_(self, url: Optional[str] = None, method: Optional[str] = None, headers: Optional[Dict[str, str]] = None, post_data: Optional[Union[str, bytes]] = None) -> None:
+        """
+        Continue the request to the network, optionally overriding parts of it.
+
+        Args:
+            url (str, optional): The URL to request instead. The change isn't observable by the page. Defaults to None.
+            method (str, optional): The method to request with instead. Defaults to None.
+            headers (Dict[str, str], optional): The headers to send instead. Defaults to None.
+            post_data (Union[str, bytes], optional): The post data to send instead. Defaults to None.
+        """
+        params: Dict[str, Any] = {"requestId": self.request_id}
+        if url is not None:
+            params["url"] = url
+        if method is not None:
+            params["method"] = method
+        if headers is not None:
+            params["headers"] = [{"name": name, "value": value} for name, value in headers.items()]
+        if post_data is not None:
+            params["postData"] = base64.b64encode(post_data.encode() if isinstance(post_data, str) else post_data).decode()
+
+        self.handled = True
+        await self._cdp.send("Fetch.continueRequest", params)
+
+    async def fail(self, error_reason: str = "BlockedByClient") -> None:
+        """
+        Fail the request with a network error.
+
+        Args:
+            error_reason (str, optional): The CDP network error reason, e.g. "Aborted", "AccessDenied" or "BlockedByClient". Defaults to "BlockedByClient".
+        """
+        self.handled = True
+        await self._cdp.send("Fetch.failRequest", {"requestId": self.request_id, "errorReason": error_reason})
+
+
+class Interception(NamedTuple):
+    url: str
+    resource_type: Optional[str]
+    handler: Callable[[InterceptedRequest], Any]
+    regex: Pattern[str]
+
+
+class FetchInterceptor:
+    def __init__(self, cdp: PlaywrightCDPSession):
+        """
+        Interception backend on a page's CDP session, using the Fetch domain instead of Playwright's routes.
+
+        Only requests matching the URL patterns and resource types of an interception get paused by the browser, everything else never reaches Python.
+        Paused requests are handed to the handlers as InterceptedRequest objects, without any Playwright or Botright objects being created for them.
+
+        Args:
+            cdp (PlaywrightCDPSession): The CDP session of the page to intercept requests of.
+        """
+        self._cdp = cdp
+        self._interceptions: List[Interception] = []
+        self._listening = False
+        self.paused = 0
+
+    def __len__(self) -> int:
+        return len(self._interceptions)
+
+    async def add(self, url: str, handler: Callable[[InterceptedRequest], Any], resource_type: Optional[str] = None) -> None:
+        if resource_type is not None and resource_type not in cdp_resource_types:
+            raise ValueError(f"Unknown resource type: {resource_type}. Choose from {', '.join(cdp_resource_types)}")
+
+        # Handlers registered last get to handle matching requests first, like with routes
+        self._interceptions.insert(0, Interception(url, resource_type, handler, cdp_pattern_to_regex(url)))
+        if not self._listening:
+            self._cdp.on("Fetch.requestPaused", self._on_request_paused)
+            self._listening = True
+        await self._update_patterns()
+
+    async def remove(self, url: str, handler: Optional[Callable[[InterceptedRequest], Any]] = None) -> None:
+        self._interceptions = [interception for interception in self._interceptions if interception.url != url or (handler and interception.handler != handler)]
+        await self._update_patterns()
+
+    async def _update_patterns(self) -> None:
+        if not self._interceptions:
+            await self._cdp.send("Fetch.disable")
+            return
+
+        patterns = []
+        for interception in reversed(self._interceptions):
+            pattern = {"urlPattern": interception.url, "requestStage": "Request"}
+            if interception.resource_type:
+                pattern["resourceType"] = cdp_resource_types[interception.resource_type]
+            patterns.append(pattern)
+        await self._cdp.send("Fetch.enable", {"patterns": patterns})
+
+    async def _on_request_paused(self, params: Dict[str, Any]) -> None:
+        self.paused += 1
+        request = InterceptedRequest(self._cdp, params)
+        try:
+            # The browser doesn't tell which pattern matched, so the matching handlers are looked up again. Unhandled requests fall back to the next one
+            for interception in self._interceptions:
+                if (interception.resource_type is None or interception.resource_type == request.resource_type) and interception.regex.match(request.url):
+                    result = interception.handler(request)
+                    if inspect.isawaitable(result):
+                        await result
+                    if request.handled:
+                        break
+        finally:
+            # Unhandled requests would stay paused forever
+            if not request.handled:
+                try:
+                    await request.continue_()
+                except PlaywrightError:
+                    # The page got closed in the meantime
+                    pass
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 import random
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 # from undetected_playwright.async_api import Keyboard as PlaywrightKeyboard
 from playwright.async_api import Keyboard as PlaywrightKeyboard
@@ -9,6 +10,65 @@ from playwright.async_api import Keyboard as PlaywrightKeyboard
 if TYPE_CHECKING:
     from . import Page
 
+# Keys which dont type their own character, as (key, code, windowsVirtualKeyCode, text)
+special_keys = {"\n": ("Enter", "Enter", 13, "\r"), "\r": ("Enter", "Enter", 13, "\r"), "\t": ("Tab", "Tab", 9, "")}
+
+# Playwright's USKeyboardLayout of the printable ASCII characters, as (code, windowsVirtualKeyCode, unshifted character, shifted character)
+us_keyboard_layout = [
+    ("Backquote", 192, "`", "~"),
+    *((f"Digit{digit}", ord(digit), digit, shifted) for digit, shifted in zip("1234567890", "!@#$%^&*()")),
+    ("Minus", 189, "-", "_"),
+    ("Equal", 187, "=", "+"),
+    ("BracketLeft", 219, "[", "{"),
+    ("BracketRight", 221, "]", "}"),
+    ("Backslash", 220, "\\", "|"),
+    ("Semicolon", 186, ";", ":"),
+    ("Quote", 222, "'", '"'),
+    ("Comma", 188, ",", "<"),
+    ("Period", 190, ".", ">"),
+    ("Slash", 191, "/", "?"),
+    *((f"Key{letter}", ord(letter), letter.lower(), letter) for letter in "ABCDEFGHIJKLMNOPQRSTUVWXYZ"),
+    ("Space", 32, " ", ""),
+]
+# Character -> (code, windowsVirtualKeyCode, whether Shift is held)
+us_keys = {
+    **{unshifted: (code, key_code, False) for code, key_code, unshifted, _ in us_keyboard_layout},
+    **{shifted: (code, key_code, True) for code, key_code, _, shifted in us_keyboard_layout if shifted},
+}
+
+# CDP modifier bit of the Shift key
+shift_modifier = 8
+shift_down = {"type": "rawKeyDown", "key": "Shift", "code": "ShiftLeft", "windowsVirtualKeyCode": 16, "location": 1, "modifiers": shift_modifier}
+shift_up = {"type": "keyUp", "key": "Shift", "code": "ShiftLeft", "windowsVirtualKeyCode": 16, "location": 1, "modifiers": 0}
+
+
+def key_events(char: str) -> Tuple[List[Tuple[str, Dict[str, Any]]], List[Tuple[str, Dict[str, Any]]]]:
+    """
+    Get the CDP events (method, params) typing a single character on Playwright's US keyboard layout, holding Shift for shifted characters.
+
+    Args:
+        char (str): The character to type.
+
+    Returns:
+        Tuple[List[Tuple[str, Dict[str, Any]]], List[Tuple[str, Dict[str, Any]]]]: The events pressing the key, and the events releasing it.
+    """
+    modifiers = 0
+    if char in special_keys:
+        key, code, key_code, text = special_keys[char]
+    elif char in us_keys:
+        code, key_code, shifted = us_keys[char]
+        key, text = char, char
+        modifiers = shift_modifier if shifted else 0
+    else:
+        # Characters outside of the keyboard layout are inserted, like Playwright does
+        return [("Input.insertText", {"text": char})], []
+
+    key_down = {"type": "keyDown" if text else "rawKeyDown", "key": key, "code": code, "windowsVirtualKeyCode": key_code, "text": text, "unmodifiedText": text, "modifiers": modifiers}
+    key_up = {"type": "keyUp", "key": key, "code": code, "windowsVirtualKeyCode": key_code, "modifiers": modifiers}
+    if modifiers:
+        return [("Input.dispatchKeyEvent", shift_down), ("Input.dispatchKeyEvent", key_down)], [("Input.dispatchKeyEvent", key_up), ("Input.dispatchKeyEvent", shift_up)]
+    return [("Input.dispatchKeyEvent", key_down)], [("Input.dispatchKeyEvent", key_up)]
+
 
 class Keyboard(PlaywrightKeyboard):
     def __init__(self, keyboard: PlaywrightKeyboard, page: Page):
@@ -17,12 +77,94 @@ class Keyboard(PlaywrightKeyboard):
 
         self._page = page
         self._origin_type = keyboard.type
+        self._origin_insert_text = keyboard.insert_text
 
-    async def type(self, text: str, *, delay: Optional[float] = None) -> None:
+    async def type(self, text: str, *, delay: Optional[float] = None, fast_fill: Optional[int] = None) -> None:
+        """
+        Type a text humanly.
+
+        Args:
+            text (str): The text to type.
+            delay (Optional[float]): Average time (in ms) each key is held down. Defaults to 100.
+            fast_fill (Optional[int]): Only type the first fast_fill characters humanly and insert the rest of the text at once. Defaults to None.
+        """
         if not delay:
             delay = 100
         delay = int(delay)
 
+        typed_text, filled_text = (text[:fast_fill], text[fast_fill:]) if fast_fill is not None else (text, "")
+
+        self._page.timing.action("type")
+        if self._page.cdp:
+            schedule = self.build_schedule(typed_text, delay)
+            if filled_text:
+                # Strictly after the last keyUp, as timers due at the same time could run in any order
+                schedule.append((schedule[-1][0] + random.randint(10, 50) if schedule else 0.0, "Input.insertText", {"text": filled_text}))
+            await self.dispatch_schedule(schedule)
+        else:
+            for char in typed_text:
+                await self._origin_type(text=char, delay=random.randint(delay - 50, delay + 50))
+            if filled_text:
+                await self._origin_insert_text(filled_text)
+        await self._page.timing.pause("after_type", "type")
+
+    def build_schedule(self, text: str, delay: int) -> List[Tuple[float, str, Dict[str, Any]]]:
+        """
+        Build the full timing schedule of typing a text up front.
+
+        Args:
+            text (str): The text to type.
+            delay (int): Average time (in ms) each key is held down.
+
+        Returns:
+            List[Tuple[float, str, Dict[str, Any]]]: The (offset in ms, CDP method, params) of every event.
+        """
+        schedule: List[Tuple[float, str, Dict[str, Any]]] = []
+        offset = 0.0
         for char in text:
-            await self._origin_type(text=char, delay=random.randint(delay - 50, delay + 50))
-        await self._page.wait_for_timeout(random.randint(4, 8) * 100)
+            presses, releases = key_events(char)
+            # Each key is held for the delay and released, then there is a short gap until the next key is pressed
+            hold = random.randint(delay - 50, delay + 50) if delay > 50 else max(delay, 1)
+            for i, (method, params) in enumerate(presses):
+                # Shift goes down shortly before the key, and up shortly after it
+                offset += random.randint(20, 60) if i else 0
+                schedule.append((offset, method, params))
+            offset += hold
+            for i, (method, params) in enumerate(releases):
+                offset += random.randint(20, 60) if i else 0
+                schedule.append((offset, method, params))
+            offset += random.randint(10, 50)
+        return schedule
+
+    async def dispatch_schedule(self, schedule: List[Tuple[float, str, Dict[str, Any]]]) -> None:
+        """
+        Stream a schedule of CDP events through the page's CDP session, sending each event at its offset without awaiting the events in between.
+
+        Args:
+            schedule (List[Tuple[float, str, Dict[str, Any]]]): The (offset in ms, CDP method, params) of every event, ordered by offset.
+
+        Returns:
+            None: Resolves once the last event has been acknowledged.
+        """
+        cdp = self._page.cdp
+        assert cdp, "Scheduled typing requires a CDP session on the page"
+        if not schedule:
+            return
+
+        loop = asyncio.get_running_loop()
+        dispatched: List[asyncio.Future[Dict[str, Any]]] = []
+        all_dispatched: asyncio.Future[None] = loop.create_future()
+
+        def dispatch(method: str, params: Dict[str, Any], last: bool) -> None:
+            dispatched.append(asyncio.ensure_future(cdp.send(method, params)))
+            if last and not all_dispatched.done():
+                all_dispatched.set_result(None)
+
+        start = loop.time()
+        timers = [loop.call_at(start + offset / 1000, dispatch, method, params, i == len(schedule) - 1) for i, (offset, method, params) in enumerate(schedule)]
+        try:
+            await all_dispatched
+        finally:
+            for timer in timers:
+                timer.cancel()
+        await asyncio.gather(*dispatched)
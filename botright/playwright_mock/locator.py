@@ -4,15 +4,17 @@ from typing import TYPE_CHECKING, Any, Literal, Optional, Pattern, Sequence, Uni
 
 # from undetected_playwright.async_api import Position, Locator as PlaywrightLocator, ElementHandle as PlaywrightElementHandle, Error as PlaywrightError
 from playwright.async_api import ElementHandle as PlaywrightElementHandle
-from playwright.async_api import Error as PlaywrightError
 from playwright.async_api import Locator as PlaywrightLocator
 from playwright.async_api import Position
 
+from .actionability import scroll_and_measure
+from .identity_map import IdentityMap
+
 if TYPE_CHECKING:
     from . import ElementHandle, FrameLocator, JSHandle, Page
 
 
-class Locator(PlaywrightLocator):
+class Locator(PlaywrightLocator, metaclass=IdentityMap):
     def __init__(self, locator: PlaywrightLocator, page: Page):
         super().__init__(locator)
         self._impl_obj = locator._impl_obj
@@ -130,26 +132,13 @@ class Locator(PlaywrightLocator):
             await self.wait_for(state="attached", timeout=timeout)
 
         if not trial:
-            bounding_box = await self.bounding_box()
-            if not bounding_box:
-                raise PlaywrightError("Element is not visible")
-
-            if self._page.scroll_into_view:
-                await self.scroll_into_view_if_needed(timeout=timeout)
-
-            if not await self.is_visible():
-                raise PlaywrightError("Element is outside of the viewport")
-
-            x, y, width, height = bounding_box["x"], bounding_box["y"], bounding_box["width"], bounding_box["height"]
-            if not any(position.values()):
-                x, y = x + width // 2, y + height // 2
-            else:
-                x, y = x + position["x"], y + position["y"]
+            box = await scroll_and_measure(self, self._page, position, timeout)
+            x, y, target_size = box["click_x"], box["click_y"], min(box["width"], box["height"])
 
             for modifier in modifiers:
                 await self._page.keyboard.down(modifier)
 
-            await self._page.mouse.click(x=int(x), y=y, button=button, click_count=click_count, delay=delay)
+            await self._page.mouse.click(x=int(x), y=y, button=button, click_count=click_count, delay=delay, target_size=target_size)
 
             for modifier in modifiers:
                 await self._page.keyboard.up(modifier)
@@ -172,26 +161,13 @@ class Locator(PlaywrightLocator):
             await self.wait_for(state="attached", timeout=timeout)
 
         if not trial:
-            bounding_box = await self.bounding_box()
-            if not bounding_box:
-                raise PlaywrightError("Element is not visible")
-
-            if self._page.scroll_into_view:
-                await self.scroll_into_view_if_needed(timeout=timeout)
-
-            if not await self.is_visible():
-                raise PlaywrightError("Element is outside of the viewport")
-
-            x, y, width, height = bounding_box["x"], bounding_box["y"], bounding_box["width"], bounding_box["height"]
-            if not any(position.values()):
-                x, y = x + width // 2, y + height // 2
-            else:
-                x, y = x + position["x"], y + position["y"]
+            box = await scroll_and_measure(self, self._page, position, timeout)
+            x, y, target_size = box["click_x"], box["click_y"], min(box["width"], box["height"])
 
             for modifier in modifiers:
                 await self._page.keyboard.down(modifier)
 
-            await self._page.mouse.dblclick(x, y, button=button, delay=delay)
+            await self._page.mouse.dblclick(x, y, button=button, delay=delay, target_size=target_size)
 
             for modifier in modifiers:
                 await self._page.keyboard.up(modifier)
@@ -208,23 +184,10 @@ class Locator(PlaywrightLocator):
             return
 
         if not trial:
-            bounding_box = await self.bounding_box()
-            if not bounding_box:
-                raise PlaywrightError("Element is not visible")
-
-            if self._page.scroll_into_view:
-                await self.scroll_into_view_if_needed(timeout=timeout)
-
-            if not await self.is_visible():
-                raise PlaywrightError("Element is outside of the viewport")
+            box = await scroll_and_measure(self, self._page, position, timeout)
+            x, y, target_size = box["click_x"], box["click_y"], min(box["width"], box["height"])
 
-            x, y, width, height = bounding_box["x"], bounding_box["y"], bounding_box["width"], bounding_box["height"]
-            if not any(position.values()):
-                x, y = x + width // 2, y + height // 2
-            else:
-                x, y = x + position["x"], y + position["y"]
-
-            await self._page.mouse.click(x, y, button="left", click_count=1, delay=20)
+            await self._page.mouse.click(x, y, button="left", click_count=1, delay=20, target_size=target_size)
 
             assert await self.is_checked()
 
@@ -240,23 +203,10 @@ class Locator(PlaywrightLocator):
             return
 
         if not trial:
-            bounding_box = await self.bounding_box()
-            if not bounding_box:
-                raise PlaywrightError("Element is not visible")
-
-            if self._page.scroll_into_view:
-                await self.scroll_into_view_if_needed(timeout=timeout)
-
-            if not await self.is_visible():
-                raise PlaywrightError("Element is outside of the viewport")
+            box = await scroll_and_measure(self, self._page, position, timeout)
+            x, y, target_size = box["click_x"], box["click_y"], min(box["width"], box["height"])
 
-            x, y, width, height = bounding_box["x"], bounding_box["y"], bounding_box["width"], bounding_box["height"]
-            if not any(position.values()):
-                x, y = x + width // 2, y + height // 2
-            else:
-                x, y = x + position["x"], y + position["y"]
-
-            await self._page.mouse.click(x, y, button="left", click_count=1, delay=20)
+            await self._page.mouse.click(x, y, button="left", click_count=1, delay=20, target_size=target_size)
 
             assert not await self.is_checked()
 
@@ -272,23 +222,10 @@ class Locator(PlaywrightLocator):
             return
 
         if not trial:
-            bounding_box = await self.bounding_box()
-            if not bounding_box:
-                raise PlaywrightError("Element is not visible")
-
-            if self._page.scroll_into_view:
-                await self.scroll_into_view_if_needed(timeout=timeout)
-
-            if not await self.is_visible():
-                raise PlaywrightError("Element is outside of the viewport")
+            box = await scroll_and_measure(self, self._page, position, timeout)
+            x, y, target_size = box["click_x"], box["click_y"], min(box["width"], box["height"])
 
-            x, y, width, height = bounding_box["x"], bounding_box["y"], bounding_box["width"], bounding_box["height"]
-            if not any(position.values()):
-                x, y = x + width // 2, y + height // 2
-            else:
-                x, y = x + position["x"], y + position["y"]
-
-            await self._page.mouse.click(x, y, button="left", click_count=1, delay=20)
+            await self._page.mouse.click(x, y, button="left", click_count=1, delay=20, target_size=target_size)
 
             assert await self.is_checked() == checked
 
@@ -308,45 +245,20 @@ class Locator(PlaywrightLocator):
             await self.wait_for(state="attached", timeout=timeout)
 
         if not trial:
-            bounding_box = await self.bounding_box()
-            if not bounding_box:
-                raise PlaywrightError("Element is not visible")
-
-            if self._page.scroll_into_view:
-                await self.scroll_into_view_if_needed(timeout=timeout)
-
-            if not await self.is_visible():
-                raise PlaywrightError("Element is outside of the viewport")
-
-            x, y, width, height = bounding_box["x"], bounding_box["y"], bounding_box["width"], bounding_box["height"]
-            if not any(position.values()):
-                x, y = x + width // 2, y + height // 2
-            else:
-                x, y = x + position["x"], y + position["y"]
+            box = await scroll_and_measure(self, self._page, position, timeout)
+            x, y, target_size = box["click_x"], box["click_y"], min(box["width"], box["height"])
 
             for modifier in modifiers:
                 await self._page.keyboard.down(modifier)
 
-            await self._page.mouse.move(x, y)
+            await self._page.mouse.move(x, y, target_size=target_size)
 
             for modifier in modifiers:
                 await self._page.keyboard.up(modifier)
 
     async def type(self, text: str, delay: Optional[float] = 200.0, no_wait_after: Optional[bool] = False, timeout: Optional[float] = None) -> None:
-        await self.wait_for(state="attached", timeout=timeout)
-
-        bounding_box = await self.bounding_box()
-        if not bounding_box:
-            raise PlaywrightError("Element is not visible")
-
-        if self._page.scroll_into_view:
-            await self.scroll_into_view_if_needed(timeout=timeout)
-
-        x, y, width, height = bounding_box["x"], bounding_box["y"], bounding_box["width"], bounding_box["height"]
-
-        x, y = x + width // 2, y + height // 2
-
-        await self.click(delay=delay)
+        # Clicking already waits for the element, checks its actionability and scrolls it into view
+        await self.click(delay=delay, timeout=timeout)
 
         await self._page.keyboard.type(text, delay=delay)
 
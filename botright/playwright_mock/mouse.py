@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import math
-import random
-from typing import TYPE_CHECKING, Any, List, Literal, NoReturn, Optional, Tuple, Union
+import threading
+import weakref
+from collections import deque
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Literal, NoReturn, Optional, Sequence, Set, Tuple, Union
 
 # fmt: off
 import numpy as np
@@ -17,17 +21,68 @@ if TYPE_CHECKING:
 
 # From https://github.com/riflosnake/HumanCursor/blob/main/humancursor/utilities/human_curve_generator.py
 class HumanizeMouseTrajectory:
-    def __init__(self, from_point: Tuple[int, int], to_point: Tuple[int, int]) -> None:
+    # Amount of points the trajectory used to be tweened to, regardless of distance
+    legacy_points_count = 100
+    # Fitts' law constants (in ms): movement_time = a + b * log2(distance / target_size + 1)
+    fitts_a: float = 100.0
+    fitts_b: float = 150.0
+    # Time (in ms) between two mousemove events of a real mouse (60Hz)
+    event_interval: float = 1000 / 60
+    default_target_size: float = 24.0
+
+    def __init__(self, from_point: Tuple[int, int], to_point: Tuple[int, int], path: Optional[np.ndarray] = None, target_size: Optional[float] = None) -> None:
         self.from_point = from_point
         self.to_point = to_point
-        self.points = self.generate_curve()
+        self.target_size = target_size or self.default_target_size
+        self.points = self.generate_curve(path)
+        self.events_saved = self.legacy_points_count - len(self.points)
 
-    def easeOutQuad(self, n: float) -> float:
-        if not 0.0 <= n <= 1.0:
+    def easeOutQuad(self, n: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        if np.any(n < 0.0) or np.any(n > 1.0):
             raise ValueError("Argument must be between 0.0 and 1.0.")
         return -n * (n - 2)
 
-    def generate_curve(self) -> List[Tuple[int, int]]:
+    def generate_curve(self, path: Optional[np.ndarray] = None) -> List[Tuple[int, int]]:
+        """Samples the given (or a newly generated) humanized path into the final points of the trajectory"""
+        if path is None:
+            path = self.generate_path()
+
+        distance = math.dist(self.from_point, self.to_point)
+        points = self.sample_points(path, self.fitts_points_count(distance, self.target_size))
+        points = self.remove_duplicate_points(points)
+        return [(x, y) for x, y in points.tolist()]
+
+    def fitts_points_count(self, distance: float, target_size: float) -> int:
+        """Calculates the amount of points of the trajectory from the Fitts' law movement time to a target of the given size"""
+        movement_time = self.fitts_a + self.fitts_b * math.log2(distance / max(target_size, 1.0) + 1)
+        return int(min(max(round(movement_time / self.event_interval), 2), self.legacy_points_count))
+
+    def sample_points(self, points: np.ndarray, target_points: int) -> Union[np.ndarray, NoReturn]:
+        """Samples points along the path with a minimum-jerk velocity profile (smooth acceleration and deceleration)"""
+        if not self.check_if_list_of_points(points):
+            raise ValueError("List of points not valid")
+        if not isinstance(target_points, int) or target_points < 2:
+            raise ValueError("target_points must be an integer greater or equal to 2")
+
+        points = np.asarray(points, dtype=np.float64)
+        arc_length = np.concatenate(([0.0], np.cumsum(np.hypot(*np.diff(points, axis=0).T))))
+        if arc_length[-1] == 0:
+            return points[[0, -1]]
+
+        t = np.linspace(0.0, 1.0, target_points)
+        progress = (10 * t**3 - 15 * t**4 + 6 * t**5) * arc_length[-1]
+        return np.column_stack((np.interp(progress, arc_length, points[:, 0]), np.interp(progress, arc_length, points[:, 1])))
+
+    def remove_duplicate_points(self, points: np.ndarray) -> np.ndarray:
+        """Rounds the points to whole pixels and collapses consecutive duplicates, as moving to the same pixel again is a wasted event"""
+        rounded: np.ndarray = np.rint(points)
+        keep = np.ones(len(rounded), dtype=bool)
+        keep[1:] = np.any(np.diff(rounded, axis=0) != 0, axis=1)
+        self.duplicates_removed = int(len(rounded) - keep.sum())
+        deduplicated: np.ndarray = rounded[keep]
+        return deduplicated
+
+    def generate_path(self) -> np.ndarray:
         """Generates the curve based on arguments below, default values below are automatically modified to cause randomness"""
         left_boundary = min(self.from_point[0], self.to_point[0]) - 80
         right_boundary = max(self.from_point[0], self.to_point[0]) + 80
@@ -37,7 +92,6 @@ class HumanizeMouseTrajectory:
         internalKnots = self.generate_internal_knots(left_boundary, right_boundary, down_boundary, up_boundary, 2)
         points = self.generate_points(internalKnots)
         points = self.distort_points(points, 1, 1, 0.5)
-        points = self.tween_points(points, 100)
         return points
 
     def generate_internal_knots(
@@ -53,13 +107,13 @@ class HumanizeMouseTrajectory:
         if d_boundary > u_boundary:
             raise ValueError("down_boundary must be less than or equal to upper_boundary")
 
-        knotsX = np.random.choice(range(int(l_boundary), int(r_boundary)), size=knots_count)
-        knotsY = np.random.choice(range(int(d_boundary), int(u_boundary)), size=knots_count)
+        knotsX = np.random.randint(int(l_boundary), int(r_boundary), size=knots_count)
+        knotsY = np.random.randint(int(d_boundary), int(u_boundary), size=knots_count)
 
         knots = list(zip(knotsX, knotsY))
         return knots
 
-    def generate_points(self, knots: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    def generate_points(self, knots: List[Tuple[int, int]]) -> np.ndarray:
         """Generates the points from BezierCalculator"""
         if not self.check_if_list_of_points(knots):
             raise ValueError("knots must be valid list of points")
@@ -70,9 +124,9 @@ class HumanizeMouseTrajectory:
             2,
         )
         knots = [self.from_point] + knots + [self.to_point]
-        return BezierCalculator.calculate_points_in_curve(int(midPtsCnt), knots)
+        return BezierCalculator.calculate_curve(int(midPtsCnt), knots)
 
-    def distort_points(self, points: List[Tuple[int, int]], distortion_mean: int, distortion_st_dev: int, distortion_frequency: float) -> Union[List[Tuple[int, int]], NoReturn]:
+    def distort_points(self, points: np.ndarray, distortion_mean: int, distortion_st_dev: int, distortion_frequency: float) -> Union[np.ndarray, NoReturn]:
         """Distorts points by parameters of mean, standard deviation and frequency"""
         if not (self.check_if_numeric(distortion_mean) and self.check_if_numeric(distortion_st_dev) and self.check_if_numeric(distortion_frequency)):
             raise ValueError("Distortions must be numeric")
@@ -81,34 +135,35 @@ class HumanizeMouseTrajectory:
         if not (0 <= distortion_frequency <= 1):
             raise ValueError("distortion_frequency must be in range [0,1]")
 
-        distorted: List[Tuple[int, int]] = []
-        for i in range(1, len(points) - 1):
-            x, y = points[i]
-            delta = int(np.random.normal(distortion_mean, distortion_st_dev) if random.random() < distortion_frequency else 0)
-            distorted.append((x, y + delta))
-        distorted = [points[0]] + distorted + [points[-1]]
+        distorted = np.array(points, dtype=np.float64)
+        inner_count = max(len(distorted) - 2, 0)
+        # Only inner points get distorted, start and end point stay the same
+        deltas = np.random.normal(distortion_mean, distortion_st_dev, size=inner_count).astype(np.int64)
+        deltas[np.random.random(size=inner_count) >= distortion_frequency] = 0
+        distorted[1:-1, 1] += deltas
         return distorted
 
-    def tween_points(self, points: List[Tuple[int, int]], target_points: int) -> Union[List[Tuple[int, int]], NoReturn]:
+    def tween_points(self, points: np.ndarray, target_points: int) -> Union[np.ndarray, NoReturn]:
         """Modifies points by tween"""
         if not self.check_if_list_of_points(points):
             raise ValueError("List of points not valid")
         if not isinstance(target_points, int) or target_points < 2:
             raise ValueError("target_points must be an integer greater or equal to 2")
 
-        res: List[Tuple[int, int]] = []
-        for i in range(target_points):
-            index = int(self.easeOutQuad(float(i) / (target_points - 1)) * (len(points) - 1))
-            res += (points[index],)
-        return res
+        points = np.asarray(points, dtype=np.float64)
+        indices = (np.asarray(self.easeOutQuad(np.arange(target_points) / (target_points - 1))) * (len(points) - 1)).astype(np.int64)
+        return points[indices]
 
     @staticmethod
     def check_if_numeric(val: Any) -> bool:
         """Checks if value is proper numeric value"""
         return isinstance(val, (float, int, np.integer, np.float32, np.float64))
 
-    def check_if_list_of_points(self, list_of_points: List[Tuple[int, int]]) -> bool:
+    def check_if_list_of_points(self, list_of_points: Union[List[Tuple[int, int]], np.ndarray]) -> bool:
         """Checks if list of points is valid"""
+        if isinstance(list_of_points, np.ndarray):
+            return list_of_points.ndim == 2 and list_of_points.shape[1] == 2 and np.issubdtype(list_of_points.dtype, np.number)
+
         try:
 
             def point(p):
@@ -121,50 +176,234 @@ class HumanizeMouseTrajectory:
 
 class BezierCalculator:
     @staticmethod
-    def binomial(n: int, k: int):
+    def binomial(n: int, k: int) -> float:
         """Returns the binomial coefficient "n choose k" """
-        return math.factorial(n) / float(math.factorial(k) * math.factorial(n - k))
+        return float(math.comb(n, k))
 
     @staticmethod
-    def bernstein_polynomial_point(x: int, i: int, n: int):
+    @lru_cache(maxsize=None)
+    def binomial_coefficients(n: int) -> np.ndarray:
+        """Returns all binomial coefficients "n choose k" for k in [0, n]"""
+        coefficients = np.array([math.comb(n, k) for k in range(n + 1)], dtype=np.float64)
+        coefficients.setflags(write=False)
+        return coefficients
+
+    @staticmethod
+    def bernstein_polynomial_point(x: float, i: int, n: int) -> float:
         """Calculate the i-th component of a bernstein polynomial of degree n"""
         return BezierCalculator.binomial(n, i) * (x**i) * ((1 - x) ** (n - i))
 
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def bernstein_basis(n: int, degree: int) -> np.ndarray:
+        """
+        Returns the (n, degree + 1) Bernstein basis matrix for n evenly spaced t values in [0, 1].
+        Multiplying it with the (degree + 1, 2) control points yields all n points of the curve at once.
+        """
+        t = np.linspace(0.0, 1.0, n)[:, np.newaxis]
+        i = np.arange(degree + 1)
+        basis = BezierCalculator.binomial_coefficients(degree) * (t**i) * ((1 - t) ** (degree - i))
+        basis.setflags(write=False)
+        return basis
+
     @staticmethod
     def bernstein_polynomial(points: List[Tuple[int, int]]):
         """
         Given list of control points, returns a function, which given a point [0,1] returns
         a point in the Bezier described by these points
         """
+        control_points = np.asarray(points, dtype=np.float64)
+        degree = len(control_points) - 1
 
         def bernstein(t):
-            n = len(points) - 1
-            x = y = 0
-            for i, point in enumerate(points):
-                bern = BezierCalculator.bernstein_polynomial_point(t, i, n)
-                x += point[0] * bern
-                y += point[1] * bern
-            return x, y
+            i = np.arange(degree + 1)
+            bern = BezierCalculator.binomial_coefficients(degree) * (t**i) * ((1 - t) ** (degree - i))
+            x, y = bern @ control_points
+            return float(x), float(y)
 
         return bernstein
 
+    @staticmethod
+    def calculate_curve(n: int, points: Union[List[Tuple[int, int]], np.ndarray]) -> np.ndarray:
+        """
+        Given list of control points, returns n points in the Bézier curve as a (n, 2) array,
+        described by these points
+        """
+        control_points = np.asarray(points, dtype=np.float64)
+        basis = BezierCalculator.bernstein_basis(n, len(control_points) - 1)
+        return basis @ control_points
+
     @staticmethod
     def calculate_points_in_curve(n: int, points: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
         """
         Given list of control points, returns n points in the Bézier curve,
         described by these points
         """
-        curvePoints: List[Tuple[int, int]] = []
-        bernstein_polynomial = BezierCalculator.bernstein_polynomial(points)
-        for i in range(n):
-            t = i / (n - 1)
-            curvePoints += (bernstein_polynomial(t),)
-        return curvePoints
+        return [(x, y) for x, y in BezierCalculator.calculate_curve(n, points).tolist()]
+
+
+class TrajectoryPool:
+    def __init__(self, paths_per_bucket: int = 4, distance_buckets: int = 9, angle_buckets: int = 8, min_distance: int = 8) -> None:
+        """
+        Pool of pre-generated humanized paths, refilled by a background worker thread.
+
+        Paths are stored normalized (starting at (0, 0) and ending at (1, 0)) and bucketed by distance and angle,
+        so a pooled path only has to be rotated, scaled and translated to the real start and end point.
+        Every path is only handed out once, so the distribution of the trajectories stays random.
+
+        Args:
+            paths_per_bucket (int): How many paths to keep ready per bucket. Defaults to 4.
+            distance_buckets (int): Number of logarithmic distance buckets, starting at min_distance. Defaults to 9.
+            angle_buckets (int): Number of angle buckets the full circle is split into. Defaults to 8.
+            min_distance (int): Moves shorter than this are not pooled, as they are cheap to generate. Defaults to 8.
+        """
+        self.paths_per_bucket = paths_per_bucket
+        self.distance_buckets = distance_buckets
+        self.angle_buckets = angle_buckets
+        self.min_distance = min_distance
+        self.enabled = True
+
+        self.hits = 0
+        self.misses = 0
+
+        self._buckets: Dict[Tuple[int, int], Deque[np.ndarray]] = {(distance_bucket, angle_bucket): deque() for distance_bucket in range(distance_buckets) for angle_bucket in range(angle_buckets)}
+        self._refill_event = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    def _bucket(self, distance: float, angle: float) -> Tuple[int, int]:
+        distance_bucket = min(int(math.log2(distance / self.min_distance)), self.distance_buckets - 1)
+        angle_bucket = int((angle % (2 * math.pi)) / (2 * math.pi) * self.angle_buckets) % self.angle_buckets
+        return distance_bucket, angle_bucket
+
+    def _generate_normalized_path(self, distance_bucket: int, angle_bucket: int) -> np.ndarray:
+        # Generating a path for the geometric center of the bucket
+        distance = self.min_distance * 2 ** (distance_bucket + 0.5)
+        angle = (angle_bucket + 0.5) / self.angle_buckets * 2 * math.pi
+        to_point = (int(round(distance * math.cos(angle))), int(round(distance * math.sin(angle))))
+        path = HumanizeMouseTrajectory.__new__(HumanizeMouseTrajectory)
+        path.from_point, path.to_point = (0, 0), to_point
+        points = path.generate_path()
+
+        # Rotating the end point onto the x-axis and scaling it to (1, 0)
+        cos, sin = math.cos(-math.atan2(to_point[1], to_point[0])), math.sin(-math.atan2(to_point[1], to_point[0]))
+        rotation = np.array([[cos, sin], [-sin, cos]])
+        normalized: np.ndarray = (points @ rotation) / math.hypot(*to_point)
+        return normalized
+
+    def _fill(self) -> None:
+        while True:
+            self._refill_event.clear()
+            for (distance_bucket, angle_bucket), paths in self._buckets.items():
+                while len(paths) < self.paths_per_bucket:
+                    paths.append(self._generate_normalized_path(distance_bucket, angle_bucket))
+            self._refill_event.wait()
+
+    def start(self) -> None:
+        """Starts the background worker thread filling the pool, if it isnt running yet."""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._fill, name="botright-trajectory-pool", daemon=True)
+            self._worker.start()
+
+    def get_path(self, from_point: Tuple[int, int], to_point: Tuple[int, int]) -> Optional[np.ndarray]:
+        """
+        Get a pooled humanized path transformed to start at from_point and end at to_point.
+
+        Args:
+            from_point (Tuple[int, int]): The start point of the path.
+            to_point (Tuple[int, int]): The end point of the path.
+
+        Returns:
+            Optional[np.ndarray]: The transformed path, or None if the move isnt pooled or the bucket is empty.
+        """
+        dx, dy = to_point[0] - from_point[0], to_point[1] - from_point[1]
+        distance = math.hypot(dx, dy)
+        if not self.enabled or distance < self.min_distance:
+            return None
+
+        self.start()
+        angle = math.atan2(dy, dx)
+        paths = self._buckets[self._bucket(distance, angle)]
+        try:
+            normalized = paths.popleft()
+        except IndexError:
+            self.misses += 1
+            return None
+        finally:
+            # Waking up the worker only once a bucket is half empty, so it refills in batches
+            if len(paths) <= self.paths_per_bucket // 2:
+                self._refill_event.set()
+        self.hits += 1
+
+        # Rotating, scaling and translating the normalized path onto the real start and end point
+        cos, sin = math.cos(angle), math.sin(angle)
+        transformation = np.array([[cos, sin], [-sin, cos]]) * distance
+        path: np.ndarray = normalized @ transformation + from_point
+        path[0], path[-1] = from_point, to_point
+        return path
+
+    def get_trajectory(self, from_point: Tuple[int, int], to_point: Tuple[int, int], target_size: Optional[float] = None) -> HumanizeMouseTrajectory:
+        """
+        Get a humanized trajectory, built from a pooled path if one is available.
+
+        Args:
+            from_point (Tuple[int, int]): The start point of the trajectory.
+            to_point (Tuple[int, int]): The end point of the trajectory.
+            target_size (Optional[float]): The size of the target (in px) the trajectory moves to. Defaults to None.
+
+        Returns:
+            HumanizeMouseTrajectory: The humanized trajectory.
+        """
+        return HumanizeMouseTrajectory(from_point, to_point, path=self.get_path(from_point, to_point), target_size=target_size)
+
+
+trajectory_pool = TrajectoryPool()
+
+
+class TrajectoryStats:
+    def __init__(self) -> None:
+        """Counters of the mouse events sent for humanized moves, compared to the fixed 100 points trajectories."""
+        self.moves = 0
+        self.events = 0
+        self.events_saved = 0
+        self.duplicates_removed = 0
+
+    def record(self, trajectory: HumanizeMouseTrajectory) -> None:
+        self.moves += 1
+        self.events += len(trajectory.points)
+        self.events_saved += trajectory.events_saved
+        self.duplicates_removed += trajectory.duplicates_removed
+
+    @property
+    def events_saved_per_move(self) -> float:
+        return self.events_saved / self.moves if self.moves else 0.0
+
+    def reset(self) -> None:
+        self.moves = 0
+        self.events = 0
+        self.events_saved = 0
+        self.duplicates_removed = 0
+
+
+trajectory_stats = TrajectoryStats()
+
+
+class CursorState:
+    def __init__(self) -> None:
+        """The real cursor position and pressed buttons of one underlying Playwright page."""
+        self.x: float = 0
+        self.y: float = 0
+        self.pressed_buttons: Set[str] = set()
+
+
+# Keyed by the Playwright page implementation, so every Mouse wrapper of the same page shares one cursor
+cursor_states: weakref.WeakKeyDictionary[Any, CursorState] = weakref.WeakKeyDictionary()
 
 
 class Mouse(PlaywrightMouse):
-    last_x: int = 0
-    last_y: int = 0
+    # Dispatching whole trajectories as one pipelined batch of CDP events (if the page has a CDP session)
+    pipelined: bool = True
+    # Optional time (in ms) between two dispatched trajectory events
+    event_interval: Optional[float] = None
 
     def __init__(self, mouse: PlaywrightMouse, page: Page):
         super().__init__(mouse)
@@ -173,10 +412,30 @@ class Mouse(PlaywrightMouse):
         self._mouse = mouse
 
         self._origin_move = mouse.move
+        self._origin_down = mouse.down
+        self._origin_up = mouse.up
         self._origin_dblclick = mouse.dblclick
 
-        self.last_x = 0
-        self.last_y = 0
+        if page._impl_obj not in cursor_states:
+            cursor_states[page._impl_obj] = CursorState()
+        self._cursor = cursor_states[page._impl_obj]
+        self._pressed_buttons = self._cursor.pressed_buttons
+
+    @property
+    def last_x(self) -> float:
+        return self._cursor.x
+
+    @last_x.setter
+    def last_x(self, value: float) -> None:
+        self._cursor.x = value
+
+    @property
+    def last_y(self) -> float:
+        return self._cursor.y
+
+    @last_y.setter
+    def last_y(self, value: float) -> None:
+        self._cursor.y = value
 
     async def click(
         self,
@@ -186,28 +445,39 @@ class Mouse(PlaywrightMouse):
         click_count: Optional[int] = 1,
         delay: Optional[float] = 20.0,
         humanly: Optional[bool] = True,
+        target_size: Optional[float] = None,
     ) -> None:
         delay = delay or 20.0
+        timing = self._page.timing
+        timing.action("click")
         # Move mouse humanly to the Coordinates and wait some random time
-        await self.move(x, y)  # , humanly
-        await self._page.wait_for_timeout(random.randint(4, 8) * 50)
+        await self.move(x, y, target_size=target_size)  # , humanly
+        await timing.pause("after_move", "click")
 
         # Clicking the Coordinates
         await self.down(button=button, click_count=click_count)
         # Waiting as delay
-        await self._page.wait_for_timeout(delay)
+        await timing.sleep(delay, "click")
         await self.up(button=button, click_count=click_count)
 
         # Waiting random time
-        await self._page.wait_for_timeout(random.randint(4, 8) * 50)
+        await timing.pause("after_click", "click")
 
     async def dblclick(
-        self, x: Union[int, float], y: Union[int, float], button: Optional[Literal["left", "middle", "right"]] = "left", delay: Optional[float] = 20.0, humanly: Optional[bool] = True
+        self,
+        x: Union[int, float],
+        y: Union[int, float],
+        button: Optional[Literal["left", "middle", "right"]] = "left",
+        delay: Optional[float] = 20.0,
+        humanly: Optional[bool] = True,
+        target_size: Optional[float] = None,
     ) -> None:
         delay = delay or 20.0
+        timing = self._page.timing
+        timing.action("dblclick")
         # Move mouse humanly to the Coordinates and wait some random time
-        await self.move(x, y, humanly)
-        await self._page.wait_for_timeout(random.randint(4, 8) * 50)
+        await self.move(x, y, humanly=humanly, target_size=target_size)
+        await timing.pause("after_move", "dblclick")
 
         # Clicking the Coordinates
         # await self.down(button=button)
@@ -222,27 +492,69 @@ class Mouse(PlaywrightMouse):
         # # Waiting as delay
         # await self._page.wait_for_timeout(delay)
         # await self.up(button=button)
-        await self._origin_dblclick(x, y, button=button, delay=random.randint(8, 14) * 10)
+        await self._origin_dblclick(x, y, button=button, delay=timing.jitter("dblclick_delay"))
 
         # Waiting random time
-        await self._page.wait_for_timeout(random.randint(4, 8) * 50)
+        await timing.pause("after_click", "dblclick")
+
+    async def down(self, button: Optional[Literal["left", "middle", "right"]] = None, click_count: Optional[int] = None) -> None:
+        await self._origin_down(button=button, click_count=click_count)
+        self._pressed_buttons.add(button or "left")
+
+    async def up(self, button: Optional[Literal["left", "middle", "right"]] = None, click_count: Optional[int] = None) -> None:
+        await self._origin_up(button=button, click_count=click_count)
+        self._pressed_buttons.discard(button or "left")
 
-    async def move(self, x: Union[int, float], y: Union[int, float], steps: Optional[int] = 1, humanly: Optional[bool] = True, sex=False) -> None:
+    async def move(self, x: Union[int, float], y: Union[int, float], steps: Optional[int] = 1, humanly: Optional[bool] = True, sex=False, target_size: Optional[float] = None) -> None:
         # If you want to move in a straight line
         if not humanly:
             await self._origin_move(x=x, y=y, steps=steps)
+            self.last_x, self.last_y = x, y
             return
 
         if x == self.last_x and y == self.last_y:
-            await self._page.wait_for_timeout(random.randint(1, 10))
+            self._page.timing.action("move")
+            await self._page.timing.pause("same_position", "move")
             return
 
-        humanized_points = HumanizeMouseTrajectory((int(self.last_x), int(self.last_y)), (int(x), int(y)))
+        humanized_points = trajectory_pool.get_trajectory((int(self.last_x), int(self.last_y)), (int(x), int(y)), target_size=target_size)
+        trajectory_stats.record(humanized_points)
 
         # Move Mouse to new random locations
-        for x, y in humanized_points.points:
-            await self._origin_move(x=x, y=y)
-            # await page.wait_for_timeout(random.randint(1, 5))
+        if self.pipelined and self._page.cdp:
+            await self.dispatch_trajectory(humanized_points.points, interval=self.event_interval)
+        else:
+            for x, y in humanized_points.points:
+                await self._origin_move(x=x, y=y)
+                # await page.wait_for_timeout(random.randint(1, 5))
 
         # Set LastX and LastY cause Playwright does not have mouse.current_location
         self.last_x, self.last_y = humanized_points.points[-1]
+
+    async def dispatch_trajectory(self, points: Sequence[Tuple[float, float]], interval: Optional[float] = None) -> None:
+        """
+        Dispatch all points of a trajectory back to back as CDP mouseMoved events on the page's CDP session, without awaiting each of them.
+        The last point is moved to with Playwright, so its own mouse position (used for down/up/click) stays in sync.
+
+        Args:
+            points (Sequence[Tuple[float, float]]): The points of the trajectory.
+            interval (Optional[float]): Time (in ms) to wait between dispatching two events. Defaults to None (no waiting).
+
+        Returns:
+            None: Resolves once the last event has been acknowledged.
+        """
+        assert self._page.cdp, "Pipelined mouse movement requires a CDP session on the page"
+
+        button_bits = {"left": 1, "right": 2, "middle": 4}
+        button = next(iter(self._pressed_buttons), "none")
+        buttons = sum(button_bits[pressed] for pressed in self._pressed_buttons)
+
+        dispatched = []
+        for x, y in points[:-1]:
+            event = {"type": "mouseMoved", "x": x, "y": y, "button": button, "buttons": buttons}
+            dispatched.append(asyncio.ensure_future(self._page.cdp.send("Input.dispatchMouseEvent", event)))
+            if interval:
+                await asyncio.sleep(interval / 1000)
+
+        await asyncio.gather(*dispatched)
+        await self._origin_move(x=points[-1][0], y=points[-1][1])
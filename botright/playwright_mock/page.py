@@ -3,7 +3,7 @@ from __future__ import annotations
 import inspect
 from pathlib import Path
 from re import Pattern
-from typing import TYPE_CHECKING, Any, Callable, List, Literal, Optional, Sequence, TypedDict, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Literal, Optional, Sequence, TypedDict, Union
 
 # fmt: off
 from playwright._impl._async_base import AsyncEventContextManager
@@ -36,12 +36,16 @@ from recognizer.agents.playwright import AsyncChallenger
 
 from botright.modules import Faker, hcaptcha  # , geetest
 
+from .identity_map import IdentityMap
+from .interception import FetchInterceptor, InterceptedRequest
+
 # fmt: on
 
 if TYPE_CHECKING:
     from .browser import BrowserContext
 
 from . import ElementHandle, Frame, FrameLocator, JSHandle, Keyboard, Locator, Mouse, Request, Route
+from .timing import HumanTiming
 
 mapping = ImplToApiMapping()
 
@@ -74,7 +78,7 @@ async def new_page(browser: BrowserContext, faker: Faker) -> Page:
     return page
 
 
-class Page(PlaywrightPage):
+class Page(PlaywrightPage, metaclass=IdentityMap):
     def __init__(self, page: PlaywrightPage, browser: BrowserContext, faker: Faker):
         super().__init__(page)
         self._impl_obj = page._impl_obj
@@ -85,6 +89,7 @@ class Page(PlaywrightPage):
         self.faker = faker
         self.fingerprint = faker.fingerprint
         self.scroll_into_view: Optional[bool] = browser.scroll_into_view
+        self.timing = HumanTiming(self, sync_with_page=browser.sync_timing)
         self._main_frame = page.main_frame
 
         # Objects
@@ -97,8 +102,7 @@ class Page(PlaywrightPage):
         else:
             self._keyboard = Keyboard(page.keyboard, self)
         self.cdp: Optional[PlaywrightCDPSession] = None
-        self.hcaptcha_solver = hcaptcha.hCaptcha(browser, self)
-        self.recaptcha_solver = AsyncChallenger(self)
+        self.interceptor: Optional[FetchInterceptor] = None
 
         # Aliases
         self._origin_close = page.close
@@ -162,6 +166,11 @@ class Page(PlaywrightPage):
     async def _mock_page(self):
         # Opening CDP Session
         self.cdp = await self.browser.new_cdp_session(self)
+        if self.browser.blocker:
+            await self.browser.blocker.attach(self)
+        await self.browser.bandwidth.attach(self)
+        if self.browser.forwarder and self.browser.proxy.timezone != self.browser.timezone_id:
+            await self._emulate_proxy_timezone()
 
         nav_hints_platforms = {"Windows": "Win32", "macOS": "MacIntel", "Linux": "Linux x86_64"}
 
@@ -209,6 +218,34 @@ class Page(PlaywrightPage):
                 'document.addEventListener("mouseup",e=>{t.beginPath(),t.arc(e.clientX,e.clientY,9,0,360,!1),t.fillStyle="blue",t.fill(),t.closePath()})});'
             )
 
+    async def _emulate_proxy_timezone(self) -> None:
+        # Pages of browsers whose proxy got rotated follow the timezone of the current proxy
+        if self.cdp and self.browser.proxy.timezone:
+            await self.cdp.send("Emulation.setTimezoneOverride", {"timezoneId": self.browser.proxy.timezone})
+
+    @property
+    def _solvers(self) -> Dict[str, Any]:
+        # Solvers are cached on the underlying page, like the wrappers themselves (see IdentityMap)
+        solvers: Optional[Dict[str, Any]] = getattr(self._impl_obj, "_botright_solvers", None)
+        if solvers is None:
+            solvers = {}
+            setattr(self._impl_obj, "_botright_solvers", solvers)
+        return solvers
+
+    @property
+    def hcaptcha_solver(self) -> hcaptcha.hCaptcha:
+        if "hcaptcha" not in self._solvers:
+            self._solvers["hcaptcha"] = hcaptcha.hCaptcha(self.browser, self)
+        solver: hcaptcha.hCaptcha = self._solvers["hcaptcha"]
+        return solver
+
+    @property
+    def recaptcha_solver(self) -> AsyncChallenger:
+        if "recaptcha" not in self._solvers:
+            self._solvers["recaptcha"] = AsyncChallenger(self)
+        solver: AsyncChallenger = self._solvers["recaptcha"]
+        return solver
+
     async def solve_hcaptcha(self, rq_data: Optional[str] = None) -> Optional[str]:
         """
         Mocks solving an hCaptcha challenge on a page.
@@ -461,6 +498,7 @@ class Page(PlaywrightPage):
                     user_action_layer=self.browser.user_action_layer,
                     scroll_into_view=self.scroll_into_view,
                     mask_fingerprint=self.browser.mask_fingerprint,
+                    sync_timing=self.browser.sync_timing,
                 )
                 source["page"] = Page(_page, self.browser, self.faker)
                 source["frame"] = Frame(_frame, self)
@@ -490,6 +528,7 @@ class Page(PlaywrightPage):
                     user_action_layer=self.browser.user_action_layer,
                     scroll_into_view=self.scroll_into_view,
                     mask_fingerprint=self.browser.mask_fingerprint,
+                    sync_timing=self.browser.sync_timing,
                 )
                 source["page"] = Page(_page, self.browser, self.faker)
                 source["frame"] = Frame(_frame, self)
@@ -499,24 +538,61 @@ class Page(PlaywrightPage):
             await self._origin_expose_binding(name=name, callback=callback_proxy, handle=handle)
 
     async def route(
-        self, url: Union[str, Pattern[str], Callable[[str], bool]], handler: Union[Callable[[Route], Any], Callable[[PlaywrightRoute, PlaywrightRequest], Any]], times: Optional[int] = None
+        self,
+        url: Union[str, Pattern[str], Callable[[str], bool]],
+        handler: Union[Callable[[Route], Any], Callable[[PlaywrightRoute, PlaywrightRequest], Any]],
+        times: Optional[int] = None,
+        raw: Optional[bool] = False,
     ):
+        """
+        Args:
+            url (Union[str, Pattern[str], Callable[[str], bool]]): A glob pattern, regex pattern or predicate receiving the URL to match while routing.
+            handler (Union[Callable[[Route], Any], Callable[[Route, Request], Any]]): Handler function to route the request.
+            times (Optional[int]): How often a route should be used. By default it will be used every time.
+            raw (Optional[bool]): Pass the raw Playwright Route and Request to the handler, skipping Botright's wrappers. Defaults to False.
+        """
+        if raw:
+            await self._origin_route(url=url, handler=handler, times=times)  # type: ignore
+            return
+
         if len(inspect.signature(handler).parameters) == 2:  # Checking how many parameters the callable expects
 
             def handler_proxy(route: PlaywrightRoute, request: PlaywrightRequest):
-                route = Route(route, Page(self, self.browser, self.faker))
-                request = Request(request, Page(self, self.browser, self.faker))
+                route = Route(route, self)
+                request = Request(request, self)
                 return handler(route, request)  # type: ignore
 
             await self._origin_route(url=url, handler=handler_proxy, times=times)
         else:
 
             def handler_proxy_no_request(route: PlaywrightRoute):
-                route = Route(route, Page(self, self.browser, self.faker))
+                route = Route(route, self)
                 return handler(route)  # type: ignore
 
             await self._origin_route(url=url, handler=handler_proxy_no_request, times=times)
 
+    async def intercept(self, url: str, handler: Callable[[InterceptedRequest], Any], resource_type: Optional[str] = None) -> None:
+        """
+        Intercept requests through the Fetch domain of the page's CDP session, as a faster alternative to route.
+
+        The browser only pauses requests matching the URL pattern and resource type, so other requests never reach Python.
+        Requests of other targets, like out-of-process iframes and workers, aren't intercepted. Unhandled requests fall back to handlers registered earlier and get continued otherwise.
+
+        Args:
+            url (str): A CDP URL pattern, where "*" matches any characters and "?" a single one, e.g. "*://*.example.com/*".
+            handler (Callable[[InterceptedRequest], Any]): Handler function, which fulfills, continues or fails the request.
+            resource_type (str, optional): Only intercept requests of this resource type, e.g. "image" or "xhr". Defaults to None (all).
+        """
+        if self.interceptor is None:
+            if self.cdp is None:
+                self.cdp = await self.browser.new_cdp_session(self)
+            self.interceptor = FetchInterceptor(self.cdp)
+        await self.interceptor.add(url, handler, resource_type)
+
+    async def unintercept(self, url: str, handler: Optional[Callable[[InterceptedRequest], Any]] = None) -> None:
+        if self.interceptor:
+            await self.interceptor.remove(url, handler)
+
     # Custom Methods
     async def click(
         self,
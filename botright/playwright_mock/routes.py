@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 # from undetected_playwright.async_api import Route as PlaywrightRoute, Request as PlaywrightRequest, Response as PlaywrightResponse
 from playwright.async_api import Request as PlaywrightRequest
@@ -8,73 +8,97 @@ from playwright.async_api import Response as PlaywrightResponse
 from playwright.async_api import Route as PlaywrightRoute
 
 if TYPE_CHECKING:
-    from . import Page
+    from . import BrowserContext, Page
 
 from . import Frame
+from .identity_map import IdentityMap
 
 
-class Request(PlaywrightRequest):
-    def __init__(self, request: PlaywrightRequest, page: Page):
+class LazyPage:
+    """
+    Mixin resolving the Page of a network object only once it's needed.
+
+    Context-level routes don't know which page a request belongs to, and looking it up costs a frame lookup and a page wrapper for every intercepted request.
+    """
+
+    _lazy_page: Optional[Page]
+    _context: Optional[BrowserContext]
+    # The request whose frame the page gets resolved from, set by every network object
+    _page_request: PlaywrightRequest
+
+    @property
+    def _page(self) -> Page:
+        if self._lazy_page is None:
+            from . import Page
+
+            assert self._context, "Either a page or a context is needed to resolve the page"
+            self._lazy_page = Page(self._page_request.frame.page, self._context, self._context.faker)
+        return self._lazy_page
+
+
+class Request(LazyPage, PlaywrightRequest, metaclass=IdentityMap):
+    def __init__(self, request: PlaywrightRequest, page: Optional[Page] = None, context: Optional[BrowserContext] = None):
         super().__init__(request)
         self._impl_obj = request._impl_obj
-        self._page = page
-
-        self._frame = request.frame
-        self._redirected_from = request.redirected_from
-        self._redirected_to = request.redirected_to
+        self._lazy_page = page
+        self._context = context
+        self._request = request
+        self._page_request = request
 
         self.origin_response = request.response
 
+    # Frames and redirects are looked up on access, as a request's wrapper lives as long as the request and redirects get filled in later
     @property
     def frame(self):
-        return Frame(self._frame, self._page)
+        return Frame(self._request.frame, self._page)
 
     @property
     def redirected_from(self):
-        if not self._redirected_from:
+        if not self._request.redirected_from:
             return False
-        return Request(self._redirected_from, self._page)
+        return Request(self._request.redirected_from, self._lazy_page, self._context)
 
     @property
     def redirected_to(self):
-        if not self._redirected_to:
+        if not self._request.redirected_to:
             return False
-        return Request(self._redirected_to, self._page)
+        return Request(self._request.redirected_to, self._lazy_page, self._context)
 
     async def response(self):
         _response = await self.origin_response()
         if not _response:
             return None
 
-        return Response(_response, self._page)
+        return Response(_response, self._lazy_page, self._context)
 
 
-class Response(PlaywrightResponse):
-    def __init__(self, response: PlaywrightResponse, page: Page):
+class Response(LazyPage, PlaywrightResponse, metaclass=IdentityMap):
+    def __init__(self, response: PlaywrightResponse, page: Optional[Page] = None, context: Optional[BrowserContext] = None):
         super().__init__(response)
         self._impl_obj = response._impl_obj
-        self._page = page
-
-        self._frame = response.frame
-        self._request = response.request
+        self._lazy_page = page
+        self._context = context
+        self._response = response
+        self._page_request = response.request
 
     @property
     def frame(self):
-        return Frame(self._frame, self._page)
+        return Frame(self._response.frame, self._page)
 
     @property
     def request(self):
-        return Request(self._request, self._page)
+        return Request(self._response.request, self._lazy_page, self._context)
 
 
-class Route(PlaywrightRoute):
-    def __init__(self, route: PlaywrightRoute, page: Page):
+class Route(LazyPage, PlaywrightRoute, metaclass=IdentityMap):
+    def __init__(self, route: PlaywrightRoute, page: Optional[Page] = None, context: Optional[BrowserContext] = None):
         super().__init__(route)
         self._impl_obj = route._impl_obj
-        self._page = page
-
-        self._request = route.request
+        self._lazy_page = page
+        self._context = context
+        self._route = route
+        self._page_request = route.request
 
     @property
     def request(self):
-        return Request(self._request, self._page)
+        return Request(self._route.request, self._lazy_page, self._context)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from collections import Counter
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+
+if TYPE_CHECKING:
+    from . import Page
+
+
+# Jitter distributions (in ms) of all humanization delays
+distributions: Dict[str, Callable[[], float]] = {
+    # Pause after the mouse arrived at its target, before clicking
+    "after_move": lambda: random.randint(4, 8) * 50,
+    # Pause after a click was released
+    "after_click": lambda: random.randint(4, 8) * 50,
+    # Time between the two clicks of a double click
+    "dblclick_delay": lambda: random.randint(8, 14) * 10,
+    # Pause when the mouse is asked to move to where it already is
+    "same_position": lambda: random.randint(1, 10),
+    # Pause after a text was typed
+    "after_type": lambda: random.randint(4, 8) * 100,
+}
+
+
+class TimingStats:
+    def __init__(self) -> None:
+        """Counters of humanization waits, and how many Playwright driver calls running them locally saved."""
+        self.actions: Counter[str] = Counter()
+        self.waits: Counter[str] = Counter()
+        self.driver_calls_saved: Counter[str] = Counter()
+
+    @property
+    def driver_calls_saved_per_action(self) -> Dict[str, float]:
+        return {action: self.driver_calls_saved[action] / count for action, count in self.actions.items() if count}
+
+    def reset(self) -> None:
+        self.actions.clear()
+        self.waits.clear()
+        self.driver_calls_saved.clear()
+
+
+timing_stats = TimingStats()
+
+
+class HumanTiming:
+    def __init__(self, page: Page, sync_with_page: Optional[bool] = False) -> None:
+        """
+        Runs humanization delays of a page.
+
+        Delays run locally on the asyncio clock by default. With sync_with_page, they run through page.wait_for_timeout
+        instead, which costs a driver round trip but keeps them in sync with the page (e.g. for slowed down or paused pages).
+
+        Args:
+            page (Page): The page the delays belong to.
+            sync_with_page (bool, optional): Whether to wait through the page instead of locally. Defaults to False.
+        """
+        self._page = page
+        self.sync_with_page = sync_with_page
+
+    def jitter(self, kind: str) -> float:
+        """
+        Draw a random delay (in ms) from the distribution of the given kind.
+
+        Args:
+            kind (str): The kind of delay, a key of timing.distributions.
+        """
+        return distributions[kind]()
+
+    def action(self, name: str) -> None:
+        """
+        Count a humanized action, so the saved driver calls can be put in relation to it.
+
+        Args:
+            name (str): The name of the action (e.g. "click").
+        """
+        timing_stats.actions[name] += 1
+
+    async def sleep(self, delay: float, action: str) -> None:
+        """
+        Wait the given delay.
+
+        Args:
+            delay (float): The delay in ms.
+            action (str): The name of the action the wait belongs to.
+        """
+        timing_stats.waits[action] += 1
+        if self.sync_with_page:
+            await self._page.wait_for_timeout(delay)
+        else:
+            timing_stats.driver_calls_saved[action] += 1
+            await asyncio.sleep(delay / 1000)
+
+    async def pause(self, kind: str, action: str) -> None:
+        """
+        Wait a random delay drawn from the distribution of the given kind.
+
+        Args:
+            kind (str): The kind of delay, a key of timing.distributions.
+            action (str): The name of the action the wait belongs to.
+        """
+        await self.sleep(self.jitter(kind), action)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from typing import List, Optional
+
+from .modules.geoip import GeoIP
+from .modules.proxy_cache import ProxyCheckCache
+from .modules.proxy_validator import ProxyValidator, proxy_lines, read_proxies
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m botright.proxies", description="Check proxies concurrently, streaming their exit IP, geolocation and latency as JSON lines.")
+    parser.add_argument("proxies", help="File with one proxy per line, in any format Botright supports. Use - to read from stdin.")
+    parser.add_argument("-o", "--output", help="JSONL file to write the results to. Defaults to stdout.")
+    parser.add_argument("-c", "--concurrency", type=int, default=50, help="Proxies checked at the same time. Defaults to 50.")
+    parser.add_argument("-d", "--deadline", type=float, default=15.0, help="Seconds the checks of a proxy may take. Defaults to 15.")
+    parser.add_argument("--geoip", help="Offline GeoIP database (.mmdb or range table) to resolve exit IPs with.")
+    parser.add_argument("--cache", nargs="?", const="", help="Store valid results in a proxy check cache, optionally at the given path, so new_browser skips checking them.")
+    parser.add_argument("--valid-only", action="store_true", help="Only write the results of valid proxies.")
+    return parser.parse_args(argv)
+
+
+async def run(arguments: argparse.Namespace) -> ProxyValidator:
+    geoip = GeoIP(arguments.geoip) if arguments.geoip else None
+    cache = ProxyCheckCache(arguments.cache or None) if arguments.cache is not None else None
+    validator = ProxyValidator(concurrency=arguments.concurrency, deadline=arguments.deadline, geoip=geoip, cache=cache)
+
+    proxies = proxy_lines(sys.stdin) if arguments.proxies == "-" else read_proxies(arguments.proxies)
+    try:
+        if arguments.output:
+            with open(arguments.output, "w", encoding="utf-8") as output:
+                await validator.validate_to_jsonl(proxies, output, valid_only=arguments.valid_only)
+        else:
+            await validator.validate_to_jsonl(proxies, sys.stdout, valid_only=arguments.valid_only)
+    finally:
+        if geoip:
+            geoip.close()
+    return validator
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arguments = parse_arguments(argv)
+    validator = asyncio.run(run(arguments))
+    # The summary goes to stderr, so stdout stays valid JSONL
+    print(json.dumps(validator.stats), file=sys.stderr)
+    return 0 if validator.valid else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+import asyncio
+import time
+from typing import Any, Callable, Coroutine, Tuple
+
+import botright
+from botright.extended_typing import Page
+from botright.playwright_mock.actionability import scroll_and_measure
+
+from ..server import test_server
+
+ROUNDS = 50
+
+
+def count_round_trips(page: Page) -> Callable[[], int]:
+    # Counting every message sent to the Playwright driver on the page's connection
+    connection = page._impl_obj._connection
+    origin_send = connection._send_message_to_server
+    sent = 0
+
+    def send_message_to_server(*args: Any, **kwargs: Any) -> Any:
+        nonlocal sent
+        sent += 1
+        return origin_send(*args, **kwargs)
+
+    connection._send_message_to_server = send_message_to_server
+    return lambda: sent
+
+
+async def legacy_measure(page: Page) -> None:
+    # The sequence Locator.click ran before scroll_and_measure existed
+    locator = page.locator("#btn9")
+    bounding_box = await locator.bounding_box()
+    assert bounding_box
+    await locator.scroll_into_view_if_needed()
+    assert await locator.is_visible()
+
+
+async def measure(page: Page) -> None:
+    await scroll_and_measure(page.locator("#btn9"), page)
+
+
+async def bench(page: Page, round_trips: Callable[[], int], function: Callable[[Page], Coroutine[Any, Any, None]]) -> Tuple[float, float]:
+    # Returns the round trips and ms per measurement, scrolling back to the top each time so the element always needs scrolling
+    trips = elapsed = 0.0
+    for _ in range(ROUNDS):
+        await page.evaluate("() => window.scrollTo(0, 0)")
+        before, start = round_trips(), time.perf_counter()
+        await function(page)
+        elapsed += time.perf_counter() - start
+        trips += round_trips() - before
+    return trips / ROUNDS, elapsed / ROUNDS * 1000
+
+
+async def main():
+    test_server.start()
+    botright_client = await botright.Botright(headless=True)
+    browser = await botright_client.new_browser()
+    page = await browser.new_page()
+    await page.set_viewport_size({"width": 200, "height": 200})
+    await page.goto(test_server.server.PREFIX + "/offscreenbuttons.html")
+    round_trips = count_round_trips(page)
+
+    print(f"{'sequence':<20}{'round trips':>14}{'latency':>12}")
+    for name, function in {"legacy": legacy_measure, "scroll_and_measure": measure}.items():
+        trips, latency = await bench(page, round_trips, function)
+        print(f"{name:<20}{trips:>14.1f}{latency:>10.2f}ms")
+
+    await botright_client.close()
+    test_server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+import asyncio
+import tempfile
+import time
+from typing import Dict, Tuple
+
+import botright
+from botright import DiskCache
+
+from ..server import test_server
+
+ASSETS = 40
+ASSET_SIZE = 64 * 1024
+
+
+def serve_site(served: Dict[str, int]) -> None:
+    # A page with many cacheable subresources, counting the body bytes the server sends
+    server = test_server.server
+
+    def asset(request):
+        body = b"/*" + b"x" * ASSET_SIZE + b"*/"
+        served["bytes"] += len(body)
+        request.setHeader(b"Content-Type", b"text/css")
+        request.setHeader(b"Cache-Control", b"max-age=3600")
+        request.write(body)
+        request.finish()
+
+    def index(request):
+        links = "".join(f'<link rel="stylesheet" href="/cached/{i}.css">' for i in range(ASSETS))
+        body = f"<html><head>{links}</head><body>cached</body></html>".encode()
+        served["bytes"] += len(body)
+        request.setHeader(b"Content-Type", b"text/html")
+        request.setHeader(b"Cache-Control", b"max-age=3600")
+        request.write(body)
+        request.finish()
+
+    server.set_route("/cached/index.html", index)
+    for i in range(ASSETS):
+        server.set_route(f"/cached/{i}.css", asset)
+
+
+async def navigate(cache_dir: str, served: Dict[str, int]) -> Tuple[float, int]:
+    # Every run uses its own Botright instance, like separate processes sharing the cache directory would
+    served["bytes"] = 0
+    botright_client = await botright.Botright(headless=True, cache_responses=True, response_cache=DiskCache(cache_dir))
+    browser = await botright_client.new_browser()
+    page = await browser.new_page()
+
+    start = time.perf_counter()
+    await page.goto(test_server.server.PREFIX + "/cached/index.html", wait_until="load")
+    elapsed = time.perf_counter() - start
+
+    await botright_client.close()
+    return elapsed * 1000, served["bytes"]
+
+
+async def main():
+    test_server.start()
+    served = {"bytes": 0}
+    serve_site(served)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        print(f"{'navigation':<12}{'time':>12}{'upstream bytes':>18}")
+        for name in ("cold", "warm"):
+            elapsed, upstream_bytes = await navigate(cache_dir, served)
+            print(f"{name:<12}{elapsed:>10.1f}ms{upstream_bytes:>18}")
+
+    test_server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+import asyncio
+import time
+
+import botright
+from botright.extended_typing import Page
+
+from ..server import test_server
+
+REQUESTS = 1000
+
+
+async def bench(page: Page) -> float:
+    # Returns the requests per second, fetching all of them at once like a page load would
+    start = time.perf_counter()
+    await page.evaluate("count => Promise.all([...Array(count).keys()].map(i => fetch(`/intercepted/${i}`)))", REQUESTS)
+    return REQUESTS / (time.perf_counter() - start)
+
+
+async def main():
+    test_server.start()
+    botright_client = await botright.Botright(headless=True)
+    browser = await botright_client.new_browser()
+    page = await browser.new_page()
+    await page.goto(test_server.server.EMPTY_PAGE)
+
+    async def route_handler(route, request):
+        await route.fulfill(body="")
+
+    async def fetch_handler(request):
+        await request.fulfill(body="")
+
+    print(f"{'backend':<18}{'requests/s':>12}")
+
+    for name, raw in (("route", False), ("route (raw)", True)):
+        await page.route("**/intercepted/*", route_handler, raw=raw)
+        print(f"{name:<18}{await bench(page):>12.0f}")
+        await page.unroute("**/intercepted/*")
+
+    await page.intercept("*/intercepted/*", fetch_handler)
+    print(f"{'cdp fetch':<18}{await bench(page):>12.0f}")
+    await page.unintercept("*/intercepted/*")
+
+    await botright_client.close()
+    test_server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
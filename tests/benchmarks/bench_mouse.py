@@ -0,0 +1,55 @@
+import math
+import time
+import timeit
+from typing import List, Tuple
+
+from botright.playwright_mock.mouse import BezierCalculator, HumanizeMouseTrajectory, trajectory_pool
+
+MOVES = {"short": ((100, 100), (160, 130)), "medium": ((100, 100), (700, 450)), "long": ((0, 0), (1920, 1080))}
+
+
+def legacy_points_in_curve(n: int, points: List[Tuple[int, int]]) -> List[Tuple[float, float]]:
+    # Pure-Python Bernstein evaluation, as BezierCalculator did before it was vectorized
+    def binomial(n: int, k: int) -> float:
+        return math.factorial(n) / float(math.factorial(k) * math.factorial(n - k))
+
+    curve_points = []
+    degree = len(points) - 1
+    for i in range(n):
+        t = i / (n - 1)
+        x = y = 0.0
+        for j, point in enumerate(points):
+            bern = binomial(degree, j) * (t**j) * ((1 - t) ** (degree - j))
+            x += point[0] * bern
+            y += point[1] * bern
+        curve_points.append((x, y))
+    return curve_points
+
+
+def bench(function, number: int) -> float:
+    # Returns the best µs per call out of five runs
+    return min(timeit.repeat(function, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    # Letting the worker thread fill the trajectory pool first
+    trajectory_pool.start()
+    time.sleep(5)
+
+    print(f"{'move':<8}{'distance':>10}{'legacy curve':>16}{'vector curve':>16}{'trajectory':>14}{'pooled':>12}{'events':>8}")
+    for name, (from_point, to_point) in MOVES.items():
+        knots = [from_point, (from_point[0] + 40, to_point[1] - 30), (to_point[0] - 20, from_point[1] + 60), to_point]
+        points_count = max(abs(from_point[0] - to_point[0]), abs(from_point[1] - to_point[1]), 2)
+        distance = math.dist(from_point, to_point)
+
+        legacy = bench(lambda: legacy_points_in_curve(points_count, knots), 20)
+        vectorized = bench(lambda: BezierCalculator.calculate_curve(points_count, knots), 200)
+        trajectory = bench(lambda: HumanizeMouseTrajectory(from_point, to_point), 200)
+        # Only taking as many trajectories as the pool holds per bucket, so every call is a pool hit
+        pooled = min(timeit.repeat(lambda: trajectory_pool.get_trajectory(from_point, to_point), number=1, repeat=trajectory_pool.paths_per_bucket)) * 1e6
+
+        print(f"{name:<8}{distance:>9.0f}px{legacy:>14.1f}µs{vectorized:>14.1f}µs{trajectory:>12.1f}µs{pooled:>10.1f}µs{len(HumanizeMouseTrajectory(from_point, to_point).points):>8}")
+
+
+if __name__ == "__main__":
+    main()
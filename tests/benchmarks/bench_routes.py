@@ -0,0 +1,59 @@
+import asyncio
+import time
+
+import botright
+from botright.extended_typing import Page
+from botright.playwright_mock import Request, Route
+
+from ..server import test_server
+
+SUBRESOURCES = 300
+ROUNDS = 5
+
+
+async def bench(page: Page) -> float:
+    # Returns the ms per intercepted request, fetching all subresources at once like a page load would
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        await page.evaluate("count => Promise.all([...Array(count).keys()].map(i => fetch(`/intercepted/${i}`)))", SUBRESOURCES)
+    return (time.perf_counter() - start) / ROUNDS / SUBRESOURCES * 1000
+
+
+async def main():
+    test_server.start()
+    botright_client = await botright.Botright(headless=True)
+    browser = await botright_client.new_browser()
+    page = await browser.new_page()
+    await page.goto(test_server.server.EMPTY_PAGE)
+
+    async def raw_handler(route, request):
+        await route.fulfill(body="")
+
+    async def eager_handler(route, request):
+        # Building the page, route and request wrappers like every intercepted request did before they were lazy
+        _page = type.__call__(type(page), request.frame.page, browser, browser.faker)
+        route, request = type.__call__(Route, route, _page), type.__call__(Request, request, _page)
+        await route.fulfill(body="")
+
+    async def wrapped_handler(route, request):
+        await route.fulfill(body="")
+
+    async def page_handler(route, request):
+        # Touching the page forces it to be resolved
+        assert route.request.frame.page
+        await route.fulfill(body="")
+
+    handlers = {"raw": (raw_handler, True), "eager": (eager_handler, True), "lazy": (wrapped_handler, False), "lazy + page": (page_handler, False)}
+
+    print(f"{'handler':<14}{'per request':>14}")
+    for name, (handler, raw) in handlers.items():
+        await browser.route("**/intercepted/*", handler, raw=raw)
+        print(f"{name:<14}{await bench(page):>12.3f}ms")
+        await browser.unroute("**/intercepted/*", handler)
+
+    await botright_client.close()
+    test_server.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
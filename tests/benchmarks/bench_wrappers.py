@@ -0,0 +1,68 @@
+import asyncio
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+from recognizer.agents.playwright import AsyncChallenger
+
+import botright
+from botright.modules import hcaptcha
+from botright.playwright_mock import Frame, Page
+
+ROUNDS = 200
+
+
+def bench(function: Callable[[], object]) -> Tuple[float, float]:
+    # Returns the µs and KiB allocated per call, keeping every result alive so allocations add up
+    tracemalloc.start()
+    results = [function() for _ in range(ROUNDS)]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del results
+
+    # Timing an untraced run, as tracemalloc slows allocations down
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        function()
+    return (time.perf_counter() - start) / ROUNDS * 1e6, allocated / ROUNDS / 1024
+
+
+async def main():
+    botright_client = await botright.Botright(headless=True)
+    browser = await botright_client.new_browser()
+    page = await browser.new_page()
+    # The raw Playwright page, which every wrapper gets built around
+    raw_page = page._page
+
+    # Calling type.__call__ directly bypasses the identity map, building a new wrapper like every property access did before
+    def lazy_wrapper():
+        return type.__call__(Page, raw_page, browser, page.faker)
+
+    def eager_wrapper():
+        # Building both solvers like every Page wrapper did before they were lazy
+        wrapper = type.__call__(Page, raw_page, browser, page.faker)
+        hcaptcha.hCaptcha(browser, wrapper)
+        AsyncChallenger(wrapper)
+        return wrapper
+
+    print(f"{'wrapper':<10}{'latency':>12}{'allocated':>14}")
+    for name, function in {"eager": eager_wrapper, "lazy": lazy_wrapper}.items():
+        latency, allocated = bench(function)
+        print(f"{name:<10}{latency:>10.1f}µs{allocated:>10.1f}KiB")
+
+    accesses = {
+        "main_frame": (lambda: raw_page.main_frame, lambda: type.__call__(Frame, raw_page.main_frame, page), lambda: page.main_frame),
+        "frames": (lambda: raw_page.frames, lambda: [type.__call__(Frame, frame, page) for frame in raw_page.frames], lambda: page.frames),
+        "pages": (lambda: browser._browser.pages, lambda: [type.__call__(Page, _page, browser, page.faker) for _page in browser._browser.pages], lambda: browser.pages),
+    }
+
+    print(f"\n{'access':<12}{'playwright':>12}{'new wrapper':>14}{'identity map':>15}")
+    for name, (raw, uncached, cached) in accesses.items():
+        raw_latency, uncached_latency, cached_latency = (bench(function)[0] for function in (raw, uncached, cached))
+        print(f"{name:<12}{raw_latency:>10.2f}µs{uncached_latency:>12.2f}µs{cached_latency:>13.2f}µs")
+
+    await botright_client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
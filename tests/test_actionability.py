@@ -0,0 +1,25 @@
+import pytest
+
+from botright.extended_typing import Page
+from botright.playwright_mock.actionability import scroll_and_measure
+
+
+@pytest.mark.asyncio
+async def test_scroll_and_measure_scrolls_offscreen_element(page: Page, server):
+    await page.set_viewport_size({"width": 200, "height": 200})
+    await page.goto(server.PREFIX + "/offscreenbuttons.html")
+
+    box = await scroll_and_measure(page.locator("#btn10"), page)
+    assert 0 <= box["click_x"] <= 200 and 0 <= box["click_y"] <= 200
+    assert (box["width"], box["height"]) == (100, 20)
+    assert box["click_x"] == box["x"] + 50 and box["click_y"] == box["y"] + 10
+
+
+@pytest.mark.asyncio
+async def test_click_offscreen_button(page: Page, server):
+    await page.set_viewport_size({"width": 200, "height": 200})
+    await page.goto(server.PREFIX + "/offscreenbuttons.html")
+    await page.evaluate("() => { window.clicked = []; document.querySelectorAll('button').forEach(button => button.onclick = () => window.clicked.push(button.id)); }")
+
+    await page.locator("#btn10").click()
+    assert await page.evaluate("() => window.clicked") == ["btn10"]
@@ -0,0 +1,100 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from playwright.async_api import Error as PlaywrightError
+
+from botright import BandwidthMeter
+from botright.extended_typing import Page
+
+
+def test_bandwidth_meter_aggregates():
+    proxy_meter = BandwidthMeter()
+    meter = BandwidthMeter(budget=1000, parent=proxy_meter)
+    meter.record(600, "document", "example.com")
+    meter.record(300, "image", "cdn.example.com")
+    assert not meter.exceeded
+
+    meter.record(200, "image", "cdn.example.com")
+    assert meter.exceeded and meter.stats["by_type"] == {"image": 500, "document": 600}
+    assert meter.stats["by_domain"] == {"example.com": 600, "cdn.example.com": 500}
+    # The parent meter counts the same bytes, without a budget of its own
+    assert proxy_meter.bytes == 1100 and not proxy_meter.exceeded
+
+
+class FakeCDPSession:
+    def __init__(self):
+        self.listeners = {}
+
+    def on(self, event, listener):
+        self.listeners[event] = listener
+
+    async def send(self, method, params=None):
+        return {}
+
+    def emit(self, event, **params):
+        self.listeners[event](params)
+
+
+class FakePage:
+    def __init__(self):
+        self.cdp = FakeCDPSession()
+
+    def on(self, event, listener):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_bandwidth_meter_skips_local_responses():
+    meter = BandwidthMeter()
+    page = FakePage()
+    await meter.attach(page)
+
+    responses = {
+        "network": {"remoteIPAddress": "203.0.113.7"},
+        "disk-cache": {"remoteIPAddress": "203.0.113.7", "fromDiskCache": True},
+        "service-worker": {"fromServiceWorker": True},
+        # Fulfilled by a route, e.g. from Botright's response cache
+        "fulfilled": {},
+    }
+    for request_id, response in responses.items():
+        page.cdp.emit("Network.requestWillBeSent", requestId=request_id, type="Image", request={"url": "https://cdn.example.com/logo.png"})
+        page.cdp.emit("Network.responseReceived", requestId=request_id, response=response)
+        page.cdp.emit("Network.loadingFinished", requestId=request_id, encodedDataLength=1000)
+
+    # Only the response which went through the proxy is counted
+    assert meter.bytes == 1000 and meter.requests == 1
+
+
+def test_bandwidth_meter_counts_route_fetches():
+    meter = BandwidthMeter()
+    response = SimpleNamespace(url="https://example.com/style.css", headers={"content-length": "300"}, headers_array=[{"name": "content-length", "value": "300"}])
+    # The compressed size of Content-Length counts, not the decompressed body
+    meter.meter_api_response(response, b"x" * 1000, "stylesheet")
+    assert meter.bytes == 300 + len("content-length") + len("300") + 4
+    assert meter.by_type["stylesheet"] == meter.bytes and meter.by_domain["example.com"] == meter.bytes
+
+
+@pytest.mark.asyncio
+async def test_bandwidth_meter_counts_page_traffic(page: Page, server):
+    meter = page.context.bandwidth
+    before = meter.bytes
+    await page.goto(server.PREFIX + "/grid.html")
+    await asyncio.sleep(0.1)
+
+    assert meter.bytes > before and meter.by_type["document"] > 0
+    assert meter.by_domain["localhost"] > 0
+    assert page.context.proxy.bandwidth.bytes >= meter.bytes
+
+
+@pytest.mark.asyncio
+async def test_bandwidth_budget_aborts_documents(page: Page, server):
+    meter = page.context.bandwidth
+    meter.budget = 1
+    await page.goto(server.EMPTY_PAGE)
+    await asyncio.sleep(0.1)
+
+    assert meter.exceeded
+    with pytest.raises(PlaywrightError):
+        await page.goto(server.PREFIX + "/grid.html")
+    assert meter.aborted >= 1
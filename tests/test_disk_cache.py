@@ -0,0 +1,101 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from botright import DiskCache
+
+
+def test_disk_cache_is_shared_between_instances(tmp_path):
+    cache = DiskCache(tmp_path)
+    cache.put("https://example.com/style.css", 200, {"content-type": "text/css", "cache-control": "max-age=60"}, b"body {}")
+
+    # A second instance on the same directory, like another Botright process would use
+    cached = DiskCache(tmp_path).get("https://example.com/style.css")
+    assert cached and cached.body == b"body {}" and cached.headers["content-type"] == "text/css"
+
+
+def test_disk_cache_deduplicates_bodies(tmp_path):
+    cache = DiskCache(tmp_path)
+    cache.put("https://example.com/a.js", 200, {}, b"x" * 100)
+    cache.put("https://example.com/b.js", 200, {}, b"x" * 100)
+    assert len(cache) == 2 and cache.bytes_stored == 100
+
+
+def test_disk_cache_honors_cache_control(tmp_path):
+    cache = DiskCache(tmp_path)
+    cache.put("https://example.com/no-store", 200, {"cache-control": "no-store"}, b"body")
+    assert "https://example.com/no-store" not in cache
+    cache.put("https://example.com/private", 200, {"cache-control": "private"}, b"body")
+    assert "https://example.com/private" not in cache
+
+    cache.put("https://example.com/login", 200, {"set-cookie": "session=1", "cache-control": "max-age=60"}, b"body")
+    cached = cache.get("https://example.com/login")
+    assert cached and "set-cookie" not in cached.headers
+
+    cache.put("https://example.com/expired", 200, {"expires": "Thu, 01 Jan 1970 00:00:00 GMT", "etag": '"v1"'}, b"body")
+    assert cache.get("https://example.com/expired") is None and cache.stale == 1
+    # Stale entries are kept for revalidation
+    stale = cache.lookup("https://example.com/expired")
+    assert stale and stale.headers["etag"] == '"v1"'
+
+
+def test_disk_cache_heuristic_freshness(tmp_path):
+    cache = DiskCache(tmp_path, heuristic_ttl=3600)
+    # Responses without freshness information and Last-Modified aren't fresh
+    cache.put("https://example.com/no-validators.js", 200, {}, b"body")
+    assert cache.get("https://example.com/no-validators.js") is None
+
+    # Ones with Last-Modified are fresh for 10% of their age, at most heuristic_ttl
+    date = "Mon, 05 Jan 2026 10:00:00 GMT"
+    recent = cache.put("https://example.com/recent.js", 200, {"date": date, "last-modified": "Mon, 05 Jan 2026 09:00:00 GMT"}, b"body")
+    old = cache.put("https://example.com/old.js", 200, {"date": date, "last-modified": "Thu, 01 Jan 2026 00:00:00 GMT"}, b"body")
+    assert recent.expires_at and round(recent.expires_at - recent.stored_at) == 360
+    assert old.expires_at and round(old.expires_at - old.stored_at) == 3600
+
+
+def test_disk_cache_varies_by_request_headers(tmp_path):
+    cache = DiskCache(tmp_path)
+    headers = {"vary": "Accept-Encoding", "cache-control": "max-age=60"}
+    cache.put("https://example.com/app.js", 200, headers, b"gzip", {"accept-encoding": "gzip"})
+    cache.put("https://example.com/app.js", 200, headers, b"br", {"accept-encoding": "br"})
+
+    gzip_response, br_response = cache.get("https://example.com/app.js", {"Accept-Encoding": "gzip"}), cache.get("https://example.com/app.js", {"accept-encoding": "br"})
+    assert gzip_response and gzip_response.body == b"gzip" and br_response and br_response.body == b"br"
+    assert cache.get("https://example.com/app.js") is None
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=250)
+    headers = {"cache-control": "max-age=60"}
+    cache.put("https://example.com/0", 200, headers, b"0" * 100)
+    cache.put("https://example.com/1", 200, headers, b"1" * 100)
+    assert cache.get("https://example.com/0")
+    cache.put("https://example.com/2", 200, headers, b"2" * 100)
+
+    assert "https://example.com/1" not in cache and "https://example.com/0" in cache
+    assert cache.bytes_stored == 200 and cache.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_offloads_blocking_work(tmp_path):
+    cache = DiskCache(tmp_path)
+    headers = {"cache-control": "max-age=60"}
+    await cache.offload(cache.put, "https://example.com/a.css", 200, headers, b"a")
+
+    # Another process holding the write lock only blocks the cache's worker thread, the event loop keeps running
+    other_process = sqlite3.connect(tmp_path / "index.sqlite3", isolation_level=None)
+    other_process.execute("BEGIN IMMEDIATE")
+    put = asyncio.ensure_future(cache.offload(cache.put, "https://example.com/b.css", 200, headers, b"b"))
+    await asyncio.sleep(0.2)
+    assert not put.done()
+
+    other_process.execute("COMMIT")
+    await put
+    cached = await cache.offload(cache.get, "https://example.com/b.css")
+    assert cached and cached.body == b"b"
+    # Counting from the event loop goes through the worker thread as well, and doesn't wait for itself when offloaded
+    assert len(cache) == 2 and "https://example.com/b.css" in cache
+    assert await cache.offload(len, cache) == 2 and await cache.offload(lambda: cache.bytes_stored) == 2
+    other_process.close()
+    cache.close()
@@ -0,0 +1,44 @@
+import pytest
+
+from botright import GeoIP
+from botright.modules.geoip import GeoLocation
+
+BERLIN = GeoLocation("Germany", "DE", 52.52, 13.40, "Europe/Berlin")
+NEW_YORK = GeoLocation("United States", "US", 40.71, -74.01, "America/New_York")
+
+
+@pytest.fixture
+def geoip(tmp_path):
+    path = tmp_path / "geoip.bin"
+    GeoIP.build(path, [("203.0.113.0", "203.0.113.255", BERLIN), ("198.51.100.0", "198.51.100.127", NEW_YORK), ("2001:db8::", "2001:db8::ffff", BERLIN)])
+    geoip = GeoIP(path)
+    yield geoip
+    geoip.close()
+
+
+def test_geoip_range_table_lookup(geoip):
+    assert geoip.lookup("203.0.113.7") == BERLIN
+    assert geoip.lookup("198.51.100.0") == NEW_YORK and geoip.lookup("198.51.100.127") == NEW_YORK
+    assert geoip.lookup("2001:db8::1") == BERLIN
+
+    # Gaps between ranges and addresses before the first one are unknown
+    assert geoip.lookup("198.51.100.128") is None
+    assert geoip.lookup("1.1.1.1") is None
+    assert geoip.lookup("not an ip") is None
+    assert geoip.stats["hits"] == 4 and geoip.stats["misses"] == 3
+
+
+def test_geoip_build_from_csv(tmp_path):
+    csv_path = tmp_path / "ranges.csv"
+    csv_path.write_text("203.0.113.0,203.0.113.255,DE,Germany,52.52,13.40,Europe/Berlin\n192.0.2.0,192.0.2.255,US,United States,,,\n")
+    GeoIP.build_from_csv(tmp_path / "geoip.bin", csv_path)
+
+    geoip = GeoIP(tmp_path / "geoip.bin")
+    assert geoip.lookup("203.0.113.1") == BERLIN
+    assert geoip.lookup("192.0.2.1") == GeoLocation("United States", "US")
+
+
+def test_geoip_rejects_unknown_files(tmp_path):
+    (tmp_path / "geoip.bin").write_bytes(b"\x00" * 64)
+    with pytest.raises(ValueError):
+        GeoIP(tmp_path / "geoip.bin")
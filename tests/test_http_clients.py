@@ -0,0 +1,42 @@
+import asyncio
+import gc
+
+import pytest
+
+from botright.modules.http_clients import ClientRegistry
+
+
+@pytest.mark.asyncio
+async def test_client_registry_shares_clients():
+    registry = ClientRegistry(http2=False)
+    direct, direct_again = registry.acquire(), registry.acquire()
+    proxied = registry.acquire("http://198.51.100.1:8080")
+
+    assert direct is direct_again and proxied is not direct
+    assert registry.stats == {"clients": 2, "references": 3, "created": 2, "reused": 1}
+
+    # Clients stay open until their last user released them
+    await registry.release()
+    assert not direct.is_closed
+    await registry.release()
+    assert direct.is_closed and len(registry) == 1
+
+    # Releasing more often than acquiring doesn't affect other clients
+    await registry.release()
+    assert not proxied.is_closed
+
+    await registry.close()
+    assert proxied.is_closed and len(registry) == 0
+
+
+def test_client_registry_doesnt_reuse_clients_of_collected_loops():
+    registry = ClientRegistry(http2=False)
+
+    async def acquire():
+        return registry.acquire()
+
+    first = asyncio.run(acquire())
+    gc.collect()
+    # The first loop is gone, so its client isn't handed to the next loop, even if that one gets the same id
+    assert len(registry) == 0
+    assert asyncio.run(acquire()) is not first and registry.stats["created"] == 2
@@ -0,0 +1,58 @@
+import pytest
+
+from botright.extended_typing import InterceptedRequest, Page
+from botright.playwright_mock.interception import cdp_pattern_to_regex
+
+
+def test_cdp_pattern_to_regex():
+    assert cdp_pattern_to_regex("*://*.example.com/*").match("https://www.example.com/index.html")
+    assert cdp_pattern_to_regex("*/img?.png").match("http://a/img1.png")
+    assert not cdp_pattern_to_regex("*/img?.png").match("http://a/img12.png")
+    assert cdp_pattern_to_regex(r"*/what\?").match("http://a/what?")
+
+
+@pytest.mark.asyncio
+async def test_intercept_fulfills_and_fails(page: Page, server):
+    await page.goto(server.EMPTY_PAGE)
+    intercepted = []
+
+    async def fulfill(request: InterceptedRequest):
+        intercepted.append((request.url, request.resource_type))
+        await request.fulfill(body="intercepted", content_type="text/plain")
+
+    async def fail(request: InterceptedRequest):
+        await request.fail()
+
+    await page.intercept("*/fulfilled", fulfill)
+    await page.intercept("*/failed", fail)
+
+    assert await page.evaluate("fetch('/fulfilled').then(r => r.text())") == "intercepted"
+    assert not await page.evaluate("fetch('/failed').then(() => true, () => false)")
+    assert intercepted == [(server.PREFIX + "/fulfilled", "fetch")]
+
+    # Unmatched and unhandled requests are continued
+    await page.intercept("*/empty.html", lambda request: None)
+    assert await page.evaluate("fetch('/empty.html').then(r => r.ok)")
+
+    await page.unintercept("*/fulfilled")
+    assert await page.evaluate("fetch('/fulfilled').then(r => r.status)") == 404
+
+
+@pytest.mark.asyncio
+async def test_intercept_resource_type(page: Page, server):
+    await page.goto(server.EMPTY_PAGE)
+    intercepted = []
+
+    async def handler(request: InterceptedRequest):
+        intercepted.append(request.resource_type)
+        await request.fulfill(status=204)
+
+    await page.intercept("*", handler, resource_type="image")
+    await page.evaluate("fetch('/empty.html')")
+    await page.evaluate("new Promise(resolve => { const img = new Image(); img.onload = img.onerror = resolve; img.src = '/pptr.png'; })")
+
+    assert intercepted == ["image"]
+    assert page.interceptor and page.interceptor.paused == 1
+
+    with pytest.raises(ValueError):
+        await page.intercept("*", handler, resource_type="picture")
@@ -0,0 +1,49 @@
+import pytest
+
+from botright.extended_typing import Page
+from botright.playwright_mock.keyboard import key_events
+
+
+@pytest.mark.asyncio
+async def test_type_dispatches_scheduled_keys(page: Page, server):
+    await page.goto(server.PREFIX + "/input/textarea.html")
+    await page.focus("textarea")
+
+    await page.keyboard.type("Hello World\nsecond line", delay=20)
+    assert await page.evaluate("() => result") == "Hello World\nsecond line"
+
+
+@pytest.mark.asyncio
+async def test_type_fast_fill_inserts_rest(page: Page, server):
+    await page.goto(server.PREFIX + "/input/textarea.html")
+    await page.focus("textarea")
+
+    await page.keyboard.type("Hello World", delay=20, fast_fill=3)
+    assert await page.evaluate("() => result") == "Hello World"
+
+
+def test_key_events_cover_printable_ascii():
+    for char in map(chr, range(32, 127)):
+        presses, releases = key_events(char)
+        method, key_down = presses[-1]
+        # Every printable ASCII character is typed with its real key, holding Shift for the shifted ones
+        assert method == "Input.dispatchKeyEvent" and key_down["code"] and key_down["windowsVirtualKeyCode"]
+        assert (len(presses) == 2) == bool(key_down["modifiers"]) == (len(releases) == 2)
+
+
+@pytest.mark.asyncio
+async def test_type_holds_shift_for_shifted_characters(page: Page, server):
+    await page.goto(server.PREFIX + "/input/textarea.html")
+    await page.focus("textarea")
+    await page.evaluate("() => { window.keys = []; document.addEventListener('keydown', event => keys.push([event.key, event.code, event.keyCode, event.shiftKey])) }")
+
+    await page.keyboard.type("a@B.", delay=20)
+    assert await page.evaluate("() => result") == "a@B."
+    assert await page.evaluate("() => keys") == [
+        ["a", "KeyA", 65, False],
+        ["Shift", "ShiftLeft", 16, True],
+        ["@", "Digit2", 50, True],
+        ["Shift", "ShiftLeft", 16, True],
+        ["B", "KeyB", 66, True],
+        [".", "Period", 190, False],
+    ]
@@ -0,0 +1,103 @@
+import math
+
+import numpy as np
+import pytest
+
+from botright.extended_typing import Page
+from botright.playwright_mock.mouse import BezierCalculator, HumanizeMouseTrajectory, Mouse, TrajectoryPool
+
+
+def test_bezier_curve_matches_bernstein_polynomial():
+    knots = [(0, 0), (300, -50), (700, 400), (1200, 800)]
+    curve = BezierCalculator.calculate_points_in_curve(50, knots)
+    bernstein = BezierCalculator.bernstein_polynomial(knots)
+
+    for i, (x, y) in enumerate(curve):
+        expected_x, expected_y = bernstein(i / 49)
+        assert math.isclose(x, expected_x, abs_tol=1e-9)
+        assert math.isclose(y, expected_y, abs_tol=1e-9)
+
+
+def test_bernstein_basis_is_cached_and_partition_of_unity():
+    basis = BezierCalculator.bernstein_basis(100, 3)
+    assert basis is BezierCalculator.bernstein_basis(100, 3)
+    assert np.allclose(basis.sum(axis=1), 1.0)
+
+
+def test_humanized_trajectory_hits_start_and_end():
+    trajectory = HumanizeMouseTrajectory((10, 20), (900, 500))
+    assert trajectory.points[0] == (10, 20)
+    assert trajectory.points[-1] == (900, 500)
+
+
+def test_trajectory_pool_buckets_by_distance_and_angle():
+    pool = TrajectoryPool(distance_buckets=4, angle_buckets=8, min_distance=8)
+    # Logarithmic distance buckets, with longer moves falling into the last one
+    assert [pool._bucket(distance, 0)[0] for distance in (8, 15, 16, 63, 64, 5000)] == [0, 0, 1, 2, 3, 3]
+    # Angles are taken around the full circle, negative ones included
+    assert [pool._bucket(100, angle)[1] for angle in (0, math.pi / 2, math.pi, -math.pi / 2, -0.01)] == [0, 2, 4, 6, 7]
+
+    # Generated paths are normalized onto (0, 0) -> (1, 0)
+    normalized = pool._generate_normalized_path(3, 5)
+    assert np.allclose(normalized[0], (0, 0)) and np.allclose(normalized[-1], (1, 0))
+
+
+def test_trajectory_pool_transforms_paths_onto_start_and_end():
+    pool = TrajectoryPool(min_distance=8)
+    # Not starting the background worker, so only the path put into the bucket gets handed out
+    pool.start = lambda: None
+    from_point, to_point = (100, 50), (400, 450)
+    angle = math.atan2(400, 300)
+    pool._buckets[pool._bucket(500, angle)].append(np.array([[0, 0], [0.5, 0], [0.5, 0.1], [1, 0]]))
+
+    path = pool.get_path(from_point, to_point)
+    assert path is not None
+    assert tuple(path[0]) == from_point and tuple(path[-1]) == to_point
+    # Points on the normalized axis land on the straight line, offsets from it get rotated along
+    assert np.allclose(path[1], (250, 250))
+    assert np.allclose(path[2], (100 + 500 * (0.5 * 0.6 - 0.1 * 0.8), 50 + 500 * (0.5 * 0.8 + 0.1 * 0.6)))
+
+
+def test_trajectory_pool_counts_hits_and_misses():
+    pool = TrajectoryPool(min_distance=8)
+    pool.start = lambda: None
+
+    # Moves shorter than min_distance aren't pooled at all
+    assert pool.get_path((0, 0), (3, 0)) is None
+    assert pool.get_path((0, 0), (100, 0)) is None
+    pool._buckets[pool._bucket(100, 0)].append(np.array([[0, 0], [1, 0]]))
+    assert pool.get_path((0, 0), (100, 0)) is not None
+    assert (pool.hits, pool.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_pipelined_move_ends_at_target(page: Page, server):
+    await page.goto(server.EMPTY_PAGE)
+    await page.evaluate("() => { window.moves = []; document.addEventListener('mousemove', e => window.moves.push([e.clientX, e.clientY])) }")
+
+    await page.mouse.move(300, 200)
+    moves = await page.evaluate("window.moves")
+
+    assert len(moves) > 1
+    assert moves[-1] == [300, 200]
+
+
+def test_trajectory_points_scale_with_distance_and_have_no_duplicates():
+    short = HumanizeMouseTrajectory((0, 0), (5, 0), target_size=20)
+    long = HumanizeMouseTrajectory((0, 0), (1500, 400), target_size=20)
+    assert len(short.points) < len(long.points) <= HumanizeMouseTrajectory.legacy_points_count
+    assert short.events_saved > long.events_saved
+
+    for trajectory in (short, long):
+        assert all(point != next_point for point, next_point in zip(trajectory.points, trajectory.points[1:]))
+
+
+@pytest.mark.asyncio
+async def test_cursor_position_is_shared_between_page_wrappers(page: Page, server):
+    await page.goto(server.EMPTY_PAGE)
+    await page.mouse.move(200, 150)
+
+    # A second Mouse wrapper on the same underlying page, which the page's identity map would otherwise hand out once
+    other_mouse = Mouse(page.mouse._mouse, page)
+    assert other_mouse is not page.mouse
+    assert (other_mouse.last_x, other_mouse.last_y) == (200, 150)
@@ -0,0 +1,67 @@
+import json
+import time
+
+import pytest
+
+from botright import ProxyCheckCache, ProxyManager
+from botright.modules import proxy_cache
+from botright.modules.proxy_cache import ProxyCheckResult
+
+RESULT = ProxyCheckResult("203.0.113.7", "Germany", "DE", 52.52, 13.40, "Europe/Berlin", 0.0)
+
+
+def test_proxy_check_cache_ttl(tmp_path):
+    cache = ProxyCheckCache(tmp_path / "proxies.json", ttl=60)
+    cache.put("user:secret@198.51.100.1:8080", RESULT._replace(checked_at=time.time()))
+
+    cached = cache.get("user:secret@198.51.100.1:8080")
+    assert cached and cached.timezone == "Europe/Berlin"
+    assert cache.get("198.51.100.2:8080") is None
+
+    # Stale results aren't used
+    cache.put("198.51.100.3:8080", RESULT._replace(checked_at=time.time() - 120))
+    assert cache.get("198.51.100.3:8080") is None
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 2
+
+    # Credentials never get written to disk
+    assert "secret" not in (tmp_path / "proxies.json").read_text()
+
+
+def test_proxy_check_cache_is_shared_between_instances(tmp_path):
+    first, second = ProxyCheckCache(tmp_path / "proxies.json"), ProxyCheckCache(tmp_path / "proxies.json")
+    first.put("", RESULT._replace(checked_at=time.time()))
+    second.put("198.51.100.1:8080", RESULT._replace(checked_at=time.time()))
+
+    # Writers merge with the entries of other processes, readers pick up entries stored after they loaded the file
+    assert len(second) == 2
+    assert first.get("198.51.100.1:8080")
+
+
+def test_proxy_check_cache_only_reloads_changed_files(tmp_path, monkeypatch):
+    first, second = ProxyCheckCache(tmp_path / "proxies.json"), ProxyCheckCache(tmp_path / "proxies.json")
+    first.put("", RESULT._replace(checked_at=time.time()))
+    second.get("")
+
+    loads = []
+    original_load = json.load
+    monkeypatch.setattr(proxy_cache.json, "load", lambda file: loads.append(file.name) or original_load(file))
+
+    # Misses don't parse the file again while nobody wrote it
+    for _ in range(3):
+        assert first.get("198.51.100.1:8080") is None
+    assert loads == []
+
+    # Writes of other instances change the file, so the next miss picks them up. The writer had the latest file loaded already
+    second.put("198.51.100.1:8080", RESULT._replace(checked_at=time.time()))
+    assert first.get("198.51.100.1:8080") and len(loads) == 1
+
+
+@pytest.mark.asyncio
+async def test_proxy_manager_uses_cached_check(botright_client, tmp_path):
+    cache = ProxyCheckCache(tmp_path / "proxies.json")
+    cache.put("", RESULT._replace(checked_at=time.time()))
+    botright_client.proxy_cache = cache
+
+    proxy = await ProxyManager(botright_client, "")
+    assert proxy.exit_ip == "203.0.113.7" and proxy.timezone == "Europe/Berlin"
+    assert cache.hits == 1
@@ -0,0 +1,155 @@
+import asyncio
+
+import pytest
+
+from botright import BandwidthMeter, ProxyPool
+from botright.modules import proxy_pool
+from botright.modules.proxy_manager import ProxyCheckError
+from botright.modules.proxy_pool import ProxyHealth, ProxyPoolExhausted
+
+
+class FakeProxyManager:
+    # Proxies starting with "dead" fail their checks, all others pass them after their given delay
+    delays = {"fast:8080": 0.01, "slow:8080": 0.2}
+
+    def __init__(self, proxy):
+        self.proxy = proxy
+        self.bandwidth = BandwidthMeter()
+        self._phttpx = None
+        self.closed = False
+
+    async def check_proxy(self, httpx_client):
+        if self.proxy.startswith("dead"):
+            raise ProxyCheckError("Could not get IP-Address of Proxy (Proxy is Invalid/Timed Out)")
+        await asyncio.sleep(self.delays.get(self.proxy, 0.05))
+
+    async def close(self):
+        self.closed = True
+
+
+async def create_fake_proxy_manager(botright, proxy):
+    if ":" not in proxy:
+        # Like ProxyManager's split_helper fails on malformed proxy strings
+        raise IndexError("list index out of range")
+    manager = FakeProxyManager(proxy)
+    await manager.check_proxy(None)
+    return manager
+
+
+@pytest.fixture
+def fake_proxy_managers(monkeypatch):
+    monkeypatch.setattr(proxy_pool, "ProxyManager", create_fake_proxy_manager)
+
+
+@pytest.mark.asyncio
+async def test_proxy_pool_hands_out_fastest_proxy(fake_proxy_managers):
+    pool = ProxyPool(["slow:8080", "fast:8080", "dead:8080"], max_browsers=1)
+    await pool.start(None)
+
+    assert (await pool.acquire()).proxy == "fast:8080"
+    # The fastest proxy reached its browser cap
+    second = await pool.acquire()
+    assert second.proxy == "slow:8080"
+    with pytest.raises(ProxyPoolExhausted):
+        await pool.acquire(timeout=0.05)
+
+    # Released proxies are handed to waiting browsers
+    waiting = asyncio.ensure_future(pool.acquire(timeout=5))
+    await asyncio.sleep(0.01)
+    pool.release(second)
+    assert (await waiting).proxy == "slow:8080"
+
+    await pool.close()
+    assert pool.stats["acquired"] == 3
+
+
+@pytest.mark.asyncio
+async def test_proxy_pool_quarantines_failing_proxies(fake_proxy_managers):
+    pool = ProxyPool(["fast:8080"], quarantine_after=2, quarantine_time=60)
+    await pool.start(None)
+    health = pool.proxies[0]
+
+    # Failed navigations count towards the quarantine like failed checks
+    pool.record(health, None, False)
+    assert not health.quarantined
+    pool.record(health, None, False)
+    assert health.quarantined and pool.stats["quarantines"] == 1
+    with pytest.raises(ProxyPoolExhausted):
+        await pool.acquire(timeout=0.05)
+
+    # Passing a check brings the proxy back
+    assert await pool.check(health)
+    assert not health.quarantined and health.failures == 0
+    assert (await pool.acquire()).proxy == "fast:8080"
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_proxy_pool_survives_malformed_proxies(fake_proxy_managers):
+    pool = ProxyPool(["malformed", "fast:8080"])
+    await pool.start(None)
+    # Starting the pool again doesn't raise the malformed proxy's error either
+    await pool.start(None)
+
+    assert (await pool.acquire()).proxy == "fast:8080"
+    assert pool.stats["by_proxy"]["malformed"]["error"] == "IndexError: list index out of range"
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_proxy_pool_exhausted_once_every_proxy_failed(fake_proxy_managers):
+    pool = ProxyPool(["dead:8080", "malformed"])
+    await pool.start(None)
+
+    # Raised right away instead of waiting forever, like new_browser does without a timeout
+    with pytest.raises(ProxyPoolExhausted):
+        await asyncio.wait_for(pool.acquire(), 1)
+    await pool.close()
+
+
+def test_proxy_health_decays_old_observations(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(proxy_pool.time, "monotonic", lambda: now[0])
+
+    health = ProxyHealth("198.51.100.1:8080")
+    for _ in range(5):
+        health.record(None, False, half_life=60)
+    failing_rate = health.success_rate
+
+    # An hour later the failures barely count against a successful check anymore
+    now[0] += 3600
+    health.record(0.5, True, half_life=60)
+    assert failing_rate < 0.2 < 0.6 < health.success_rate
+    assert health.latency == 0.5
+
+
+class FakeBrowser:
+    def __init__(self, proxy):
+        self.proxy = proxy
+        self.proxy_pools = set()
+        self.listeners = {}
+
+    def on(self, event, listener):
+        self.listeners.setdefault(event, []).append(listener)
+
+    def emit(self, event, *args):
+        for listener in self.listeners.get(event, []):
+            listener(*args)
+
+
+@pytest.mark.asyncio
+async def test_proxy_pool_attaches_browsers_once(fake_proxy_managers):
+    pool = ProxyPool(["fast:8080"], max_browsers=2)
+    await pool.start(None)
+    browser = FakeBrowser(await pool.acquire())
+    await pool.acquire()
+
+    # Rotating back to a pool attaches the browser again, which must not add further listeners
+    pool.attach(browser)
+    pool.attach(browser)
+    assert len(browser.listeners["close"]) == 1 and browser.proxy_pools == {pool}
+
+    # Closing the browser only releases its own slot, not the one of the other browser
+    browser.emit("close", browser)
+    assert pool.proxies[0].browsers == 1
+    await pool.close()
@@ -0,0 +1,56 @@
+import asyncio
+import time
+
+import pytest
+
+from botright.modules.proxy_manager import EndpointStats, endpoint_stats, race
+
+
+async def answer(value, delay=0.0):
+    await asyncio.sleep(delay)
+    return value
+
+
+async def fail(delay=0.0):
+    await asyncio.sleep(delay)
+    raise ValueError("Invalid answer")
+
+
+@pytest.mark.asyncio
+async def test_race_skips_blackholed_endpoint():
+    endpoint_stats.reset()
+    start = time.monotonic()
+    result = await race([("blackholed", lambda: answer("slow", 10)), ("fast", lambda: answer("fast", 0.01))], deadline=time.monotonic() + 5, stagger=0.05)
+
+    # The blackholed endpoint only cost the stagger delay and got cancelled, without counting as a failure
+    assert result == "fast" and time.monotonic() - start < 1
+    assert endpoint_stats.attempts == {"fast": 1}
+
+
+@pytest.mark.asyncio
+async def test_race_starts_next_endpoint_on_failure():
+    endpoint_stats.reset()
+    start = time.monotonic()
+    result = await race([("failing", fail), ("working", lambda: answer("ok"))], deadline=time.monotonic() + 5, stagger=10)
+
+    assert result == "ok" and time.monotonic() - start < 1
+    assert endpoint_stats.success_rate("failing") < endpoint_stats.success_rate("working")
+
+
+@pytest.mark.asyncio
+async def test_race_deadline():
+    with pytest.raises(TimeoutError):
+        await race([("slow", lambda: answer("slow", 10))], deadline=time.monotonic() + 0.05)
+
+    with pytest.raises(TimeoutError):
+        await race([("failing", fail)], deadline=time.monotonic() + 5)
+
+
+def test_endpoint_stats_rank():
+    stats = EndpointStats()
+    stats.record("slow", 2.0, True)
+    stats.record("fast", 0.1, True)
+    for _ in range(3):
+        stats.record("unreliable", 0.05, False)
+
+    assert stats.rank(["unreliable", "slow", "untried", "fast"]) == ["fast", "untried", "slow", "unreliable"]
@@ -0,0 +1,85 @@
+import asyncio
+import io
+import json
+
+import pytest
+
+from botright import ProxyCheckCache, ProxyValidator
+from botright.modules import proxy_validator
+from botright.modules.proxy_manager import ProxyCheckError, ProxyManager, SplitError
+from botright.modules.proxy_validator import proxy_lines, read_proxies
+from botright.proxies import main
+
+
+class FakeProxyManager:
+    running = 0
+    most_running = 0
+
+    def __init__(self, proxy):
+        self.proxy = proxy
+        self.exit_ip, self.country, self.country_code, self.latitude, self.longitude, self.timezone = "203.0.113.7", "Germany", "DE", 52.52, 13.40, "Europe/Berlin"
+
+    check_result = ProxyManager.check_result
+
+    async def close(self):
+        pass
+
+
+async def create_fake_proxy_manager(owner, proxy, check_deadline=15.0):
+    # Proxies starting with "dead" time out, ones without a port can't be parsed
+    if ":" not in proxy:
+        raise SplitError(f"Proxy Format ({proxy}) isnt supported")
+
+    FakeProxyManager.running += 1
+    FakeProxyManager.most_running = max(FakeProxyManager.most_running, FakeProxyManager.running)
+    try:
+        await asyncio.sleep(0.01)
+        if proxy.startswith("dead"):
+            raise ProxyCheckError("Could not get IP-Address of Proxy (Proxy is Invalid/Timed Out)")
+    finally:
+        FakeProxyManager.running -= 1
+    return FakeProxyManager(proxy)
+
+
+@pytest.fixture
+def fake_proxy_managers(monkeypatch):
+    FakeProxyManager.most_running = 0
+    monkeypatch.setattr(proxy_validator, "ProxyManager", create_fake_proxy_manager)
+
+
+@pytest.mark.asyncio
+async def test_proxy_validator_bounds_concurrency(fake_proxy_managers):
+    proxies = [f"198.51.100.{i}:8080" for i in range(40)] + ["dead.example:8080", "not-a-proxy"]
+    validator = ProxyValidator(concurrency=5)
+
+    results = [result async for result in validator.validate_all(proxies)]
+
+    assert len(results) == 42 and FakeProxyManager.most_running <= 5
+    assert validator.stats["valid"] == 40
+    assert validator.stats["errors"] == {"ProxyCheckError": 1, "SplitError": 1}
+    assert next(result for result in results if result.proxy == "not-a-proxy").error == "SplitError"
+
+
+@pytest.mark.asyncio
+async def test_proxy_validator_streams_jsonl(fake_proxy_managers, tmp_path):
+    cache = ProxyCheckCache(tmp_path / "proxies.json")
+    output = io.StringIO()
+    await ProxyValidator(cache=cache).validate_to_jsonl(["198.51.100.1:8080", "dead.example:8080"], output, valid_only=True)
+
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert [line["proxy"] for line in lines] == ["198.51.100.1:8080"]
+    assert lines[0]["exit_ip"] == "203.0.113.7" and lines[0]["error"] is None
+    # Valid proxies launch without being checked again
+    assert cache.get("198.51.100.1:8080")
+
+
+def test_proxies_cli(fake_proxy_managers, tmp_path):
+    proxy_list = tmp_path / "proxies.txt"
+    proxy_list.write_text("# Residential\n198.51.100.1:8080\n\ndead.example:8080\n")
+    assert list(read_proxies(proxy_list)) == ["198.51.100.1:8080", "dead.example:8080"]
+    # Stdin goes through the same filter, so indented comments are skipped there too
+    assert list(proxy_lines(["  # Datacenter\n", "  198.51.100.2:8080  \n", "\n"])) == ["198.51.100.2:8080"]
+
+    assert main([str(proxy_list), "-o", str(tmp_path / "results.jsonl"), "-c", "2"]) == 0
+    results = [json.loads(line) for line in (tmp_path / "results.jsonl").read_text().splitlines()]
+    assert {result["proxy"]: result["valid"] for result in results} == {"198.51.100.1:8080": True, "dead.example:8080": False}
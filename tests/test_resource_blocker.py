@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from botright import ResourceBlocker
+from botright.extended_typing import Page
+from botright.modules.resource_blocker import HostTrie, filter_to_regex
+
+
+def test_host_trie_matches_subdomains():
+    trie = HostTrie(["doubleclick.net", "ads.example.com"])
+    assert trie.match("doubleclick.net") and trie.match("stats.g.doubleclick.net")
+    assert trie.match("ads.example.com") and not trie.match("example.com")
+    assert not trie.match("notdoubleclick.net")
+    assert sorted(trie) == ["ads.example.com", "doubleclick.net"]
+
+
+def test_filter_to_regex():
+    assert filter_to_regex("||example.com^") == r"^[a-z][a-z0-9+.-]*://(?:[^/?#@]*\.)?example\.com(?:[^\w.%-]|$)"
+    assert filter_to_regex("|https://example.com/ads|") == r"^https://example\.com/ads$"
+    assert filter_to_regex("/banner/*/img") == r"/banner/.*/img"
+
+
+def test_resource_blocker_rule_sets():
+    blocker = ResourceBlocker(["images", "trackers"])
+    assert blocker.matches("https://example.com/logo.PNG?v=2")
+    assert blocker.matches("https://www.google-analytics.com/analytics.js")
+    assert not blocker.matches("https://example.com/png/index.html")
+    assert not blocker.matches("https://www.google.com/recaptcha/api.js")
+
+    # Resource types are only matched if asked for, as they need every request to be intercepted
+    assert not blocker.matches("https://example.com/avatar", "image")
+    assert ResourceBlocker(["images"], match_resource_types=True).matches("https://example.com/avatar", "image")
+
+    with pytest.raises(ValueError):
+        ResourceBlocker(["videos"])
+
+
+def test_resource_blocker_filter_lists():
+    filters = [
+        "! Comment",
+        "[Adblock Plus 2.0]",
+        "example.com##.banner",
+        "||ads.example.com^",
+        "/track/*.gif",
+        "||cdn.example.com/*.js$script",
+        "@@||ads.example.com/allowed^",
+        "||x.com^$domain=y.com",
+    ]
+    blocker = ResourceBlocker(filters=filters, hosts=["0.0.0.0 tracker.example.org", "# comment", "localhost"])
+
+    assert blocker.matches("https://ads.example.com/banner.js")
+    assert not blocker.matches("https://ads.example.com/allowed/banner.js")
+    assert blocker.matches("https://example.com/track/pixel.gif")
+    assert blocker.matches("https://cdn.example.com/lib.js", "script") and not blocker.matches("https://cdn.example.com/lib.js", "xhr")
+    assert blocker.matches("http://sub.tracker.example.org/")
+    assert not blocker.matches("https://x.com/")
+    assert blocker.stats["skipped_filters"] == 1
+
+    # Exceptions can't be applied by the browser, so everything is left to the route
+    assert blocker.blocked_urls == []
+    assert "*://*.doubleclick.net/*" in ResourceBlocker(["trackers"]).blocked_urls
+
+
+@pytest.mark.asyncio
+async def test_block_resources(page: Page, server):
+    def image(request):
+        request.setHeader(b"Content-Type", b"image/png")
+        request.write(b"\x89PNG")
+        request.finish()
+
+    server.set_route("/blocked.png", image)
+    server.set_route("/query.png", image)
+    blocker = await page.context.block_resources(ResourceBlocker(["images"]))
+    await page.goto(server.EMPTY_PAGE)
+
+    fetch = "url => fetch(url).then(() => true, () => false)"
+    assert not await page.evaluate(fetch, "/blocked.png")
+    assert not await page.evaluate(fetch, "/query.png?size=2")
+    assert await page.evaluate(fetch, "/empty.html")
+
+    # Requests blocked by the browser are reported through CDP events
+    await asyncio.sleep(0.1)
+    assert blocker.stats["blocked"] == 2 and blocker.stats["blocked_types"] == {"fetch": 2}
+
+
+@pytest.mark.asyncio
+async def test_block_images_matches_resource_type(page: Page, server):
+    def image(request):
+        request.setHeader(b"Content-Type", b"image/png")
+        request.write(b"\x89PNG")
+        request.finish()
+
+    # An image URL without a file extension, like CDNs serve them
+    server.set_route("/avatar", image)
+    blocker = await page.context.block_images()
+    await page.goto(server.EMPTY_PAGE)
+    await page.set_content(f'<img src="{server.PREFIX}/avatar">')
+
+    await asyncio.sleep(0.1)
+    assert blocker.stats["blocked_types"] == {"image": 1}
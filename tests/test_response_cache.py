@@ -0,0 +1,214 @@
+import asyncio
+import time
+
+import pytest
+from twisted.internet import reactor
+
+from botright import ResponseCache
+from botright.extended_typing import Page
+from botright.modules.response_cache import CachedResponse, Flight
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = ResponseCache(max_bytes=1024, max_entries=3)
+    for i in range(3):
+        cache.put(f"https://example.com/{i}", 200, {}, b"x" * 100)
+
+    # Using the first entry, so the second one is the least recently used
+    assert cache.get("https://example.com/0")
+    cache.put("https://example.com/3", 200, {}, b"x" * 100)
+
+    assert "https://example.com/1" not in cache
+    assert len(cache) == 3 and cache.evictions == 1
+
+
+def test_response_cache_byte_budget():
+    cache = ResponseCache(max_bytes=1000)
+    cache.put("https://example.com/a", 200, {}, b"x" * 600)
+    cache.put("https://example.com/b", 200, {}, b"x" * 600)
+    assert "https://example.com/a" not in cache and cache.bytes_stored == 600
+
+    # Responses exceeding the whole budget are not cached at all
+    cache.put("https://example.com/c", 200, {}, b"x" * 2000)
+    assert "https://example.com/c" not in cache and "https://example.com/b" in cache
+
+
+def test_response_cache_ttl_and_stats():
+    cache = ResponseCache(ttl=0)
+    cache.put("https://example.com/a", 200, {"content-type": "text/css"}, b"body")
+    assert cache.get("https://example.com/a") is None
+    assert cache.stats["expirations"] == 1 and cache.stats["misses"] == 1
+
+    cache = ResponseCache()
+    cache.put("https://example.com/a", 200, {"content-type": "text/css"}, b"body")
+    cached = cache.get("https://example.com/a")
+    assert cached and cached.body == b"body" and cached.headers == {"content-type": "text/css"}
+    assert cache.stats["hits"] == 1 and cache.stats["bytes_saved"] == 4
+
+
+def test_response_cache_keeps_responses_of_single_contexts_private():
+    cache = ResponseCache()
+    cache.put("https://example.com/account", 200, {"cache-control": "private, max-age=60"}, b"account")
+    assert "https://example.com/account" not in cache
+
+    # The fetching request gets the cookies, other contexts served from the cache don't
+    fetched = cache.put("https://example.com/", 200, {"set-cookie": "session=1", "content-type": "text/html"}, b"html")
+    cached = cache.get("https://example.com/")
+    assert fetched.headers["set-cookie"] == "session=1"
+    assert cached and cached.headers == {"content-type": "text/html"}
+
+
+def test_flight_only_shares_storable_responses_of_the_same_variant():
+    response = CachedResponse(200, {"set-cookie": "session=1", "vary": "Accept-Encoding"}, b"gzip", time.time())
+    flight = Flight.of(response, {"accept-encoding": "gzip"})
+    assert flight.response.headers["set-cookie"] == "session=1"
+
+    # Coalesced requests don't get the fetching context's cookies, nor a variant their headers didn't ask for
+    shared = flight.shared_with({"Accept-Encoding": "gzip"})
+    assert shared and "set-cookie" not in shared.headers
+    assert flight.shared_with({"accept-encoding": "br"}) is None
+
+    private = Flight.of(CachedResponse(200, {"cache-control": "private"}, b"account", time.time()), {})
+    error = Flight.of(CachedResponse(500, {}, b"error", time.time()), {})
+    assert private.shared_with({}) is None and error.shared_with({}) is None
+
+
+def test_flight_key_follows_vary():
+    cache = ResponseCache()
+    assert cache.flight_key("https://example.com/app.js", {"accept-encoding": "gzip"}) == "https://example.com/app.js"
+
+    # Once a response named its Vary header, requests for other variants get fetched separately
+    cache.remember_vary("https://example.com/app.js", {"vary": "Accept-Encoding"})
+    gzip_key, br_key = cache.flight_key("https://example.com/app.js", {"accept-encoding": "gzip"}), cache.flight_key("https://example.com/app.js", {"accept-encoding": "br"})
+    assert gzip_key != br_key and gzip_key == cache.flight_key("https://example.com/app.js", {"Accept-Encoding": "gzip"})
+
+
+@pytest.mark.asyncio
+async def test_cache_responses_serves_cached_body(page: Page, server):
+    def cacheable_page(request):
+        request.setHeader(b"Content-Type", b"text/html")
+        request.setHeader(b"Cache-Control", b"max-age=60")
+        request.write(b"<title>Woof-Woof</title>")
+        request.finish()
+
+    server.set_route("/cacheable.html", cacheable_page)
+    await page.context.cache_responses()
+
+    await page.goto(server.PREFIX + "/cacheable.html")
+    await page.goto(server.PREFIX + "/cacheable.html")
+
+    stats = page.context.cache.stats
+    assert stats["hits"] >= 1 and stats["bytes_saved"] > 0
+    assert await page.title() == "Woof-Woof"
+
+
+def test_store_revalidation():
+    cache = ResponseCache()
+    stale = cache.put("https://example.com/", 200, {"etag": '"v1"', "content-length": "4"}, b"html", max_age=0)
+    assert not stale.fresh and stale.validators == {"if-none-match": '"v1"'}
+
+    # A 304 refreshes the headers and keeps the cached body
+    refreshed = cache.store_revalidation("https://example.com/", stale, 304, {"etag": '"v1"', "content-length": "0", "x-fresh": "1"}, b"")
+    assert refreshed.body == b"html" and refreshed.headers["x-fresh"] == "1" and refreshed.headers["content-length"] == "4"
+
+    # A 200 replaces the entry
+    replaced = cache.store_revalidation("https://example.com/", refreshed, 200, {"etag": '"v2"'}, b"new html")
+    assert replaced.body == b"new html" and cache.lookup("https://example.com/") == replaced
+    assert cache.stats["revalidations"] == 2 and cache.stats["revalidation_hit_rate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_cache_responses_revalidates_documents(page: Page, server):
+    requests = []
+
+    def etag_page(request):
+        requests.append(request)
+        if request.getHeader("if-none-match") == '"v1"':
+            request.setResponseCode(304)
+            request.finish()
+            return
+        request.setHeader(b"Content-Type", b"text/html")
+        request.setHeader(b"ETag", b'"v1"')
+        request.write(b"<title>revalidated</title>")
+        request.finish()
+
+    server.set_route("/revalidated.html", etag_page)
+    await page.context.cache_responses()
+
+    for _ in range(3):
+        await page.goto(server.PREFIX + "/revalidated.html")
+        assert await page.title() == "revalidated"
+
+    # Documents without explicit freshness get revalidated on every navigation, and are served from the cache on a 304
+    assert len(requests) == 3 and [request.getHeader("if-none-match") for request in requests] == [None, '"v1"', '"v1"']
+    assert page.context.cache.stats["revalidation_hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_responses_coalesces_concurrent_misses(browser, server):
+    requests = []
+
+    def slow_page(request):
+        # Delaying the response, so all pages miss the cache while the first fetch is still in flight
+        requests.append(request)
+        request.setHeader(b"Content-Type", b"text/html")
+        reactor.callLater(0.5, lambda: (request.write(b"<title>coalesced</title>"), request.finish()))
+
+    server.set_route("/coalesced.html", slow_page)
+    await browser.cache_responses()
+    pages = [await browser.new_page() for _ in range(5)]
+
+    await asyncio.gather(*[page.goto(server.PREFIX + "/coalesced.html") for page in pages])
+
+    assert len(requests) == 1
+    assert browser.cache.stats["coalesced"] == len(pages) - 1
+    assert all([await page.title() == "coalesced" for page in pages])
+
+
+@pytest.mark.asyncio
+async def test_cache_responses_falls_back_when_shared_fetch_fails(browser, server):
+    requests = []
+
+    def flaky_page(request):
+        requests.append(request)
+        if len(requests) == 1:
+            # Dropping the first (shared) fetch once all pages are waiting for it
+            reactor.callLater(0.5, request.transport.abortConnection)
+            return
+        request.setHeader(b"Content-Type", b"text/html")
+        request.write(b"<title>fallback</title>")
+        request.finish()
+
+    server.set_route("/flaky.html", flaky_page)
+    await browser.cache_responses()
+    pages = [await browser.new_page() for _ in range(5)]
+
+    await asyncio.gather(*[page.goto(server.PREFIX + "/flaky.html") for page in pages])
+
+    # The leader and its 4 coalesced waiters all continued to the network on their own
+    assert browser.cache.stats["coalesced"] == len(pages) - 1
+    assert len(requests) == 1 + len(pages)
+    assert all([await page.title() == "fallback" for page in pages])
+
+
+@pytest.mark.asyncio
+async def test_cache_responses_doesnt_share_private_responses(browser, server):
+    requests = []
+
+    def private_page(request):
+        requests.append(request)
+        request.setHeader(b"Content-Type", b"text/html")
+        request.setHeader(b"Cache-Control", b"private")
+        request.setHeader(b"Set-Cookie", f"session={len(requests)}".encode())
+        reactor.callLater(0.5, lambda: (request.write(b"<title>private</title>"), request.finish()))
+
+    server.set_route("/private.html", private_page)
+    await browser.cache_responses()
+    pages = [await browser.new_page() for _ in range(5)]
+
+    await asyncio.gather(*[page.goto(server.PREFIX + "/private.html") for page in pages])
+
+    # The coalesced requests waited for the leader, but then went to the network for their own response
+    assert browser.cache.stats["coalesced"] == len(pages) - 1
+    assert len(requests) == len(pages)
+    assert all([await page.title() == "private" for page in pages])
@@ -0,0 +1,39 @@
+import pytest
+from playwright.async_api import Route as PlaywrightRoute
+
+from botright.extended_typing import Page
+from botright.playwright_mock import Route
+
+
+@pytest.mark.asyncio
+async def test_context_route_resolves_page_lazily(page: Page, server):
+    routed = []
+
+    async def handler(route):
+        routed.append(route)
+        await route.continue_()
+
+    await page.context.route("**/empty.html", handler)
+    await page.goto(server.EMPTY_PAGE)
+
+    route = routed[0]
+    assert isinstance(route, Route) and route._lazy_page is None
+    assert route.request.frame.page is page
+
+
+@pytest.mark.asyncio
+async def test_context_route_raw_handler(page: Page, server):
+    routed = []
+
+    async def handler(route, request):
+        routed.append((route, request))
+        await route.continue_()
+
+    await page.context.route("**/empty.html", handler, raw=True)
+    await page.goto(server.EMPTY_PAGE)
+
+    route, request = routed[0]
+    assert type(route) is PlaywrightRoute
+    assert request.url == server.EMPTY_PAGE
+
+    await page.context.unroute("**/empty.html", handler)
@@ -0,0 +1,33 @@
+import pytest
+
+from botright.extended_typing import Page
+
+
+@pytest.mark.asyncio
+async def test_wrappers_are_identity_mapped(page: Page, server):
+    await page.goto(server.PREFIX + "/frames/two-frames.html")
+
+    assert page.main_frame is page.main_frame
+    assert page.frames[1] is page.main_frame.child_frames[0]
+    assert page.frames[1].parent_frame is page.main_frame
+    assert page in page.context.pages and page.context.pages[-1] is page
+
+
+@pytest.mark.asyncio
+async def test_route_wrappers_are_identity_mapped(page: Page, server):
+    routed = []
+
+    async def handler(route, request):
+        routed.append((route, request))
+        await route.continue_()
+
+    await page.route("**/empty.html", handler)
+    await page.goto(server.EMPTY_PAGE)
+
+    route, request = routed[0]
+    assert route.request is request
+    assert request.frame is page.main_frame
+    assert request.frame.page is page
+    response = await request.response()
+    assert response is await request.response()
+    assert response.request is request